@@ -2,69 +2,137 @@
 Configuration settings for NFL Analytics system
 """
 
+import atexit
 import os
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    from nfl_analytics.database.manager import DatabaseManager
 
 # Database settings
 DEFAULT_DB_PATH = "nfl_analytics.duckdb"
-DB_PATH = os.getenv("NFL_DB_PATH", DEFAULT_DB_PATH)
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Settings read from the environment once, when config is imported"""
+    db_path: str
+    max_workers: int
+    api_timeout: int
+    api_retries: int
+    log_level: str
+    log_file: str
+    db_threads: int
+    db_memory_limit: Optional[str]
+    db_temp_directory: Optional[str]
+    db_preserve_insertion_order: bool
+    stream_pbp: bool
+    cache_dir: Optional[str]
+    
+    def duckdb_config(self) -> Dict[str, Any]:
+        """Return the DuckDB connection settings; unset limits keep DuckDB's defaults"""
+        db_config: Dict[str, Any] = {
+            'threads': self.db_threads,
+            'preserve_insertion_order': self.db_preserve_insertion_order
+        }
+        if self.db_memory_limit:
+            db_config['memory_limit'] = self.db_memory_limit
+        if self.db_temp_directory:
+            db_config['temp_directory'] = self.db_temp_directory
+        return db_config
+
+
+SETTINGS = Settings(
+    db_path=os.getenv("NFL_DB_PATH", DEFAULT_DB_PATH),
+    max_workers=int(os.getenv("NFL_MAX_WORKERS", "4")),
+    api_timeout=int(os.getenv("NFL_API_TIMEOUT", "30")),
+    api_retries=int(os.getenv("NFL_API_RETRIES", "3")),
+    log_level=os.getenv("NFL_LOG_LEVEL", "INFO"),
+    log_file=os.getenv("NFL_LOG_FILE", "nfl_analytics.log"),
+    # DuckDB threads, memory limit (e.g. "8GB") and spill directory
+    db_threads=int(os.getenv("NFL_DB_THREADS", str(os.cpu_count() or 1))),
+    db_memory_limit=os.getenv("NFL_DB_MEMORY_LIMIT"),
+    db_temp_directory=os.getenv("NFL_DB_TEMP_DIR"),
+    # Set to "false" to let DuckDB load and export without keeping row order
+    db_preserve_insertion_order=os.getenv("NFL_DB_PRESERVE_ORDER", "true").lower() != "false",
+    # Set to "true" to load play-by-play Parquet files straight into DuckDB
+    stream_pbp=os.getenv("NFL_STREAM_PBP", "false").lower() == "true",
+    # Directory for local copies of play-by-play Parquet files, e.g.
+    # "~/.cache/nfl-duckdb"; unset downloads every season on each load
+    cache_dir=os.getenv("NFL_CACHE_DIR")
+)
+
+DB_PATH = SETTINGS.db_path
+
+# Open database managers, keyed by resolved database path
+_MANAGERS: Dict[str, 'DatabaseManager'] = {}
+
+
+def get_manager(db_path: str = DB_PATH) -> 'DatabaseManager':
+    """
+    Get the shared DatabaseManager for a database file, creating it on first use
+    
+    Args:
+        db_path: Path to DuckDB database file
+        
+    Returns:
+        DatabaseManager with an open connection to the database
+    """
+    key = str(Path(db_path).resolve())
+    manager = _MANAGERS.get(key)
+    if manager is None:
+        from nfl_analytics.database.manager import DatabaseManager
+        manager = DatabaseManager(db_path, db_config=SETTINGS.duckdb_config())
+        _MANAGERS[key] = manager
+    return manager
+
+
+def close_managers():
+    """Close every shared DatabaseManager"""
+    while _MANAGERS:
+        _, manager = _MANAGERS.popitem()
+        manager.close()
+
+
+atexit.register(close_managers)
 
 # Data extraction settings
 DEFAULT_SEASONS = [2023, 2024]
-MAX_WORKERS = int(os.getenv("NFL_MAX_WORKERS", "4"))
+MAX_WORKERS = SETTINGS.max_workers
 DEFAULT_SEASON_TYPES = ['REG', 'POST', 'PRE']
 
+# Season-level tables that can be refreshed individually
+DATA_TYPE_CHOICES = ('pbp_data', 'weekly_stats', 'seasonal_stats', 'rosters', 'injuries')
+
+# Metadata tables skipped by data quality validation
+VALIDATION_EXCLUDED_TABLES = frozenset({'data_refresh_log'})
+
 # Logging settings
-LOG_LEVEL = os.getenv("NFL_LOG_LEVEL", "INFO")
-LOG_FILE = os.getenv("NFL_LOG_FILE", "nfl_analytics.log")
+LOG_LEVEL = SETTINGS.log_level
+LOG_FILE = SETTINGS.log_file
 
 # API settings
-API_TIMEOUT = int(os.getenv("NFL_API_TIMEOUT", "30"))
-API_RETRIES = int(os.getenv("NFL_API_RETRIES", "3"))
+API_TIMEOUT = SETTINGS.api_timeout
+API_RETRIES = SETTINGS.api_retries
 
 # Fantasy scoring configurations
-FANTASY_SCORING_SYSTEMS = {
-    'std': {
-        'passing_yards': 0.04,
-        'passing_tds': 4.0,
-        'interceptions': -2.0,
-        'rushing_yards': 0.1,
-        'rushing_tds': 6.0,
-        'receptions': 0.0,
-        'receiving_yards': 0.1,
-        'receiving_tds': 6.0,
-        'fumbles_lost': -2.0,
-        'two_point_conversions': 2.0
-    },
-    'half_ppr': {
-        'passing_yards': 0.04,
-        'passing_tds': 4.0,
-        'interceptions': -2.0,
-        'rushing_yards': 0.1,
-        'rushing_tds': 6.0,
-        'receptions': 0.5,
-        'receiving_yards': 0.1,
-        'receiving_tds': 6.0,
-        'fumbles_lost': -2.0,
-        'two_point_conversions': 2.0
-    },
-    'full_ppr': {
-        'passing_yards': 0.04,
-        'passing_tds': 4.0,
-        'interceptions': -2.0,
-        'rushing_yards': 0.1,
-        'rushing_tds': 6.0,
-        'receptions': 1.0,
-        'receiving_yards': 0.1,
-        'receiving_tds': 6.0,
-        'fumbles_lost': -2.0,
-        'two_point_conversions': 2.0
-    }
-}
-
-# Data refresh settings
-REFRESH_BATCH_SIZE = 1000
-REFRESH_DELAY = 1  # seconds between batches
+# FANTASY_SCORING_SYSTEMS copies the rules FantasyPointsCalculator scores
+# with, and is built on first access so that importing config doesn't
+# import pandas and NumPy
+
+
+def __getattr__(name: str):
+    """Build FANTASY_SCORING_SYSTEMS from the calculator's rules on first access"""
+    if name == 'FANTASY_SCORING_SYSTEMS':
+        from nfl_analytics.models.fantasy_points import SCORING_SYSTEMS
+        
+        systems = {system: dict(rules) for system, rules in SCORING_SYSTEMS.items()}
+        globals()['FANTASY_SCORING_SYSTEMS'] = systems
+        return systems
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # File paths
 PROJECT_ROOT = Path(__file__).parent
@@ -72,7 +140,14 @@ DATA_DIR = PROJECT_ROOT / "data"
 LOGS_DIR = PROJECT_ROOT / "logs"
 QUERIES_DIR = PROJECT_ROOT / "queries"
 
-# Create directories if they don't exist
-DATA_DIR.mkdir(exist_ok=True)
-LOGS_DIR.mkdir(exist_ok=True)
-QUERIES_DIR.mkdir(exist_ok=True)
+_dirs_ready = False
+
+
+def ensure_dirs():
+    """Create the data, logs and queries directories if they don't exist"""
+    global _dirs_ready
+    if _dirs_ready:
+        return
+    for directory in (DATA_DIR, LOGS_DIR, QUERIES_DIR):
+        directory.mkdir(exist_ok=True)
+    _dirs_ready = True
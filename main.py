@@ -5,97 +5,215 @@ Command-line interface for NFL data extraction with proper data types
 """
 
 import argparse
+import atexit
+import io
 import logging
+import logging.handlers
+import os
+import queue
+import re
 import sys
 from pathlib import Path
-from typing import List
-
-from nfl_analytics.database.manager import DatabaseManager
-from nfl_analytics.extractors.data_extractor import NFLDataExtractor
-from nfl_analytics.extractors.ecr_extractor import ECRExtractor
-from nfl_analytics.models.fantasy_points import FantasyPointsCalculator
-from summarizers import create_smry_season_table, run_all_tests
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('nfl_analytics.log'),
-        logging.StreamHandler()
-    ]
+from typing import Dict, List, Optional
+
+from config import (
+    DATA_TYPE_CHOICES,
+    MAX_WORKERS,
+    SETTINGS,
+    VALIDATION_EXCLUDED_TABLES,
+    close_managers,
+    ensure_dirs,
+    get_manager
 )
 
+
+def configure_logging(log_file: str = 'nfl_analytics.log'):
+    """
+    Configure logging for the CLI
+    
+    Records are only enqueued on the calling thread; a background listener
+    writes them to the console and, batched in memory, to a rotating log file.
+    The log file isn't opened until the first record is written to it.
+    
+    Args:
+        log_file: Path of the log file to append to
+    """
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file,
+        maxBytes=10 * 1024 * 1024,
+        backupCount=5,
+        delay=True
+    )
+    memory_handler = logging.handlers.MemoryHandler(
+        capacity=1024,
+        flushLevel=logging.ERROR,
+        target=file_handler
+    )
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue,
+        memory_handler,
+        logging.StreamHandler(),
+        respect_handler_level=True
+    )
+    listener.start()
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.handlers.QueueHandler(log_queue)]
+    )
+    
+    def shutdown_logging():
+        """Close open databases, then drain the log queue and flush the log file"""
+        close_managers()
+        listener.stop()
+        memory_handler.close()
+        file_handler.close()
+    
+    atexit.register(shutdown_logging)
+
+
 logger = logging.getLogger(__name__)
 
+# Default maximum rows printed by the query command in an interactive terminal
+CONSOLE_ROW_LIMIT = 1000
+
+# Rows per record batch when unlimited query output is streamed to the console
+CONSOLE_BATCH_ROWS = 10_000
+
+# Index column width of streamed console output, wide enough for 10M rows
+CONSOLE_INDEX_WIDTH = 7
+
+
+def _write_output(out: io.StringIO):
+    """Write buffered command output to stdout in a single call"""
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
+
+
+def _refresh_dependent_summaries(db, database: str, refreshed: Dict[str, int],
+                                 seasons: Optional[List[int]] = None) -> List[str]:
+    """
+    Rebuild the summary tables derived from tables that just received data
+    
+    Each rebuild is recorded in data_refresh_log. A summary whose sources
+    are incomplete, e.g. smry_season before ECR rankings are loaded, is
+    skipped with a warning.
+    
+    Args:
+        db: DatabaseManager for the database
+        database: Path to DuckDB database file
+        refreshed: Records loaded per source table
+        seasons: Seasons that were refreshed; summaries built per season
+            only replace these seasons' rows. None rebuilds them in full
+        
+    Returns:
+        Status line for each rebuilt summary table
+    """
+    from summarizers import SUMMARY_TABLES
+    
+    lines = []
+    for table_name, (create_func, sources, by_season) in SUMMARY_TABLES.items():
+        if not any(refreshed.get(source) for source in sources):
+            continue
+        try:
+            if by_season and seasons:
+                record_count = create_func(database, conn=db.conn, seasons=seasons)
+            else:
+                record_count = create_func(database, conn=db.conn)
+            db.invalidate_cache()
+            db.log_refresh(table_name, 0, None, 'ALL', 'SUCCESS', records_processed=record_count)
+            lines.append(f"{table_name}: {record_count:,} records")
+        except Exception as e:
+            logger.warning(f"Skipped rebuilding {table_name}: {e}")
+    return lines
+
 
 def extract_all_data(args):
     """Extract all NFL data for specified seasons"""
+    from nfl_analytics.extractors.data_extractor import NFLDataExtractor
+    
+    out = io.StringIO()
     try:
         logger.info(f"Starting data extraction for seasons: {args.seasons}")
         
-        with DatabaseManager(args.database) as db:
-            # Create extractor with database manager
-            extractor = NFLDataExtractor(db)
-            
-            results = extractor.extract_all_data(
-                seasons=args.seasons,
-                max_workers=args.workers
-            )
-            
-            print("\n=== Extraction Results ===")
-            total_records = 0
-            for table, records in results.items():
-                print(f"{table}: {records:,} records")
-                total_records += records
-            
-            print(f"\nTotal records extracted: {total_records:,}")
-            
-            # Validate data quality
-            print("\n=== Data Quality Validation ===")
-            for table in results.keys():
-                quality = db.validate_data_quality(table)
+        ensure_dirs()
+        db = get_manager(args.database)
+        # Create extractor with database manager
+        extractor = NFLDataExtractor(db, stream_pbp=SETTINGS.stream_pbp, cache_dir=SETTINGS.cache_dir)
+        
+        results = extractor.extract_all_data(
+            seasons=args.seasons,
+            max_workers=args.workers
+        )
+        db.invalidate_cache()
+        
+        print("\n=== Extraction Results ===", file=out)
+        lines = [f"{table}: {records:,} records" for table, records in results.items()]
+        lines.append(f"\nTotal records extracted: {sum(results.values()):,}")
+        print('\n'.join(lines), file=out)
+        
+        summary_lines = _refresh_dependent_summaries(db, args.database, results, seasons=args.seasons)
+        if summary_lines:
+            print("\n=== Summary Tables Rebuilt ===", file=out)
+            print('\n'.join(summary_lines), file=out)
+        
+        # Validate data quality
+        if not args.skip_validation:
+            print("\n=== Data Quality Validation ===", file=out)
+            quality_results = db.validate_all(list(results), null_threshold=50, max_workers=MAX_WORKERS)
+            for table, quality in quality_results.items():
                 if quality:
-                    print(f"{table}: {quality.get('rows', 0)} rows, {quality.get('columns', 0)} columns")
-                    if 'null_checks' in quality:
-                        high_null_cols = [
-                            col for col, info in quality['null_checks'].items()
-                            if info['null_percentage'] > 50
-                        ]
-                        if high_null_cols:
-                            print(f"  High NULL columns: {', '.join(high_null_cols)}")
+                    print(f"{table}: {quality.get('rows', 0)} rows, {quality.get('columns', 0)} columns", file=out)
+                    high_null_cols = quality.get('high_null_columns', [])
+                    if high_null_cols:
+                        print(f"  High NULL columns: {', '.join(high_null_cols)}", file=out)
             
         logger.info("Data extraction completed successfully")
         
     except Exception as e:
         logger.error(f"Failed to extract data: {e}")
         sys.exit(1)
+    finally:
+        _write_output(out)
 
 
 def refresh_season(args):
     """Refresh data for a specific season"""
+    from nfl_analytics.extractors.data_extractor import NFLDataExtractor
+    
     try:
         logger.info(f"Refreshing season {args.season} data")
         
-        with DatabaseManager(args.database) as db:
-            # Create extractor with database manager
-            extractor = NFLDataExtractor(db)
-            
-            results = extractor.refresh_season_data(
-                season=args.season,
-                data_types=args.data_types
+        ensure_dirs()
+        db = get_manager(args.database)
+        # Create extractor with database manager
+        extractor = NFLDataExtractor(db, stream_pbp=SETTINGS.stream_pbp, cache_dir=SETTINGS.cache_dir)
+        
+        results = extractor.refresh_season_data(
+            season=args.season,
+            data_types=args.data_types
+        )
+        db.invalidate_cache()
+        
+        lines = [f"\n=== Season {args.season} Refresh Results ==="]
+        lines.extend(f"{table}: {records:,} records" for table, records in results.items())
+        
+        summary_lines = _refresh_dependent_summaries(db, args.database, results, seasons=[args.season])
+        if summary_lines:
+            lines.append("\n=== Summary Tables Rebuilt ===")
+            lines.extend(summary_lines)
+        
+        # Validate data quality after refresh
+        if not args.skip_validation:
+            lines.append(f"\n=== Data Quality After Refresh ===")
+            quality_results = db.validate_all(list(results), max_workers=MAX_WORKERS)
+            lines.extend(
+                f"{table}: {quality.get('rows', 0)} rows, {quality.get('columns', 0)} columns"
+                for table, quality in quality_results.items() if quality
             )
-            
-            print(f"\n=== Season {args.season} Refresh Results ===")
-            for table, records in results.items():
-                print(f"{table}: {records:,} records")
-            
-            # Validate data quality after refresh
-            print(f"\n=== Data Quality After Refresh ===")
-            for table in results.keys():
-                quality = db.validate_data_quality(table)
-                if quality:
-                    print(f"{table}: {quality.get('rows', 0)} rows, {quality.get('columns', 0)} columns")
+        print('\n'.join(lines))
                     
         logger.info("Season refresh completed successfully")
         
@@ -106,96 +224,197 @@ def refresh_season(args):
 
 def validate_database(args):
     """Validate database data quality"""
+    out = io.StringIO()
     try:
         logger.info("Starting database validation")
         
-        with DatabaseManager(args.database) as db:
-            stats = db.get_database_stats()
-            
-            print("\n=== Database Overview ===")
-            print(f"Tables: {len(stats.get('tables', []))}")
-            
-            print("\n=== Record Counts ===")
-            for table, count in stats.get('record_counts', {}).items():
-                print(f"{table}: {count:,} records")
-            
-            print("\n=== Season Coverage ===")
-            for table, seasons in stats.get('season_coverage', {}).items():
-                if seasons:
-                    print(f"{table}: {seasons}")
-            
-            print("\n=== Data Quality Validation ===")
-            for table in stats.get('tables', []):
-                if table != 'data_refresh_log':
-                    quality = db.validate_data_quality(table)
-                    if quality:
-                        print(f"\n{table.upper()}:")
-                        print(f"  Rows: {quality.get('rows', 0):,}")
-                        print(f"  Columns: {quality.get('columns', 0)}")
-                        
-                        if 'duplicates' in quality:
-                            print(f"  Duplicates: {quality['duplicates']}")
-                        
-                        if 'null_checks' in quality:
-                            high_null_cols = [
-                                f"{col} ({info['null_percentage']:.1f}%)"
-                                for col, info in quality['null_checks'].items()
-                                if info['null_percentage'] > 10
-                            ]
-                            if high_null_cols:
-                                print(f"  High NULL columns: {', '.join(high_null_cols)}")
+        db = get_manager(args.database)
+        stats = db.get_database_stats(exclude=VALIDATION_EXCLUDED_TABLES, exact=True)
+        
+        print("\n=== Database Overview ===", file=out)
+        print(f"Tables: {len(stats.get('tables', []))}", file=out)
+        
+        print("\n=== Record Counts ===", file=out)
+        for table, count in stats.get('record_counts', {}).items():
+            print(f"{table}: {count:,} records", file=out)
+        
+        print("\n=== Season Coverage ===", file=out)
+        for table, seasons in stats.get('season_coverage', {}).items():
+            if seasons:
+                print(f"{table}: {seasons}", file=out)
+        
+        print("\n=== Data Quality Validation ===", file=out)
+        quality_results = db.validate_all(stats.get('tables', []), null_threshold=10, max_workers=MAX_WORKERS)
+        for table, quality in quality_results.items():
+            if quality:
+                print(f"\n{table.upper()}:", file=out)
+                print(f"  Rows: {quality.get('rows', 0):,}", file=out)
+                print(f"  Columns: {quality.get('columns', 0)}", file=out)
+                
+                if 'duplicates' in quality:
+                    print(f"  Duplicates: {quality['duplicates']}", file=out)
+                
+                null_checks = quality['null_checks']
+                high_nulls = null_checks.loc[
+                    null_checks['column'].isin(quality.get('high_null_columns', [])),
+                    ['column', 'null_pct']
+                ]
+                high_null_cols = [f"{col} ({pct:.1f}%)" for col, pct in high_nulls.to_numpy()]
+                if high_null_cols:
+                    print(f"  High NULL columns: {', '.join(high_null_cols)}", file=out)
             
     except Exception as e:
         logger.error(f"Failed to validate database: {e}")
         sys.exit(1)
+    finally:
+        _write_output(out)
 
 
 def show_schema(args):
     """Show database schema information"""
+    out = io.StringIO()
     try:
-        with DatabaseManager(args.database) as db:
-            stats = db.get_database_stats()
-            
-            print("\n=== Database Schema ===")
-            for table in stats.get('tables', []):
-                print(f"\n{table.upper()}:")
-                try:
-                    table_info = db.get_table_info(table)
-                    for _, row in table_info.iterrows():
-                        print(f"  {row['column_name']}: {row['column_type']}")
-                except Exception as e:
-                    print(f"  Error getting schema: {e}")
+        db = get_manager(args.database)
+        
+        print("\n=== Database Schema ===", file=out)
+        for table, table_info in db.get_all_table_info().items():
+            print(f"\n{table.upper()}:", file=out)
+            for col_name, col_type in table_info[['column_name', 'column_type']].to_numpy():
+                print(f"  {col_name}: {col_type}", file=out)
                     
     except Exception as e:
         logger.error(f"Failed to show schema: {e}")
         sys.exit(1)
+    finally:
+        _write_output(out)
+
+
+def _write_feather(db, sql: str, output_path: str, batch_size: int = 100_000):
+    """Stream query results to a zstd-compressed Feather (Arrow IPC) file"""
+    import pyarrow as pa
+    
+    reader = db.conn.execute(sql).fetch_record_batch(batch_size)
+    options = pa.ipc.IpcWriteOptions(compression='zstd')
+    with pa.ipc.new_file(output_path, reader.schema, options=options) as writer:
+        for batch in reader:
+            writer.write_batch(batch)
+
+
+# Query output writers, keyed by format name / file extension. CSV, Parquet
+# and JSON are streamed to disk by DuckDB's COPY and Feather by Arrow's IPC
+# writer, one record batch at a time; none go through pandas
+OUTPUT_WRITERS = {
+    'csv': lambda db, sql, output_path: db.copy_to(sql, output_path, 'csv'),
+    'parquet': lambda db, sql, output_path: db.copy_to(sql, output_path, 'parquet'),
+    'feather': _write_feather,
+    'arrow': _write_feather,
+    'json': lambda db, sql, output_path: db.copy_to(sql, output_path, 'json'),
+}
+
+
+def _write_batches(reader) -> int:
+    """
+    Print record batches to the console as one aligned table
+    
+    Column widths are worked out once from the first batch, and the index
+    column is CONSOLE_INDEX_WIDTH wide, so batches line up with each other;
+    only later values wider than any in the first batch stick out.
+    
+    Args:
+        reader: Record batch reader over the query results
+        
+    Returns:
+        Number of rows printed
+    """
+    col_space = None
+    rows_printed = 0
+    for batch in reader:
+        chunk = batch.to_pandas()
+        if chunk.empty:
+            continue
+        if col_space is None:
+            col_space = [
+                max(len(line) for line in chunk.iloc[:, [j]].to_string(index=False).split('\n'))
+                for j in range(chunk.shape[1])
+            ]
+            header = chunk.head(1).to_string(index=False, col_space=col_space).split('\n', 1)[0]
+            sys.stdout.write(' ' * CONSOLE_INDEX_WIDTH + ' ' + header + '\n')
+        lines = chunk.to_string(index=False, header=False, col_space=col_space).split('\n')
+        sys.stdout.write(''.join(
+            f"{str(rows_printed + i).ljust(CONSOLE_INDEX_WIDTH)} {line}\n" for i, line in enumerate(lines)
+        ))
+        rows_printed += len(chunk)
+    return rows_printed
 
 
 def query_data(args):
     """Execute a SQL query against the database"""
+    import pyarrow as pa
+    
     try:
-        with DatabaseManager(args.database) as db:
-            if args.file:
-                # Read SQL from file
-                with open(args.file, 'r') as f:
-                    sql = f.read()
+        db = get_manager(args.database)
+        if args.file:
+            # Read SQL from file
+            with open(args.file, 'r') as f:
+                sql = f.read()
+        else:
+            sql = args.sql
+        
+        if args.explain:
+            # EXPLAIN ANALYZE runs the query, so it may have changed tables
+            prefix = 'EXPLAIN ANALYZE' if args.explain == 'analyze' else 'EXPLAIN'
+            plan = db.conn.execute(f"{prefix} {sql.strip().rstrip(';')}").fetchall()
+            db.invalidate_cache()
+            print('\n'.join(explain_value for _, explain_value in plan))
+        elif args.output:
+            ensure_dirs()
+            output_format = args.format or Path(args.output).suffix.lower().lstrip('.')
+            if output_format not in OUTPUT_WRITERS:
+                logger.warning(
+                    f"Unknown output format '{output_format}' for {args.output}, writing Parquet"
+                )
+                output_format = 'parquet'
+            
+            OUTPUT_WRITERS[output_format](db, sql, args.output)
+            print(f"Results saved to {args.output}")
+        else:
+            # Print to console, stopping after --limit rows (CONSOLE_ROW_LIMIT
+            # by default in a terminal)
+            if args.all:
+                row_limit = None
+            elif args.limit is not None:
+                row_limit = args.limit
             else:
-                sql = args.sql
-            
-            result = db.query(sql)
-            
-            if args.output:
-                # Save to file
-                if args.output.endswith('.csv'):
-                    result.to_csv(args.output, index=False)
-                elif args.output.endswith('.parquet'):
-                    result.to_parquet(args.output, index=False)
-                else:
-                    result.to_json(args.output, orient='records')
-                print(f"Results saved to {args.output}")
+                row_limit = CONSOLE_ROW_LIMIT if sys.stdout.isatty() else None
+            reader = db.conn.execute(sql).fetch_record_batch(
+                CONSOLE_BATCH_ROWS if row_limit is None else max(1, row_limit)
+            )
+            # Arbitrary SQL may have changed tables
+            db.invalidate_cache()
+            truncated = False
+            if row_limit is None:
+                # Unlimited output is streamed one record batch at a time
+                rows_printed = _write_batches(reader)
             else:
-                # Print to console
-                print(result.to_string())
+                # Limited output fits in one batch of row_limit rows and is
+                # printed as a single table; a further batch means more rows
+                batches = []
+                rows_printed = 0
+                for batch in reader:
+                    if rows_printed >= row_limit:
+                        truncated = True
+                        break
+                    batch = batch.slice(0, row_limit - rows_printed)
+                    batches.append(batch)
+                    rows_printed += len(batch)
+                if rows_printed:
+                    result = pa.Table.from_batches(batches).to_pandas()
+                    sys.stdout.write(result.to_string() + '\n')
+            
+            if truncated:
+                print(f"... output truncated at {row_limit:,} rows (use --limit or --all to print more)")
+            elif rows_printed == 0:
+                print(f"Empty result (columns: {', '.join(reader.schema.names)})")
                 
     except Exception as e:
         logger.error(f"Failed to execute query: {e}")
@@ -204,43 +423,46 @@ def query_data(args):
 
 def refresh_raw_ecr(args):
     """Refresh raw ECR rankings data"""
+    from nfl_analytics.extractors.ecr_extractor import ECRExtractor
+    
     try:
         logger.info("Starting ECR data refresh")
         
-        with DatabaseManager(args.database) as db:
-            # Create ECR extractor
-            ecr_extractor = ECRExtractor(db)
-            
-            # Refresh the data
-            results = ecr_extractor.refresh_raw_ecr()
-            
-            if 'error' in results:
-                print(f"Error: {results['error']}")
-                sys.exit(1)
-            
-            print("\n=== ECR Refresh Results ===")
-            print(f"Total records: {results['total_records']:,}")
-            print(f"Processed files: {results['processed_files']}")
-            print(f"Failed files: {results['failed_files']}")
-            
-            # Display verification results
-            verification = results.get('verification', {})
-            if isinstance(verification, dict) and 'year_coverage' in verification:
-                print("\n=== Year Coverage ===")
-                for year_data in verification['year_coverage']:
-                    year = year_data['year']
-                    total = year_data['total_records']
-                    before = year_data['before_preseason_records']
-                    after = year_data['after_preseason_records']
-                    print(f"{year}: {total:,} total ({before:,} pre-preseason, {after:,} preseason)")
-            
-            if isinstance(verification, dict) and 'data_quality' in verification:
-                quality = verification['data_quality']
-                print(f"\n=== Data Quality ===")
-                print(f"Year range: {quality['min_year']} - {quality['max_year']}")
-                print(f"Unique years: {quality['unique_years']}")
-                print(f"Years with pre-preseason data: {quality['years_with_prepreseason']}")
-                print(f"Years with preseason data: {quality['years_with_preseason']}")
+        db = get_manager(args.database)
+        # Create ECR extractor
+        ecr_extractor = ECRExtractor(db)
+        
+        # Refresh the data
+        results = ecr_extractor.refresh_raw_ecr()
+        db.invalidate_cache()
+        
+        if 'error' in results:
+            print(f"Error: {results['error']}")
+            sys.exit(1)
+        
+        print("\n=== ECR Refresh Results ===")
+        print(f"Total records: {results['total_records']:,}")
+        print(f"Processed files: {results['processed_files']}")
+        print(f"Failed files: {results['failed_files']}")
+        
+        # Display verification results
+        verification = results.get('verification', {})
+        if isinstance(verification, dict) and 'year_coverage' in verification:
+            print("\n=== Year Coverage ===")
+            for year_data in verification['year_coverage']:
+                year = year_data['year']
+                total = year_data['total_records']
+                before = year_data['before_preseason_records']
+                after = year_data['after_preseason_records']
+                print(f"{year}: {total:,} total ({before:,} pre-preseason, {after:,} preseason)")
+        
+        if isinstance(verification, dict) and 'data_quality' in verification:
+            quality = verification['data_quality']
+            print(f"\n=== Data Quality ===")
+            print(f"Year range: {quality['min_year']} - {quality['max_year']}")
+            print(f"Unique years: {quality['unique_years']}")
+            print(f"Years with pre-preseason data: {quality['years_with_prepreseason']}")
+            print(f"Years with preseason data: {quality['years_with_preseason']}")
             
         logger.info("ECR refresh completed successfully")
         
@@ -251,39 +473,42 @@ def refresh_raw_ecr(args):
 
 def refresh_transformed_ecr(args):
     """Transform raw ECR data into ECR rankings with player IDs"""
+    from nfl_analytics.extractors.ecr_extractor import ECRExtractor
+    
     try:
         logger.info("Starting ECR transformation with player ID matching")
         
-        with DatabaseManager(args.database) as db:
-            # Create ECR extractor
-            ecr_extractor = ECRExtractor(db)
-            
-            # Transform the data
-            results = ecr_extractor.create_ecr_rankings_with_player_ids()
-            
-            if 'error' in results:
-                print(f"Error: {results['error']}")
-                sys.exit(1)
-            
-            print("\n=== ECR Transformation Results ===")
-            print(f"Total records processed: {results.get('total_records', 0):,}")
-            print(f"Successfully matched: {results.get('matched_records', 0):,}")
-            print(f"Unmatched records: {results.get('unmatched_records', 0):,}")
-            
-            # Display match statistics if available
-            if 'match_stats' in results:
-                stats = results['match_stats']
-                print(f"\n=== Match Statistics ===")
-                print(f"Exact matches: {stats.get('exact_matches', 0):,}")
-                print(f"Partial matches: {stats.get('partial_matches', 0):,}")
-                print(f"No matches: {stats.get('no_matches', 0):,}")
-            
-            # Display verification results if available
-            if 'verification' in results:
-                verification = results['verification']
-                print(f"\n=== Data Verification ===")
-                print(f"Final table records: {verification.get('final_count', 0):,}")
-                print(f"Duplicate records removed: {verification.get('duplicates_removed', 0):,}")
+        db = get_manager(args.database)
+        # Create ECR extractor
+        ecr_extractor = ECRExtractor(db)
+        
+        # Transform the data
+        results = ecr_extractor.create_ecr_rankings_with_player_ids()
+        db.invalidate_cache()
+        
+        if 'error' in results:
+            print(f"Error: {results['error']}")
+            sys.exit(1)
+        
+        print("\n=== ECR Transformation Results ===")
+        print(f"Total records processed: {results.get('total_records', 0):,}")
+        print(f"Successfully matched: {results.get('matched_records', 0):,}")
+        print(f"Unmatched records: {results.get('unmatched_records', 0):,}")
+        
+        # Display match statistics if available
+        if 'match_stats' in results:
+            stats = results['match_stats']
+            print(f"\n=== Match Statistics ===")
+            print(f"Exact matches: {stats.get('exact_matches', 0):,}")
+            print(f"Partial matches: {stats.get('partial_matches', 0):,}")
+            print(f"No matches: {stats.get('no_matches', 0):,}")
+        
+        # Display verification results if available
+        if 'verification' in results:
+            verification = results['verification']
+            print(f"\n=== Data Verification ===")
+            print(f"Final table records: {verification.get('final_count', 0):,}")
+            print(f"Duplicate records removed: {verification.get('duplicates_removed', 0):,}")
             
         logger.info("ECR transformation completed successfully")
         
@@ -294,12 +519,16 @@ def refresh_transformed_ecr(args):
 
 def refresh_summary_tables(args):
     """Refresh all summary (smry_) tables"""
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    
+    from summarizers import SUMMARY_TABLES, run_all_tests
+    
     try:
         logger.info("Starting summary tables refresh")
         
         # Dictionary to track summary table functions
         summary_functions = {
-            'smry_season': create_smry_season_table
+            table_name: create_func for table_name, (create_func, *_) in SUMMARY_TABLES.items()
         }
         
         # Dictionary to track results
@@ -307,30 +536,50 @@ def refresh_summary_tables(args):
         
         print("\n=== Summary Tables Refresh ===")
         
-        # Create each summary table
-        for table_name, create_func in summary_functions.items():
-            logger.info(f"Creating {table_name} table...")
-            print(f"Creating {table_name}...")
-            
+        # Create the summary tables concurrently, each on its own cursor of
+        # the shared manager's connection
+        db = get_manager(args.database)
+        
+        def build_table(create_func):
+            cursor = db.conn.cursor()
             try:
-                create_func(args.database)
-                
-                # Get record count
-                with DatabaseManager(args.database) as db:
-                    count_result = db.query(f"SELECT COUNT(*) as count FROM {table_name}")
-                    record_count = count_result.iloc[0]['count']
+                return create_func(args.database, conn=cursor)
+            finally:
+                cursor.close()
+        
+        max_workers = min(len(summary_functions), os.cpu_count() or 1)
+        # Per-table status lines, in summary_functions order, printed together
+        # once every table is done so they aren't interleaved with failures
+        status_lines = [None] * len(summary_functions)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for index, (table_name, create_func) in enumerate(summary_functions.items()):
+                logger.info(f"Creating {table_name} table...")
+                futures[executor.submit(build_table, create_func)] = (index, table_name)
+            print('\n'.join(f"Creating {table_name}..." for table_name in summary_functions))
+            
+            for future in as_completed(futures):
+                index, table_name = futures[future]
+                try:
+                    # Each builder returns the row count its CREATE TABLE AS
+                    # reported, so the table isn't counted again
+                    record_count = future.result()
+                    db.invalidate_cache()
+                    db.log_refresh(table_name, 0, None, 'ALL', 'SUCCESS', records_processed=record_count)
                     results[table_name] = record_count
-                    print(f"  ✅ {table_name}: {record_count:,} records")
+                    status_lines[index] = f"  ✅ {table_name}: {record_count:,} records"
                     
-            except Exception as e:
-                logger.error(f"Failed to create {table_name}: {e}")
-                print(f"  ❌ {table_name}: Failed - {e}")
-                results[table_name] = 0
+                except Exception as e:
+                    logger.error(f"Failed to create {table_name}: {e}")
+                    status_lines[index] = f"  ❌ {table_name}: Failed - {e}"
+                    results[table_name] = 0
+        
+        print('\n'.join(status_lines))
         
         # Run tests if requested
         if args.run_tests:
             print("\n=== Running Tests ===")
-            test_results = run_all_tests(args.database)
+            test_results = run_all_tests(args.database, conn=db.conn)
             
             passed = sum(test_results.values())
             total = len(test_results)
@@ -343,17 +592,20 @@ def refresh_summary_tables(args):
                 logger.info("All tests passed successfully")
         
         # Summary
-        print(f"\n=== Summary Tables Refresh Complete ===")
         total_records = sum(results.values())
         successful_tables = len([v for v in results.values() if v > 0])
         total_tables = len(results)
         
-        print(f"Tables created: {successful_tables}/{total_tables}")
-        print(f"Total records: {total_records:,}")
-        
-        for table_name, count in results.items():
-            status = "✅" if count > 0 else "❌"
-            print(f"  {status} {table_name}: {count:,} records")
+        lines = [
+            f"\n=== Summary Tables Refresh Complete ===",
+            f"Tables created: {successful_tables}/{total_tables}",
+            f"Total records: {total_records:,}"
+        ]
+        lines.extend(
+            f"  {'✅' if count > 0 else '❌'} {table_name}: {count:,} records"
+            for table_name, count in results.items()
+        )
+        print('\n'.join(lines))
         
         if successful_tables != total_tables:
             logger.error(f"Some summary tables failed to create: {successful_tables}/{total_tables}")
@@ -369,33 +621,80 @@ def refresh_summary_tables(args):
 
 
 
-def main():
-    """Main CLI interface"""
-    parser = argparse.ArgumentParser(
-        description='NFL Analytics Data Management System',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  %(prog)s extract --seasons 2022 2023 2024 --database nfl.duckdb
-  %(prog)s refresh-season --season 2024 --database nfl.duckdb
-  %(prog)s refresh-raw-ecr --database nfl.duckdb
-  %(prog)s refresh-transformed-ecr --database nfl.duckdb
-  %(prog)s refresh-summary --database nfl.duckdb --run-tests
-  %(prog)s validate --database nfl.duckdb
-  %(prog)s schema --database nfl.duckdb
-  %(prog)s query --sql "SELECT * FROM weekly_stats WHERE season = 2024 LIMIT 10" --database nfl.duckdb
-        """
-    )
+def _parse_step(step: str, database: str) -> argparse.Namespace:
+    """
+    Parse one pipeline step into the arguments for its command
     
-    parser.add_argument(
-        '--database', '-d',
-        default='prod_nfl.duckdb',
-        help='Path to DuckDB database file (default: prod_nfl.duckdb)'
+    Args:
+        step: Step in the form name[:option=value...], where values of
+            multi-value options are comma separated and flags take no value.
+            Options are only split at a colon followed by one of the step's
+            option names, so values such as SQL casts may contain colons
+        database: Database path shared by every step
+        
+    Returns:
+        Parsed arguments for the step's command
+    """
+    name, _, option_text = step.partition(':')
+    if name not in COMMAND_PARSERS or name == 'run':
+        raise ValueError(f"Unknown pipeline step: {name}")
+    
+    step_parser = argparse.ArgumentParser(prog=f"run {name}")
+    step_subparsers = step_parser.add_subparsers(dest='command')
+    COMMAND_PARSERS[name](step_subparsers)
+    actions = {
+        action.dest: action for action in step_subparsers.choices[name]._actions
+    }
+    option_names = sorted(
+        {form for dest in actions for form in (dest, dest.replace('_', '-'))},
+        key=len, reverse=True
     )
+    option_boundary = re.compile(
+        ':(?=(?:{})(?:=|:|$))'.format('|'.join(map(re.escape, option_names)))
+    )
+    options = option_boundary.split(option_text) if option_text else []
     
-    subparsers = parser.add_subparsers(dest='command', help='Available commands')
+    argv = [name]
+    for option in options:
+        key, _, value = option.partition('=')
+        dest = key.replace('-', '_')
+        action = actions.get(dest)
+        if action is None:
+            raise ValueError(f"Unknown option for {name} step: {key}")
+        
+        values = value.split(',') if action.nargs in ('+', '*') else [value]
+        if action.option_strings:
+            argv.append(action.option_strings[-1] if action.nargs == 0 else action.option_strings[0])
+            if action.nargs != 0:
+                argv.extend(values)
+        else:
+            argv.extend(values)
     
-    # Extract command
+    step_args = step_parser.parse_args(argv)
+    step_args.database = database
+    return step_args
+
+
+def run_pipeline(args):
+    """Run several commands in order against the same database connection"""
+    try:
+        steps = [_parse_step(step, args.database) for step in args.steps]
+    except ValueError as e:
+        logger.error(f"Invalid pipeline: {e}")
+        sys.exit(1)
+    
+    logger.info(f"Running pipeline: {' -> '.join(step.command for step in steps)}")
+    
+    # Every handler shares the cached manager, so the database is opened once
+    for step_args in steps:
+        logger.info(f"Running pipeline step: {step_args.command}")
+        step_args.func(step_args)
+    
+    logger.info("Pipeline completed successfully")
+
+
+def build_extract_parser(subparsers):
+    """Add the extract command"""
     extract_parser = subparsers.add_parser('extract', help='Extract NFL data')
     extract_parser.add_argument(
         'seasons', nargs='+', type=int,
@@ -405,9 +704,15 @@ Examples:
         '--workers', '-w', type=int, default=4,
         help='Number of concurrent workers (default: 4)'
     )
+    extract_parser.add_argument(
+        '--skip-validation', action='store_true',
+        help='Skip the data quality checks after extraction (faster; run validate later)'
+    )
     extract_parser.set_defaults(func=extract_all_data)
-    
-    # Refresh season command
+
+
+def build_refresh_season_parser(subparsers):
+    """Add the refresh-season command"""
     refresh_season_parser = subparsers.add_parser('refresh-season', help='Refresh season data')
     refresh_season_parser.add_argument(
         'season', type=int,
@@ -415,36 +720,52 @@ Examples:
     )
     refresh_season_parser.add_argument(
         '--data-types', nargs='+',
-        choices=['pbp_data', 'weekly_stats', 'seasonal_stats', 'rosters', 'injuries'],
+        choices=DATA_TYPE_CHOICES,
         help='Specific data types to refresh'
     )
+    refresh_season_parser.add_argument(
+        '--skip-validation', action='store_true',
+        help='Skip the data quality checks after the refresh (faster; run validate later)'
+    )
     refresh_season_parser.set_defaults(func=refresh_season)
-    
-    # Refresh ECR command
+
+
+def build_refresh_raw_ecr_parser(subparsers):
+    """Add the refresh-raw-ecr command"""
     refresh_ecr_parser = subparsers.add_parser('refresh-raw-ecr', help='Refresh Expert Consensus Rankings data')
     refresh_ecr_parser.set_defaults(func=refresh_raw_ecr)
-    
-    # Refresh transformed ECR command
+
+
+def build_refresh_transformed_ecr_parser(subparsers):
+    """Add the refresh-transformed-ecr command"""
     refresh_transformed_ecr_parser = subparsers.add_parser('refresh-transformed-ecr', help='Transform raw ECR data into ECR rankings with player IDs')
     refresh_transformed_ecr_parser.set_defaults(func=refresh_transformed_ecr)
-    
-    # Refresh summary tables command
+
+
+def build_refresh_summary_parser(subparsers):
+    """Add the refresh-summary command"""
     refresh_summary_parser = subparsers.add_parser('refresh-summary', help='Refresh all summary (smry_) tables')
     refresh_summary_parser.add_argument(
         '--run-tests', action='store_true',
         help='Run validation tests after creating summary tables'
     )
     refresh_summary_parser.set_defaults(func=refresh_summary_tables)
-    
-    # Validate command
+
+
+def build_validate_parser(subparsers):
+    """Add the validate command"""
     validate_parser = subparsers.add_parser('validate', help='Validate database data quality')
     validate_parser.set_defaults(func=validate_database)
-    
-    # Schema command
+
+
+def build_schema_parser(subparsers):
+    """Add the schema command"""
     schema_parser = subparsers.add_parser('schema', help='Show database schema')
     schema_parser.set_defaults(func=show_schema)
-    
-    # Query command
+
+
+def build_query_parser(subparsers):
+    """Add the query command"""
     query_parser = subparsers.add_parser('query', help='Execute SQL query')
     query_group = query_parser.add_mutually_exclusive_group(required=True)
     query_group.add_argument(
@@ -457,9 +778,120 @@ Examples:
     )
     query_parser.add_argument(
         '--output', '-o',
-        help='Output file (CSV, JSON, or Parquet)'
+        help='Output file (CSV, JSON, Parquet, or Feather/Arrow)'
+    )
+    query_parser.add_argument(
+        '--format', choices=list(OUTPUT_WRITERS),
+        help='Output file format (default: from the output file extension, '
+             'or Parquet if the extension is not recognized)'
+    )
+    query_limit_group = query_parser.add_mutually_exclusive_group()
+    query_limit_group.add_argument(
+        '--limit', type=int,
+        help=f'Maximum rows to print to the console (default: {CONSOLE_ROW_LIMIT:,} '
+             f'in a terminal, unlimited when piped)'
+    )
+    query_limit_group.add_argument(
+        '--all', action='store_true',
+        help='Print every row to the console'
+    )
+    query_parser.add_argument(
+        '--explain', choices=['plan', 'analyze'],
+        help="Print DuckDB's query plan instead of the results; 'analyze' runs "
+             "the query and includes per-operator timings and row counts"
     )
     query_parser.set_defaults(func=query_data)
+
+
+def build_run_parser(subparsers):
+    """Add the run command"""
+    run_parser = subparsers.add_parser('run', help='Run a pipeline of commands against one database connection')
+    run_parser.add_argument(
+        '--steps', nargs='+', required=True,
+        help='Commands to run in order, as name[:option=value...] '
+             '(e.g., extract:seasons=2023,2024 validate schema)'
+    )
+    run_parser.set_defaults(func=run_pipeline)
+
+
+# Subcommand parser builders, in the order they are listed in --help
+COMMAND_PARSERS = {
+    'extract': build_extract_parser,
+    'refresh-season': build_refresh_season_parser,
+    'refresh-raw-ecr': build_refresh_raw_ecr_parser,
+    'refresh-transformed-ecr': build_refresh_transformed_ecr_parser,
+    'refresh-summary': build_refresh_summary_parser,
+    'validate': build_validate_parser,
+    'schema': build_schema_parser,
+    'query': build_query_parser,
+    'run': build_run_parser,
+}
+
+
+def _find_command(argv: List[str]) -> str:
+    """
+    Find the subcommand name in the command line arguments
+    
+    Args:
+        argv: Command line arguments, without the program name
+        
+    Returns:
+        Subcommand name, or None if no known subcommand is present
+    """
+    args = iter(argv)
+    for arg in args:
+        if arg in ('--database', '-d'):
+            # Skip the option's value
+            next(args, None)
+        elif arg in COMMAND_PARSERS:
+            return arg
+        elif not arg.startswith('-'):
+            return None
+    return None
+
+
+def main():
+    """Main CLI interface"""
+    configure_logging()
+    
+    parser = argparse.ArgumentParser(
+        description='NFL Analytics Data Management System',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s extract --seasons 2022 2023 2024 --database nfl.duckdb
+  %(prog)s refresh-season --season 2024 --database nfl.duckdb
+  %(prog)s extract 2024 --skip-validation --database nfl.duckdb
+  %(prog)s refresh-raw-ecr --database nfl.duckdb
+  %(prog)s refresh-transformed-ecr --database nfl.duckdb
+  %(prog)s refresh-summary --database nfl.duckdb --run-tests
+  %(prog)s validate --database nfl.duckdb
+  %(prog)s schema --database nfl.duckdb
+  %(prog)s query --sql "SELECT * FROM weekly_stats WHERE season = 2024 LIMIT 10" --database nfl.duckdb
+  %(prog)s query --sql "SELECT season, COUNT(*) FROM pbp_data GROUP BY season" --explain analyze --database nfl.duckdb
+  %(prog)s run --steps extract:seasons=2023,2024 validate schema --database nfl.duckdb
+
+extract and refresh-season validate every table they load, which scans it
+again; pass --skip-validation to load faster and run validate separately.
+        """
+    )
+    
+    parser.add_argument(
+        '--database', '-d',
+        default='prod_nfl.duckdb',
+        help='Path to DuckDB database file (default: prod_nfl.duckdb)'
+    )
+    
+    subparsers = parser.add_subparsers(dest='command', help='Available commands')
+    
+    # Only build the parser for the command being run; fall back to every
+    # command for top-level help and unrecognized input
+    command = _find_command(sys.argv[1:])
+    if command:
+        COMMAND_PARSERS[command](subparsers)
+    else:
+        for build_parser in COMMAND_PARSERS.values():
+            build_parser(subparsers)
     
     args = parser.parse_args()
     
@@ -5,9 +5,25 @@ A comprehensive system for extracting, storing, and analyzing NFL data
 using nfl_data_py and DuckDB.
 """
 
-from .database.manager import DatabaseManager
-from .extractors.data_extractor import NFLDataExtractor
-from .models.fantasy_points import FantasyPointsCalculator
+import importlib
 
 __version__ = "0.1.0"
 __all__ = ["DatabaseManager", "NFLDataExtractor", "FantasyPointsCalculator"]
+
+# Public classes and their modules, imported on first access so that using
+# only the database layer doesn't import nfl_data_py
+_LAZY_IMPORTS = {
+    "DatabaseManager": ".database.manager",
+    "NFLDataExtractor": ".extractors.data_extractor",
+    "FantasyPointsCalculator": ".models.fantasy_points",
+}
+
+
+def __getattr__(name: str):
+    """Import a public class from its module on first access"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
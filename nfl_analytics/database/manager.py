@@ -6,37 +6,90 @@ Handles DuckDB database operations with proper data types and NULL handling
 import duckdb
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Iterable, FrozenSet, Union
 import logging
-from datetime import datetime, date
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 import re
 
-from .schema_generator import SchemaGenerator
+from .schema_generator import RESERVED_KEYWORD_RENAMES, SchemaGenerator
 
 logger = logging.getLogger(__name__)
 
+# COPY ... TO options for each export format supported by copy_to()
+COPY_FORMAT_OPTIONS = {
+    'csv': "FORMAT CSV, HEADER true",
+    'parquet': "FORMAT PARQUET, COMPRESSION ZSTD, ROW_GROUP_SIZE 100000",
+    'json': "FORMAT JSON, ARRAY true",
+}
+
+# Columns of a buffered data_refresh_log entry, in the order log_refresh() stores them
+REFRESH_LOG_COLUMNS = [
+    'table_name', 'season', 'week', 'season_type', 'status',
+    'error_message', 'records_processed', 'refresh_date'
+]
+
+REFRESH_STATUSES = ('SUCCESS', 'FAILED', 'IN_PROGRESS')
+
+# Table names insert_dataframe() may create; anything else is rejected
+IDENTIFIER_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+# Row metadata columns that DuckDB fills with the insert time
+TIMESTAMP_COLUMNS = ('created_at', 'updated_at')
+
+# DuckDB types inferred from floating point data, which are never narrowed
+FLOAT_SQL_TYPES = ('DOUBLE', 'FLOAT', 'REAL')
+
+# Approximate number of values appended per slice by insert_dataframe()
+APPEND_CHUNK_CELLS = 8_000_000
+
 
 class DatabaseManager:
     """Database manager with proper data type handling and NULL support"""
     
-    def __init__(self, db_path: str = "nfl_analytics.duckdb"):
+    def __init__(self, db_path: str = "nfl_analytics.duckdb",
+                 db_config: Optional[Dict[str, Any]] = None):
         """
         Initialize database manager
         
         Args:
             db_path: Path to DuckDB database file
+            db_config: DuckDB settings for the connection, such as threads,
+                memory_limit, temp_directory and preserve_insertion_order
         """
         self.db_path = Path(db_path)
+        self.db_config = dict(db_config or {})
         self.conn = None
         self.schema_generator = SchemaGenerator()
+        # Bumped on every write through this manager; cached stats are only
+        # reused while the version they were computed at is current
+        self._schema_version = 0
+        self._stats_cache: Optional[Tuple[int, Tuple[FrozenSet[str], bool], Dict[str, Any]]] = None
+        # Refresh log entries waiting to be written by flush_refresh_log()
+        self._refresh_buffer: List[Tuple] = []
+        self._refresh_lock = threading.Lock()
+        self._create_lock = threading.Lock()
+        # Timestamp columns insert_dataframe() must fill itself, per prepared table
+        self._unfilled_timestamps: Dict[str, List[str]] = {}
+        # Lowercased column names of each prepared table
+        self._table_columns: Dict[str, set] = {}
+        # Names of existing tables, loaded at connect and reloaded on a miss
+        self._known_tables: Optional[set] = None
+        # Whether DuckDB's httpfs extension is loaded; None until first needed
+        self._httpfs_loaded: Optional[bool] = None
+        # CREATE INDEX statements of indexes removed by drop_indexes()
+        self._dropped_indexes: List[str] = []
         self._initialize_database()
     
     def _initialize_database(self):
         """Initialize database connection and create schema"""
         try:
-            self.conn = duckdb.connect(str(self.db_path))
+            self.conn = duckdb.connect(str(self.db_path), config=self.db_config)
             self._create_schema()
+            self._table_exists('data_refresh_log')
             logger.info(f"Database initialized at {self.db_path}")
         except Exception as e:
             logger.error(f"Failed to initialize database: {e}")
@@ -44,12 +97,29 @@ class DatabaseManager:
     
     def _create_schema(self):
         """Create minimal database schema - let tables be created dynamically"""
+        # The sequence and tables are created in one transaction, so opening
+        # a database commits once
+        self.conn.begin()
         try:
+            # Refresh log ids come from a sequence; for databases created
+            # before it existed, start it after the highest id already used
+            next_id = 1
+            if self.conn.execute("""
+                SELECT COUNT(*) FROM information_schema.tables
+                WHERE table_schema = 'main' AND table_name = 'data_refresh_log'
+            """).fetchone()[0]:
+                next_id = self.conn.execute(
+                    "SELECT COALESCE(MAX(id), 0) + 1 FROM data_refresh_log"
+                ).fetchone()[0]
+            self.conn.execute(
+                f"CREATE SEQUENCE IF NOT EXISTS data_refresh_log_id_seq START {int(next_id)}"
+            )
+            
             # Only create essential system tables, let data tables be created automatically
             essential_schemas = {
                 'data_refresh_log': """
                 CREATE TABLE IF NOT EXISTS data_refresh_log (
-                    id INTEGER PRIMARY KEY,
+                    id INTEGER PRIMARY KEY DEFAULT nextval('data_refresh_log_id_seq'),
                     table_name TEXT NOT NULL,
                     season INTEGER NOT NULL,
                     week INTEGER,
@@ -66,127 +136,183 @@ class DatabaseManager:
                 logger.info(f"Creating essential table: {table_name}")
                 self.conn.execute(schema_sql)
             
+            self.conn.commit()
             logger.info("Essential database schema created - data tables will be created automatically")
             
         except Exception as e:
+            self.conn.rollback()
             logger.error(f"Failed to create schema: {e}")
             raise
     
-    def _convert_dataframe_types(self, df: pd.DataFrame, table_name: str) -> pd.DataFrame:
+    @staticmethod
+    def _has_arrow_types(df: pd.DataFrame, arrow_only: bool = False) -> bool:
         """
-        Convert DataFrame columns to appropriate types before insertion
+        Check whether every data column already has a nullable typed dtype
         
         Args:
-            df: DataFrame to convert
-            table_name: Target table name for context
+            df: DataFrame to check
+            arrow_only: Only accept pd.ArrowDtype, not pandas' masked dtypes
             
         Returns:
-            DataFrame with converted types
-        """
-        if df.empty:
-            return df
-        
-        df_converted = df.copy()
-        
-        # Define conversion functions that handle NaN/NULL properly
-        def safe_int_convert(series):
-            """Convert to integer, keeping NaN as NaN"""
-            if series.dtype == 'object':
-                # For text columns, try to convert to numeric first
-                series = pd.to_numeric(series, errors='coerce')
-            # Convert numpy types to pandas nullable types
-            if series.dtype in ['int64', 'int32', 'int16', 'int8']:
-                return series.astype('Int64')  # Nullable integer
-            return series.astype('Int64')  # Nullable integer
-        
-        def safe_float_convert(series):
-            """Convert to float, keeping NaN as NaN"""
-            if series.dtype == 'object':
-                # For text columns, try to convert to numeric first
-                series = pd.to_numeric(series, errors='coerce')
-            # Convert numpy types to pandas nullable types
-            if series.dtype in ['float64', 'float32', 'float16']:
-                return series.astype('Float64')  # Nullable float
-            return series.astype('Float64')  # Nullable float
-        
-        def safe_date_convert(series):
-            """Convert to date, keeping invalid dates as NaT"""
-            if series.dtype == 'object':
-                return pd.to_datetime(series, errors='coerce').dt.date
-            return series
-        
-        def safe_datetime_convert(series):
-            """Convert to datetime, keeping invalid dates as NaT"""
-            if series.dtype == 'object':
-                return pd.to_datetime(series, errors='coerce')
-            return series
-        
-        def safe_bool_convert(series):
-            """Convert to boolean, handling various representations"""
-            if series.dtype == 'object':
-                # Handle common boolean representations
-                series = series.astype(str).str.lower()
-                series = series.replace({
-                    'true': True, 'false': False,
-                    '1': True, '0': False,
-                    'yes': True, 'no': False,
-                    'y': True, 'n': False,
-                    'nan': np.nan, 'none': np.nan, '': np.nan
-                })
-                return series.astype('boolean')  # Nullable boolean
-            return series.astype('boolean')
+            True if the DataFrame needs no type conversion
+        """
+        accepted = pd.ArrowDtype if arrow_only else pd.api.extensions.ExtensionDtype
+        dtypes = [dtype for col, dtype in df.dtypes.items() if col not in TIMESTAMP_COLUMNS]
+        return bool(dtypes) and all(
+            isinstance(dtype, accepted) and not isinstance(dtype, pd.CategoricalDtype)
+            for dtype in dtypes
+        )
+    
+    def insert_dataframe(self, df: Union[pd.DataFrame, pa.Table], table_name: str, 
+                        on_conflict: str = "REPLACE") -> int:
+        """
+        Insert DataFrame into specified table with proper type handling
         
-        # Apply type conversions based on column names and overrides
-        for col in df_converted.columns:
-            if col in ['created_at', 'updated_at']:
-                continue  # Skip metadata columns
+        Args:
+            df: DataFrame or Arrow table to insert; Arrow tables are loaded
+                without a round-trip through pandas
+            table_name: Target table name
+            on_conflict: How to handle conflicts (REPLACE, IGNORE)
             
-            # Get expected SQL type for this column
-            expected_type = self.schema_generator.get_sql_type(df_converted[col].dtype, col)
+        Returns:
+            Number of rows inserted
+        """
+        try:
+            is_arrow = isinstance(df, pa.Table)
+            if (df.num_rows == 0) if is_arrow else df.empty:
+                logger.warning(f"No data to insert into {table_name}")
+                return 0
+            
+            # Reserved keyword columns are renamed by the INSERT's select
+            # list, so the data itself is never rebuilt
+            if is_arrow:
+                data = df
+            else:
+                # Shallow copy: columns are added below without copying the
+                # data or modifying the caller's DataFrame
+                data = df.copy(deep=False)
+                
+                # Reset index to avoid int64 index issues with DuckDB
+                if not isinstance(data.index, pd.RangeIndex):
+                    data.reset_index(drop=True, inplace=True)
             
+            select_list, columns = self._renamed_select_list(
+                data.column_names if is_arrow else list(data.columns)
+            )
+            
+            # Any cached stats are stale from here on, even if the write fails
+            self._schema_version += 1
+            
+            # The whole write runs in one transaction on its own cursor, so
+            # concurrent inserts from other threads don't share it
+            cursor = self.conn.cursor()
             try:
-                if expected_type == 'INTEGER':
-                    df_converted[col] = safe_int_convert(df_converted[col])
-                elif expected_type == 'REAL':
-                    df_converted[col] = safe_float_convert(df_converted[col])
-                elif expected_type == 'DATE':
-                    df_converted[col] = safe_date_convert(df_converted[col])
-                elif expected_type == 'TIMESTAMP':
-                    df_converted[col] = safe_datetime_convert(df_converted[col])
-                elif expected_type == 'TIME':
-                    if df_converted[col].dtype == 'object':
-                        # Keep as string for time values
-                        df_converted[col] = df_converted[col].astype(str)
-                        df_converted[col] = df_converted[col].replace('nan', np.nan)
-                elif expected_type == 'BOOLEAN':
-                    df_converted[col] = safe_bool_convert(df_converted[col])
-                elif expected_type == 'TEXT':
-                    # For text columns, convert to string and handle NaN
-                    df_converted[col] = df_converted[col].astype(str)
-                    df_converted[col] = df_converted[col].replace('nan', np.nan)
-                    df_converted[col] = df_converted[col].replace('None', np.nan)
-                    df_converted[col] = df_converted[col].replace('', np.nan)
+                # DuckDB fills created_at and updated_at from their defaults
+                for column in self._prepare_table(cursor, data, table_name, select_list):
+                    if column in columns:
+                        continue
+                    select_list += f", CURRENT_TIMESTAMP AS {column}"
+                
+                # Arrow-backed frames are loaded as Arrow as well; the
+                # conversion is zero-copy for those dtypes
+                if not is_arrow and self._has_arrow_types(data, arrow_only=True):
+                    data = pa.Table.from_pandas(data, preserve_index=False)
+                    is_arrow = True
+                
+                cursor.begin()
+                try:
+                    # Handle conflicts by clearing existing data if needed
+                    key_columns = self._replace_key_columns(table_name, columns, on_conflict)
+                    if key_columns == []:
+                        # For lookup tables, delete all existing data
+                        cursor.execute(f"DELETE FROM {table_name}")
+                        logger.info(f"Cleared existing data from {table_name}")
+                    elif key_columns:
+                        # For data tables, delete by season (and week for weekly
+                        # stats) to avoid duplicate data, in one semi-join DELETE
+                        key_data = data.select(key_columns).to_pandas() if is_arrow else data[key_columns]
+                        delete_keys = key_data.dropna().drop_duplicates().astype('int32')
+                        keys = ', '.join(key_columns)
+                        
+                        cursor.register('delete_keys', delete_keys)
+                        cursor.execute(f"""
+                            DELETE FROM {table_name}
+                            WHERE ({keys}) IN (SELECT {keys} FROM delete_keys)
+                        """)
+                        cursor.unregister('delete_keys')
+                        seasons = delete_keys['season'].unique()
+                        logger.info(f"Cleared existing data from {table_name} for seasons {seasons}")
                     
-            except Exception as e:
-                logger.warning(f"Failed to convert column {col} to {expected_type}: {e}")
-                # Keep original column if conversion fails
-                continue
+                    # Register each slice and let DuckDB scan it in place: Arrow
+                    # through the Arrow C data interface, pandas through its
+                    # NumPy-backed scanner, so no rows are copied into Python
+                    # parameters. Columns are matched by name, so ones missing
+                    # from this frame get their default or NULL. Wide frames are
+                    # loaded in slices of about APPEND_CHUNK_CELLS values to
+                    # bound memory use
+                    chunk_rows = max(1, APPEND_CHUNK_CELLS // max(1, len(columns)))
+                    total_rows = data.num_rows if is_arrow else len(data)
+                    for start in range(0, total_rows, chunk_rows):
+                        if is_arrow:
+                            chunk = data.slice(start, chunk_rows)
+                        else:
+                            chunk = data.iloc[start:start + chunk_rows]
+                        cursor.register('insert_chunk', chunk)
+                        cursor.execute(f"INSERT INTO {table_name} BY NAME SELECT {select_list} FROM insert_chunk")
+                        cursor.unregister('insert_chunk')
+                    
+                    cursor.commit()
+                except Exception:
+                    cursor.rollback()
+                    raise
+            finally:
+                cursor.close()
+            
+            logger.info(f"Successfully inserted {total_rows} rows into {table_name}")
+            return total_rows
+            
+        except Exception as e:
+            logger.error(f"Failed to insert data into {table_name}: {e}")
+            raise
+    
+    def enable_httpfs(self) -> bool:
+        """
+        Load DuckDB's httpfs extension so Parquet URLs can be read directly
         
-        # Final check: ensure no int64 columns remain
-        for col in df_converted.columns:
-            if str(df_converted[col].dtype) == 'int64':
-                logger.info(f"Converting remaining int64 column {col} to Int64")
-                df_converted[col] = df_converted[col].astype('Int64')
+        The extension is installed on first use if needed. The result is
+        remembered, so a failed install is not retried on every call.
         
-        return df_converted
+        Returns:
+            True if httpfs is loaded
+        """
+        # Extraction workers may ask at the same time; only one installs
+        with self._create_lock:
+            if self._httpfs_loaded is None:
+                try:
+                    self.conn.execute("LOAD httpfs")
+                    self._httpfs_loaded = True
+                except Exception:
+                    try:
+                        self.conn.execute("INSTALL httpfs")
+                        self.conn.execute("LOAD httpfs")
+                        self._httpfs_loaded = True
+                    except Exception as e:
+                        logger.warning(f"DuckDB httpfs extension is unavailable: {e}")
+                        self._httpfs_loaded = False
+        return self._httpfs_loaded
     
-    def insert_dataframe(self, df: pd.DataFrame, table_name: str, 
-                        on_conflict: str = "REPLACE") -> int:
+    def insert_parquet(self, source: Union[str, List[str]], table_name: str,
+                       on_conflict: str = "REPLACE") -> int:
         """
-        Insert DataFrame into specified table with proper type handling
+        Load Parquet files into a table with DuckDB's own Parquet reader
+        
+        The rows never pass through pandas, and a new table takes its column
+        types from the Parquet schema. Conflicts are handled like
+        insert_dataframe() handles them.
         
         Args:
-            df: DataFrame to insert
+            source: Path or URL of a Parquet file, or a list of them whose
+                columns are matched by name (URLs need enable_httpfs())
             table_name: Target table name
             on_conflict: How to handle conflicts (REPLACE, IGNORE)
             
@@ -194,74 +320,448 @@ class DatabaseManager:
             Number of rows inserted
         """
         try:
-            if df.empty:
-                logger.warning(f"No data to insert into {table_name}")
-                return 0
+            sources = [source] if isinstance(source, str) else list(source)
+            files = ', '.join(f"'{path.replace(chr(39), chr(39) * 2)}'" for path in sources)
+            parquet = f"read_parquet([{files}], union_by_name = true)"
             
-            # Make a clean copy to avoid modification issues
-            df_clean = df.copy()
+            # Any cached stats are stale from here on, even if the write fails
+            self._schema_version += 1
             
-            # Handle column renames for reserved keywords
-            reserved_keyword_renames = {
-                'desc': 'play_description',
-                'order': 'play_order',
-                'time': 'game_time',
-                'date': 'game_date_field'
-            }
+            # Everything runs on its own cursor, so loads from several
+            # threads don't share the connection
+            cursor = self.conn.cursor()
+            try:
+                # Read the schema from the footer only
+                schema = cursor.execute(f"SELECT * FROM {parquet} LIMIT 0").fetch_arrow_table()
+                
+                # Handle column renames for reserved keywords
+                select_list, columns = self._renamed_select_list(schema.column_names)
+                
+                # DuckDB fills created_at and updated_at from their defaults
+                for column in self._prepare_table(cursor, schema, table_name, select_list):
+                    if column not in columns:
+                        select_list += f", CURRENT_TIMESTAMP AS {column}"
+                
+                cursor.begin()
+                try:
+                    key_columns = self._replace_key_columns(table_name, columns, on_conflict)
+                    if key_columns == []:
+                        cursor.execute(f"DELETE FROM {table_name}")
+                        logger.info(f"Cleared existing data from {table_name}")
+                    elif key_columns:
+                        keys = ', '.join(key_columns)
+                        cursor.execute(f"""
+                            DELETE FROM {table_name}
+                            WHERE ({keys}) IN (SELECT DISTINCT {keys} FROM {parquet})
+                        """)
+                        logger.info(f"Cleared existing data from {table_name} for seasons in {len(sources)} file(s)")
+                    
+                    rows_inserted = cursor.execute(
+                        f"INSERT INTO {table_name} BY NAME SELECT {select_list} FROM {parquet}"
+                    ).fetchone()[0]
+                    
+                    cursor.commit()
+                except Exception:
+                    cursor.rollback()
+                    raise
+            finally:
+                cursor.close()
+            
+            logger.info(f"Successfully inserted {rows_inserted} rows into {table_name} from {len(sources)} file(s)")
+            return rows_inserted
+            
+        except Exception as e:
+            logger.error(f"Failed to load {source} into {table_name}: {e}")
+            raise
+    
+    def drop_indexes(self, tables: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Drop secondary indexes before a bulk load
+        
+        Inserts then skip per-row index maintenance; build_indexes() recreates
+        the dropped indexes in bulk once the load is done.
+        
+        Args:
+            tables: Tables whose indexes to drop; all tables if omitted
             
-            for old_col, new_col in reserved_keyword_renames.items():
-                if old_col in df_clean.columns:
-                    df_clean = df_clean.rename(columns={old_col: new_col})
+        Returns:
+            CREATE INDEX statements of the dropped indexes
+        """
+        try:
+            indexes = self.conn.execute(
+                "SELECT index_name, table_name, sql FROM duckdb_indexes() WHERE sql IS NOT NULL"
+            ).fetchall()
+            if tables is not None:
+                tables = set(tables)
+                indexes = [index for index in indexes if index[1] in tables]
+            
+            dropped = []
+            for index_name, _, sql in indexes:
+                self.conn.execute(f'DROP INDEX IF EXISTS "{index_name}"')
+                dropped.append(sql)
             
-            # Reset index to avoid int64 index issues with DuckDB
-            df_clean = df_clean.reset_index(drop=True)
+            self._dropped_indexes.extend(dropped)
+            if dropped:
+                logger.info(f"Dropped {len(dropped)} indexes before bulk load")
+            return dropped
             
-            # Add timestamp columns if they don't exist
-            if 'created_at' not in df_clean.columns:
-                df_clean['created_at'] = pd.Timestamp.now()
-            if 'updated_at' not in df_clean.columns:
-                df_clean['updated_at'] = pd.Timestamp.now()
+        except Exception as e:
+            logger.error(f"Failed to drop indexes: {e}")
+            raise
+    
+    def build_indexes(self, statements: Optional[List[str]] = None) -> int:
+        """
+        Create indexes after a bulk load
+        
+        An index that can't be created, for example because its table or
+        column doesn't exist, is skipped with a warning.
+        
+        Args:
+            statements: CREATE INDEX statements to run; defaults to the
+                indexes removed by drop_indexes()
+            
+        Returns:
+            Number of indexes created
+        """
+        if statements is None:
+            statements = self._dropped_indexes
+        self._dropped_indexes = [sql for sql in self._dropped_indexes if sql not in statements]
+        
+        created = 0
+        for sql in statements:
+            try:
+                self.conn.execute(sql)
+                created += 1
+            except Exception as e:
+                logger.warning(f"Failed to create index with {sql!r}: {e}")
+        
+        if created:
+            logger.info(f"Built {created} indexes")
+        return created
+    
+    def analyze(self, tables: Optional[Iterable[str]] = None) -> int:
+        """
+        Recompute DuckDB's column statistics after a bulk load
+        
+        ANALYZE refreshes the distinct-value estimates the planner uses for
+        join order and filter selectivity. Tables that don't exist are
+        skipped.
+        
+        Args:
+            tables: Tables to analyze; defaults to the whole database
+            
+        Returns:
+            Number of tables analyzed, or -1 for the whole database
+        """
+        if tables is None:
+            self.conn.execute("ANALYZE")
+            logger.info("Analyzed all tables")
+            return -1
+        
+        analyzed = 0
+        for table_name in sorted(set(tables)):
+            if not self._table_exists(table_name):
+                continue
+            try:
+                self.conn.execute(f"ANALYZE {table_name}")
+                analyzed += 1
+            except duckdb.Error as e:
+                logger.warning(f"Failed to analyze {table_name}: {e}")
+        
+        if analyzed:
+            logger.info(f"Analyzed {analyzed} tables")
+        return analyzed
+    
+    @staticmethod
+    def _replace_key_columns(table_name: str, columns: List[str],
+                             on_conflict: str) -> Optional[List[str]]:
+        """
+        Get the key columns whose values a REPLACE insert deletes first
+        
+        Args:
+            table_name: Target table name
+            columns: Columns of the data being inserted
+            on_conflict: How to handle conflicts (REPLACE, IGNORE)
+            
+        Returns:
+            An empty list to delete every row, key columns to delete rows
+            matching the new data, or None to delete nothing
+        """
+        if on_conflict != "REPLACE":
+            return None
+        if table_name in ['teams', 'players']:
+            return []
+        if table_name in ['weekly_stats', 'seasonal_stats', 'pbp_data', 'rosters', 'injuries']:
+            if 'season' in columns:
+                if table_name == 'weekly_stats' and 'week' in columns:
+                    return ['season', 'week']
+                return ['season']
+        return None
+    
+    @staticmethod
+    def _renamed_select_list(column_names: List[str]) -> Tuple[str, List[str]]:
+        """
+        Build a select list that renames reserved keyword columns
+        
+        Columns keep their order, so a table created from the select list
+        matches the source apart from the renames.
+        
+        Args:
+            column_names: Column names of the source data
+            
+        Returns:
+            Tuple of the select list and the column names it produces
+        """
+        columns = [RESERVED_KEYWORD_RENAMES.get(col, col) for col in column_names]
+        if columns == list(column_names):
+            return "*", columns
+        
+        select_list = ', '.join(
+            '"{}"'.format(col.replace('"', '""')) + (f" AS {new_col}" if new_col != col else "")
+            for col, new_col in zip(column_names, columns)
+        )
+        return select_list, columns
+    
+    def _prepare_table(self, cursor: duckdb.DuckDBPyConnection,
+                       df: Union[pd.DataFrame, pa.Table], table_name: str,
+                       select_list: str = "*") -> List[str]:
+        """
+        Create an empty table with a DataFrame's columns if it doesn't exist
+        
+        The table's created_at and updated_at columns are given a DEFAULT
+        CURRENT_TIMESTAMP, so inserts don't need to carry them. Tables are
+        prepared one at a time, since concurrent creates of the same table
+        from several threads conflict, and only once per manager. Columns
+        of df that an existing table lacks are added on every call, e.g.
+        the participation columns of nfl_data_py play-by-play data loaded
+        into a pbp_data table created from the raw Parquet files.
+        
+        Args:
+            cursor: Cursor to create the table on, outside any transaction
+            df: DataFrame or Arrow table whose column names and types the table takes
+            table_name: Name of the table to create
+            select_list: Select list over df giving the table's columns, as
+                built by _renamed_select_list()
+            
+        Returns:
+            Timestamp columns without a default, which the caller must fill
+        """
+        if not IDENTIFIER_PATTERN.match(table_name):
+            raise ValueError(f"Invalid table name: {table_name}")
+        
+        with self._create_lock:
+            prepared = self._unfilled_timestamps.get(table_name)
+            if prepared is not None:
+                self._add_missing_columns(cursor, df, table_name, select_list)
+                return prepared
             
             # Check if table exists, if not let DuckDB create it automatically
-            table_exists = self.conn.execute(f"""
-                SELECT COUNT(*) FROM information_schema.tables 
-                WHERE table_name = '{table_name}'
-            """).fetchone()[0] > 0
+            table_columns = set()
+            if self._table_exists(table_name, cursor):
+                table_columns = {name for name, in cursor.execute("""
+                    SELECT column_name FROM information_schema.columns
+                    WHERE table_schema = 'main' AND table_name = ?
+                """, [table_name]).fetchall()}
             
-            if not table_exists:
+            # Timestamp columns created below already have their default
+            has_default = set()
+            if not table_columns:
                 logger.info(f"Creating table {table_name} automatically from DataFrame structure")
-                # Let DuckDB create the table automatically with proper types from the data
-                self.conn.execute(f"CREATE TABLE {table_name} AS SELECT * FROM df_clean WHERE 1=0")
-            
-            # Handle conflicts by clearing existing data if needed
-            if on_conflict == "REPLACE":
-                # For lookup tables, delete all existing data
-                if table_name in ['teams', 'players']:
-                    self.conn.execute(f"DELETE FROM {table_name}")
-                    logger.info(f"Cleared existing data from {table_name}")
-                elif table_name in ['weekly_stats', 'seasonal_stats', 'pbp_data', 'rosters', 'injuries']:
-                    # For data tables, delete by season to avoid duplicate data
-                    if 'season' in df_clean.columns:
-                        seasons = df_clean['season'].dropna().unique()
-                        for season in seasons:
-                            if table_name == 'weekly_stats' and 'week' in df_clean.columns:
-                                weeks = df_clean[df_clean['season'] == season]['week'].dropna().unique()
-                                for week in weeks:
-                                    self.conn.execute(f"DELETE FROM {table_name} WHERE season = ? AND week = ?", [int(season), int(week)])
-                            else:
-                                self.conn.execute(f"DELETE FROM {table_name} WHERE season = ?", [int(season)])
-                        logger.info(f"Cleared existing data from {table_name} for seasons {seasons}")
+                df_columns = {
+                    RESERVED_KEYWORD_RENAMES.get(col, col)
+                    for col in (df.column_names if isinstance(df, pa.Table) else df.columns)
+                }
+                cursor.register('new_table_data', df)
+                # Create the table and add its timestamp columns in one
+                # transaction, so a new table costs a single commit
+                cursor.begin()
+                try:
+                    try:
+                        self._create_typed_table(cursor, df, table_name, select_list)
+                        has_default.update(TIMESTAMP_COLUMNS)
+                    except duckdb.Error as e:
+                        # Let DuckDB create the table automatically with the
+                        # data's own types
+                        logger.warning(f"Failed to create typed table {table_name}, using data types: {e}")
+                        cursor.rollback()
+                        cursor.begin()
+                        cursor.execute(
+                            f"CREATE TABLE IF NOT EXISTS {table_name} AS "
+                            f"SELECT {select_list} FROM new_table_data WHERE 1=0"
+                        )
+                    for column in TIMESTAMP_COLUMNS:
+                        if column not in df_columns:
+                            cursor.execute(
+                                f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS {column} "
+                                f"TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
+                            )
+                            has_default.add(column)
+                    cursor.commit()
+                except Exception:
+                    cursor.rollback()
+                    raise
+                finally:
+                    cursor.unregister('new_table_data')
+                table_columns = df_columns | set(TIMESTAMP_COLUMNS)
+                self._known_tables.add(table_name)
+                self._table_columns[table_name] = {column.lower() for column in table_columns}
+            else:
+                self._table_columns[table_name] = {column.lower() for column in table_columns}
+                self._add_missing_columns(cursor, df, table_name, select_list)
             
-            # Use DuckDB's direct DataFrame insertion - it handles types automatically
-            self.conn.execute(f"INSERT INTO {table_name} SELECT * FROM df_clean")
+            unfilled = []
+            for column in TIMESTAMP_COLUMNS:
+                if column not in table_columns or column in has_default:
+                    continue
+                try:
+                    cursor.execute(
+                        f"ALTER TABLE {table_name} ALTER COLUMN {column} SET DEFAULT CURRENT_TIMESTAMP"
+                    )
+                except duckdb.Error as e:
+                    logger.warning(f"Failed to set default for {table_name}.{column}: {e}")
+                    unfilled.append(column)
             
-            rows_inserted = len(df_clean)
-            logger.info(f"Successfully inserted {rows_inserted} rows into {table_name}")
-            return rows_inserted
+            self._unfilled_timestamps[table_name] = unfilled
+            return unfilled
+    
+    def _add_missing_columns(self, cursor: duckdb.DuckDBPyConnection,
+                             df: Union[pd.DataFrame, pa.Table], table_name: str,
+                             select_list: str):
+        """
+        Add the columns of df that a prepared table doesn't have yet
+        
+        INSERT ... BY NAME fails on columns the table lacks, so each one is
+        added with the type DuckDB infers for it from df.
+        
+        Args:
+            cursor: Cursor to alter the table on, outside any transaction
+            df: DataFrame or Arrow table about to be inserted
+            table_name: Name of the prepared table
+            select_list: Select list over df giving the inserted columns
+        """
+        table_columns = self._table_columns[table_name]
+        names = df.column_names if isinstance(df, pa.Table) else df.columns
+        if all(RESERVED_KEYWORD_RENAMES.get(col, col).lower() in table_columns for col in names):
+            return
+        
+        cursor.register('new_columns_data', df)
+        try:
+            inferred = cursor.execute(
+                f"DESCRIBE SELECT {select_list} FROM new_columns_data"
+            ).fetchall()
+        finally:
+            cursor.unregister('new_columns_data')
+        
+        added = []
+        for column, column_type, *_ in inferred:
+            if column.lower() in table_columns:
+                continue
+            quoted = '"{}"'.format(column.replace('"', '""'))
+            cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS {quoted} {column_type}")
+            table_columns.add(column.lower())
+            added.append(column)
+        logger.info(f"Added {len(added)} missing columns to {table_name}: {', '.join(added)}")
+    
+    def _create_typed_table(self, cursor: duckdb.DuckDBPyConnection,
+                            df: Union[pd.DataFrame, pa.Table], table_name: str,
+                            select_list: str):
+        """
+        Create an empty table with SchemaGenerator's column types
+        
+        Inserts BY NAME then cast each column once to its declared type,
+        rather than the table inheriting whatever DuckDB infers from the
+        data. A column keeps its inferred type if any of its values wouldn't
+        cast exactly. Floating point columns always keep their inferred
+        type, since only this first batch is checked and an integer column
+        would silently round fractional values in later batches.
+        
+        Args:
+            cursor: Cursor with df registered as new_table_data
+            df: DataFrame or Arrow table the table is created for
+            table_name: Name of the table to create
+            select_list: Select list over df giving the table's columns
+        """
+        inferred = cursor.execute(
+            f"DESCRIBE SELECT {select_list} FROM new_table_data"
+        ).fetchall()
+        sources = df.column_names if isinstance(df, pa.Table) else list(df.columns)
+        empty = df.schema.empty_table().to_pandas() if isinstance(df, pa.Table) else df.iloc[:0]
+        
+        declared = {}
+        for source, dtype, (column, inferred_type, *_) in zip(sources, empty.dtypes, inferred):
+            if column in TIMESTAMP_COLUMNS:
+                continue
+            sql_type = self.schema_generator.get_sql_type(dtype, column)
+            if sql_type.upper() in ('TEXT', 'VARCHAR', inferred_type):
+                continue
+            if inferred_type in FLOAT_SQL_TYPES or inferred_type.startswith('DECIMAL'):
+                continue
+            declared[column] = (source, sql_type, inferred_type)
+        
+        # Check every converted column in one scan of the data
+        if declared:
+            quoted = {column: '"{}"'.format(source.replace('"', '""')) for column, (source, _, _) in declared.items()}
+            # A value fails if it doesn't cast or doesn't survive the cast,
+            # e.g. 2.5 to INTEGER
+            failures = cursor.execute("SELECT " + ", ".join(
+                f"COUNT(*) FILTER (WHERE {quoted[column]} IS NOT NULL AND "
+                f"(TRY_CAST({quoted[column]} AS {sql_type}) IS NULL OR "
+                f"TRY_CAST({quoted[column]} AS {sql_type}) <> {quoted[column]}))"
+                for column, (_, sql_type, _) in declared.items()
+            ) + " FROM new_table_data").fetchone()
+            for column, failed in zip(list(declared), failures):
+                if failed:
+                    logger.warning(f"Keeping {table_name}.{column} as {declared[column][2]}: "
+                                   f"{failed} values don't cast to {declared[column][1]}")
+                    del declared[column]
+        
+        definitions = []
+        for column, inferred_type, *_ in inferred:
+            if column in TIMESTAMP_COLUMNS:
+                definitions.append(f'"{column}" TIMESTAMP DEFAULT CURRENT_TIMESTAMP')
+            else:
+                sql_type = declared[column][1] if column in declared else inferred_type
+                definitions.append('"{}" {}'.format(column.replace('"', '""'), sql_type))
+        
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join(definitions)})")
+    
+    def _table_exists(self, table_name: str,
+                      cursor: Optional[duckdb.DuckDBPyConnection] = None) -> bool:
+        """
+        Check whether a table exists, using the cached table names when possible
+        
+        Args:
+            table_name: Name of the table
+            cursor: Cursor to run the lookup on, if not the main connection
             
-        except Exception as e:
-            logger.error(f"Failed to insert data into {table_name}: {e}")
-            raise
+        Returns:
+            True if the table exists in the main schema
+        """
+        known_tables = self._known_tables
+        if known_tables is None or table_name not in known_tables:
+            rows = (cursor or self.conn).execute("""
+                SELECT table_name FROM information_schema.tables
+                WHERE table_schema = 'main'
+            """).fetchall()
+            known_tables = self._known_tables = {name for name, in rows}
+        return table_name in known_tables
+    
+    def _require_table(self, table_name: str) -> str:
+        """
+        Check that a table exists before its name is put into SQL
+        
+        Existing table names are cached; the cache is reloaded once when a
+        name isn't found, in case the table was created elsewhere.
+        
+        Args:
+            table_name: Name of the table
+            
+        Returns:
+            The table name, safe to interpolate into SQL
+        """
+        if not self._table_exists(table_name):
+            raise ValueError(f"Table {table_name} does not exist")
+        return table_name
     
     def query(self, sql: str, params: Optional[List[Any]] = None) -> pd.DataFrame:
         """
@@ -287,6 +787,48 @@ class DatabaseManager:
             logger.error(f"Failed to execute query: {e}")
             raise
     
+    def scalar(self, sql: str, params: Optional[List[Any]] = None) -> Any:
+        """
+        Execute SQL query and return the first column of its first row
+        
+        Args:
+            sql: SQL query string
+            params: Optional parameters for query
+            
+        Returns:
+            First value of the result, or None if the query returned no rows
+        """
+        try:
+            row = self.conn.execute(sql, params or []).fetchone()
+            return row[0] if row else None
+            
+        except Exception as e:
+            logger.error(f"Failed to execute query: {e}")
+            raise
+    
+    def copy_to(self, sql: str, output_path: str, fmt: str = 'parquet'):
+        """
+        Stream the results of a query to a file with DuckDB's COPY
+        
+        Args:
+            sql: SQL query whose results are written
+            output_path: File to write
+            fmt: Output format, one of COPY_FORMAT_OPTIONS
+        """
+        if fmt not in COPY_FORMAT_OPTIONS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+        
+        try:
+            subquery = sql.strip().rstrip(';')
+            escaped_path = str(output_path).replace("'", "''")
+            self.conn.execute(
+                f"COPY ({subquery}) TO '{escaped_path}' ({COPY_FORMAT_OPTIONS[fmt]})"
+            )
+            logger.info(f"Query results written to {output_path} as {fmt}")
+        except Exception as e:
+            logger.error(f"Failed to write query results to {output_path}: {e}")
+            raise
+    
     def get_table_info(self, table_name: str) -> pd.DataFrame:
         """
         Get information about a table's structure
@@ -298,12 +840,36 @@ class DatabaseManager:
             DataFrame with table structure info
         """
         try:
-            result = self.conn.execute(f"DESCRIBE {table_name}").fetchdf()
+            result = self.conn.execute(f"DESCRIBE {self._require_table(table_name)}").fetchdf()
             return result
         except Exception as e:
             logger.error(f"Failed to get table info for {table_name}: {e}")
             raise
     
+    def get_all_table_info(self) -> Dict[str, pd.DataFrame]:
+        """
+        Get structure information for every table with a single query
+        
+        Returns:
+            Dictionary mapping table name to a DataFrame with column_name and
+            column_type columns, in column order
+        """
+        try:
+            result = self.conn.execute("""
+                SELECT table_name, column_name, data_type AS column_type
+                FROM information_schema.columns
+                WHERE table_schema = 'main'
+                ORDER BY table_name, ordinal_position
+            """).fetchdf()
+            
+            return {
+                table_name: group[['column_name', 'column_type']].reset_index(drop=True)
+                for table_name, group in result.groupby('table_name', sort=False)
+            }
+        except Exception as e:
+            logger.error(f"Failed to get table info: {e}")
+            raise
+    
     def get_last_refresh(self, table_name: str, season: int, 
                         week: Optional[int] = None) -> Optional[pd.Timestamp]:
         """
@@ -318,6 +884,8 @@ class DatabaseManager:
             Last refresh timestamp or None if not found
         """
         try:
+            self.flush_refresh_log()
+            
             sql = """
             SELECT MAX(refresh_date) as last_refresh
             FROM data_refresh_log
@@ -345,6 +913,9 @@ class DatabaseManager:
         """
         Log a data refresh operation
         
+        Entries are buffered and written in one batch by flush_refresh_log(),
+        which runs before the log is read and when the manager is closed.
+        
         Args:
             table_name: Table being refreshed
             season: Season being refreshed
@@ -354,137 +925,314 @@ class DatabaseManager:
             error_message: Error message if failed
             records_processed: Number of records processed
         """
+        self.log_refresh_many([{
+            'table_name': table_name, 'season': season, 'week': week,
+            'season_type': season_type, 'status': status,
+            'error_message': error_message, 'records_processed': records_processed
+        }])
+    
+    def log_refresh_many(self, rows: List[Dict[str, Any]]):
+        """
+        Log several data refresh operations at once, e.g. one per season
+        
+        Args:
+            rows: Dicts with log_refresh()'s arguments as keys; error_message
+                and records_processed may be omitted
+        """
+        now = datetime.now()
+        entries = []
+        for row in rows:
+            if row['status'] not in REFRESH_STATUSES:
+                logger.error(f"Failed to log refresh: invalid status {row['status']}")
+                continue
+            entries.append((
+                row['table_name'], row['season'], row['week'], row['season_type'],
+                row['status'], row.get('error_message'), row.get('records_processed', 0), now
+            ))
+        
+        with self._refresh_lock:
+            self._refresh_buffer.extend(entries)
+    
+    def flush_refresh_log(self):
+        """Write buffered refresh log entries to data_refresh_log in one insert"""
+        with self._refresh_lock:
+            entries, self._refresh_buffer = self._refresh_buffer, []
+        if not entries:
+            return
+        
+        cursor = self.conn.cursor()
         try:
-            # Get next ID value
-            try:
-                max_id_result = self.conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM data_refresh_log").fetchone()
-                next_id = max_id_result[0] if max_id_result else 1
-            except:
-                next_id = 1
-                
-            sql = """
-            INSERT INTO data_refresh_log 
-            (id, table_name, season, week, season_type, status, error_message, records_processed)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            
-            self.conn.execute(sql, [
-                next_id, table_name, season, week, season_type, 
-                status, error_message, records_processed
-            ])
+            refresh_entries = pd.DataFrame(entries, columns=REFRESH_LOG_COLUMNS)
+            cursor.register('refresh_entries', refresh_entries)
+            cursor.execute(f"""
+                INSERT INTO data_refresh_log (id, {', '.join(REFRESH_LOG_COLUMNS)})
+                SELECT nextval('data_refresh_log_id_seq'), * FROM refresh_entries
+            """)
+            self._schema_version += 1
             
         except Exception as e:
             logger.error(f"Failed to log refresh: {e}")
+        finally:
+            cursor.close()
     
-    def validate_data_quality(self, table_name: str) -> Dict[str, Any]:
+    def validate_data_quality(self, table_name: str, null_threshold: float = 10) -> Dict[str, Any]:
         """
         Validate data quality for a table
         
         Args:
             table_name: Name of the table to validate
+            null_threshold: NULL percentage above which a column is reported
+                in high_null_columns
             
         Returns:
             Dictionary with validation results
         """
+        return self.validate_all([table_name], null_threshold).get(table_name, {})
+    
+    def validate_all(self, tables: List[str], null_threshold: float = 10,
+                     max_workers: int = 4,
+                     large_table_rows: int = 1_000_000) -> Dict[str, Dict[str, Any]]:
+        """
+        Validate data quality for several tables in as few queries as possible
+        
+        Row counts and NULL counts are computed with UNION ALL queries instead
+        of separate queries per table and column. Small tables share one query;
+        tables with at least large_table_rows rows get their own query, and the
+        queries run concurrently on separate cursors. Columns whose NULL
+        percentage exceeds null_threshold are filtered in the same queries and
+        returned as high_null_columns; null_checks is a DataFrame with the
+        column, null_count and null_pct of every checked column. Duplicate
+        rows in teams, players and schedules are counted in the same scan.
+        A table that doesn't exist or can't be checked is logged and
+        given empty results, without affecting the other tables.
+        
+        Args:
+            tables: Names of the tables to validate
+            null_threshold: NULL percentage above which a column is reported
+                in high_null_columns
+            max_workers: Maximum number of queries to run at once
+            large_table_rows: Estimated row count at which a table is
+                validated in its own query
+            
+        Returns:
+            Dictionary mapping table name to validation results
+        """
         try:
             results = {}
+            null_columns = {}
+            selects = {}
             
-            # Get table info
-            table_info = self.get_table_info(table_name)
-            results['columns'] = len(table_info)
+            all_table_info = self.get_all_table_info()
             
-            # Get row count
-            row_count = self.conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
-            results['rows'] = row_count
-            
-            # Check for NULL values in key columns
-            null_checks = {}
-            for _, row in table_info.iterrows():
-                col_name = row['column_name']
-                col_type = row['column_type']
+            for table_name in tables:
+                if table_name not in all_table_info:
+                    logger.error(f"Failed to validate data quality for {table_name}: table does not exist")
+                    results[table_name] = {}
+                    continue
+                table_info = all_table_info[table_name]
+                results[table_name] = {'columns': len(table_info)}
                 
-                if col_type in ['INTEGER', 'REAL'] and col_name not in ['created_at', 'updated_at']:
-                    null_count = self.conn.execute(
-                        f"SELECT COUNT(*) FROM {table_name} WHERE {col_name} IS NULL"
-                    ).fetchone()[0]
-                    null_checks[col_name] = {
-                        'null_count': null_count,
-                        'null_percentage': (null_count / row_count * 100) if row_count > 0 else 0
-                    }
+                # Check for NULL values in key columns
+                columns = [
+                    col_name for col_name, col_type in table_info[['column_name', 'column_type']].to_numpy()
+                    if col_type in ['INTEGER', 'REAL'] and col_name not in ['created_at', 'updated_at']
+                ]
+                null_columns[table_name] = columns
+                
+                null_counts = ', '.join(f'COUNT(*) - COUNT("{col}")' for col in columns)
+                high_null_flags = ', '.join(
+                    f"""CASE WHEN (COUNT(*) - COUNT("{col}")) * 100.0 / NULLIF(COUNT(*), 0)
+                         > {float(null_threshold)} THEN '{col.replace("'", "''")}' END"""
+                    for col in columns
+                )
+                # Duplicate rows are counted in the same scan, by row hash
+                duplicates = (
+                    'COUNT(*) - COUNT(DISTINCT hash(t))'
+                    if table_name in ['teams', 'players', 'schedules'] else 'NULL'
+                )
+                selects[table_name] = f"""
+                    SELECT '{table_name}' AS table_name,
+                           COUNT(*) AS row_count,
+                           [{null_counts}]::BIGINT[] AS null_counts,
+                           list_filter([{high_null_flags}]::VARCHAR[], x -> x IS NOT NULL) AS high_null_columns,
+                           ({duplicates})::BIGINT AS duplicates
+                    FROM {table_name} t
+                """
             
-            results['null_checks'] = null_checks
+            if not selects:
+                return results
             
-            # Check for duplicate rows (if applicable)
-            if table_name in ['teams', 'players', 'schedules']:
+            # Large tables are scanned in their own query, small ones share one
+            table_sizes = self._get_estimated_sizes()
+            large_tables = [t for t in selects if table_sizes.get(t, 0) >= large_table_rows]
+            small_tables = [t for t in selects if t not in large_tables]
+            batches = [[t] for t in large_tables]
+            if small_tables:
+                batches.append(small_tables)
+            
+            def run_batch(batch: List[str]) -> List[Tuple]:
+                cursor = self.conn.cursor()
                 try:
-                    # Use COLUMNS(*) to get all columns for DuckDB
-                    duplicate_count = self.conn.execute(f"""
-                        SELECT COUNT(*) - COUNT(DISTINCT (COLUMNS(*))) as duplicates
-                        FROM {table_name}
-                    """).fetchone()[0]
-                    results['duplicates'] = duplicate_count
-                except:
-                    results['duplicates'] = 0
+                    return cursor.execute(" UNION ALL ".join(selects[t] for t in batch)).fetchall()
+                except duckdb.Error as e:
+                    if len(batch) > 1:
+                        # Check the tables one at a time to find the failing one
+                        return [row for t in batch for row in run_batch([t])]
+                    logger.error(f"Failed to validate data quality for {batch[0]}: {e}")
+                    results[batch[0]] = {}
+                    return []
+                finally:
+                    cursor.close()
+            
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                rows = [row for batch_rows in executor.map(run_batch, batches) for row in batch_rows]
+            
+            for table_name, row_count, null_counts, high_null_columns, duplicates in rows:
+                results[table_name]['rows'] = row_count
+                results[table_name]['high_null_columns'] = high_null_columns
+                null_counts = np.asarray(null_counts, dtype=np.int64)
+                results[table_name]['null_checks'] = pd.DataFrame({
+                    'column': null_columns[table_name],
+                    'null_count': null_counts,
+                    'null_pct': null_counts * 100.0 / row_count if row_count > 0 else 0.0
+                })
+                
+                if duplicates is not None:
+                    results[table_name]['duplicates'] = duplicates
             
             return results
             
         except Exception as e:
-            logger.error(f"Failed to validate data quality for {table_name}: {e}")
+            logger.error(f"Failed to validate data quality for tables {tables}: {e}")
             return {}
     
-    def get_database_stats(self) -> Dict[str, Any]:
+    def _get_estimated_sizes(self) -> Dict[str, int]:
+        """
+        Get DuckDB's estimated row count for every table
+        
+        Returns:
+            Dictionary mapping table name to estimated row count
+        """
+        try:
+            rows = self.conn.execute("""
+                SELECT table_name, estimated_size FROM duckdb_tables()
+                WHERE schema_name = 'main'
+            """).fetchall()
+            return {table_name: size for table_name, size in rows}
+        except Exception as e:
+            logger.warning(f"Failed to get estimated table sizes: {e}")
+            return {}
+    
+    def get_database_stats(self, exclude: Optional[Iterable[str]] = None,
+                           exact: bool = False) -> Dict[str, Any]:
         """
         Get comprehensive database statistics
         
+        Statistics are cached until the next write made through this manager.
+        All queries run in one read-only transaction, so the counts come from
+        a single snapshot and no per-statement commit is paid.
+        
+        Args:
+            exclude: Names of tables to leave out of the statistics
+            exact: Count rows with COUNT(*) instead of using DuckDB's estimated
+                table sizes, which can include deleted rows
+            
         Returns:
             Dictionary with database statistics
         """
+        self.flush_refresh_log()
+        excluded = frozenset(exclude or ())
+        cache_key = (excluded, exact)
+        if (self._stats_cache and self._stats_cache[0] == self._schema_version
+                and self._stats_cache[1] == cache_key):
+            return self._stats_cache[2]
+        
+        cursor = self.conn.cursor()
         try:
+            cursor.execute("BEGIN TRANSACTION READ ONLY")
             stats = {}
             
             # Get all tables
-            tables = self.conn.execute("""
+            tables = cursor.execute("""
                 SELECT table_name FROM information_schema.tables 
                 WHERE table_schema = 'main'
-            """).fetchall()
+                  AND NOT list_contains(?::VARCHAR[], table_name)
+            """, [sorted(excluded)]).fetchall()
             
             table_names = [t[0] for t in tables]
             stats['tables'] = table_names
             
-            # Get record counts
-            record_counts = {}
-            for table in table_names:
-                try:
-                    count = self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
-                    record_counts[table] = count
-                except:
-                    record_counts[table] = 0
+            # Get record counts from the catalog, or exactly in one UNION ALL
+            # query so DuckDB plans and scans every table together
+            if not table_names:
+                record_counts = {}
+            elif exact:
+                counts_sql = " UNION ALL ".join(
+                    f"SELECT '{table}' AS table_name, COUNT(*) AS row_count FROM {table}"
+                    for table in table_names
+                    if IDENTIFIER_PATTERN.match(table)
+                )
+                record_counts = dict(cursor.execute(counts_sql).fetchall())
+            else:
+                record_counts = dict(cursor.execute("""
+                    SELECT table_name, estimated_size FROM duckdb_tables()
+                    WHERE schema_name = 'main' AND list_contains(?::VARCHAR[], table_name)
+                """, [table_names]).fetchall())
             
-            stats['record_counts'] = record_counts
+            stats['record_counts'] = {table: record_counts.get(table, 0) for table in table_names}
             
-            # Get season coverage
+            # Get season coverage from the seasons actually in each table; the
+            # refresh log also records seasons that loaded no rows. A failed
+            # statement would abort the transaction, so only tables with a
+            # season column are queried
+            coverage_tables = [
+                table for table in ['weekly_stats', 'seasonal_stats', 'pbp_data', 'schedules']
+                if table in table_names
+            ]
+            season_tables = {name for name, in cursor.execute("""
+                SELECT table_name FROM information_schema.columns
+                WHERE table_schema = 'main' AND column_name = 'season'
+            """).fetchall()}
             season_coverage = {}
-            for table in ['weekly_stats', 'seasonal_stats', 'pbp_data', 'schedules']:
-                if table in table_names:
-                    try:
-                        seasons = self.conn.execute(
-                            f"SELECT DISTINCT season FROM {table} ORDER BY season"
-                        ).fetchall()
-                        season_coverage[table] = [s[0] for s in seasons]
-                    except:
-                        season_coverage[table] = []
+            for table in coverage_tables:
+                if table in season_tables:
+                    seasons = cursor.execute(
+                        f"SELECT DISTINCT season FROM {table} ORDER BY season"
+                    ).fetchall()
+                    season_coverage[table] = [s[0] for s in seasons]
+                else:
+                    season_coverage[table] = []
             
             stats['season_coverage'] = season_coverage
             
+            cursor.commit()
+            self._stats_cache = (self._schema_version, cache_key, stats)
             return stats
             
         except Exception as e:
             logger.error(f"Failed to get database stats: {e}")
             return {}
+        finally:
+            cursor.close()
+    
+    def invalidate_cache(self):
+        """
+        Discard cached metadata such as get_database_stats() results
+        
+        Writes made through insert_dataframe() and flush_refresh_log() do this
+        automatically; call it after changing tables any other way.
+        """
+        self._schema_version += 1
+        self._stats_cache = None
+        self._known_tables = None
+        with self._create_lock:
+            self._unfilled_timestamps.clear()
+            self._table_columns.clear()
     
     def close(self):
         """Close database connection"""
         if self.conn:
+            self.flush_refresh_log()
             self.conn.close()
             logger.info("Database connection closed")
     
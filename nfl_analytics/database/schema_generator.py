@@ -3,611 +3,371 @@ Schema Generator for NFL Analytics
 Creates database schemas with proper data types based on nfl_data_py structure
 """
 
-import nfl_data_py as nfl
 import pandas as pd
 from typing import Dict, List, Any, Optional
 import logging
+import collections
+import functools
+import hashlib
+import json
+import os
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 logger = logging.getLogger(__name__)
 
+# Columns renamed before loading because their names are SQL reserved keywords
+RESERVED_KEYWORD_RENAMES = {
+    'desc': 'play_description',
+    'order': 'play_order',
+    'time': 'game_time',
+    'date': 'game_date_field'
+}
+
+# Seasons whose data generate_all_schemas() downloads to infer column types
+SAMPLE_SEASONS = [2023]
+
+# nflverse play-by-play and participation files nfl_data_py reads for a season
+PBP_PARQUET_URL = "https://github.com/nflverse/nflverse-data/releases/download/pbp/play_by_play_{season}.parquet"
+PARTICIPATION_PARQUET_URL = (
+    "https://github.com/nflverse/nflverse-data/releases/download/"
+    "pbp_participation/pbp_participation_{season}.parquet"
+)
+
+# Where generated schemas are cached; set NFL_SCHEMA_CACHE=0 to disable
+SCHEMA_CACHE_DIR = Path(os.getenv("NFL_SCHEMA_CACHE_DIR", Path.home() / ".cache" / "nfl_analytics"))
+
+
+# Enhanced type mapping that prioritizes numeric types
+TYPE_MAPPING = {
+    'object': 'TEXT',
+    'int32': 'INTEGER',
+    'int64': 'INTEGER', 
+    'float32': 'REAL',
+    'float64': 'REAL',
+    'bool': 'BOOLEAN',
+    'boolean': 'BOOLEAN',
+    'datetime64[ns]': 'TIMESTAMP',
+    'Int64': 'INTEGER',
+    'Float64': 'REAL'
+}
+
+# Column type overrides for known columns the suffix rules get wrong or miss
+COLUMN_TYPE_OVERRIDES = {
+    # Core identification columns
+    'season': 'INTEGER',
+    'week': 'INTEGER',
+    'team': 'TEXT',
+    
+    # Date/time columns
+    'gameday': 'DATE',
+    'gametime': 'TIME',
+    'datetime': 'TIMESTAMP',
+    'report_primary_injury': 'TEXT',
+    'report_secondary_injury': 'TEXT',
+    'report_status': 'TEXT',
+    
+    # Numeric statistics - passing
+    'completions': 'INTEGER',
+    'attempts': 'INTEGER',
+    'passing_tds': 'INTEGER',
+    'interceptions': 'REAL',
+    'sacks': 'REAL',
+    'sack_fumbles': 'INTEGER',
+    'sack_fumbles_lost': 'INTEGER',
+    'passing_first_downs': 'REAL',
+    'pacr': 'REAL',
+    'dakota': 'REAL',
+    
+    # Numeric statistics - rushing
+    'carries': 'INTEGER',
+    'rushing_tds': 'INTEGER',
+    'rushing_fumbles': 'REAL',
+    'rushing_fumbles_lost': 'REAL',
+    'rushing_first_downs': 'REAL',
+    
+    # Numeric statistics - receiving
+    'receptions': 'INTEGER',
+    'targets': 'INTEGER',
+    'receiving_tds': 'INTEGER',
+    'receiving_fumbles': 'REAL',
+    'receiving_fumbles_lost': 'REAL',
+    'receiving_first_downs': 'REAL',
+    'racr': 'REAL',
+    'wopr': 'REAL',
+    
+    # Other numeric columns
+    'special_teams_tds': 'REAL',
+    'fantasy_points': 'REAL',
+    'fantasy_points_ppr': 'REAL',
+    'down': 'INTEGER',
+    'yards_gained': 'REAL',
+    'quarter': 'INTEGER',
+    'play_clock': 'INTEGER',
+    'drive': 'INTEGER',
+    'sp': 'BOOLEAN',
+    'qtr': 'INTEGER',
+    'drive_play_count': 'INTEGER',
+    'drive_time_of_possession': 'REAL',
+    'drive_first_downs': 'INTEGER',
+    'drive_inside20': 'BOOLEAN',
+    'drive_ended_with_score': 'BOOLEAN',
+    'drive_quarter_start': 'INTEGER',
+    'drive_quarter_end': 'INTEGER',
+    'drive_yards_penalized': 'INTEGER',
+    'drive_start_transition': 'TEXT',
+    'drive_end_transition': 'TEXT',
+    'drive_game_clock_start': 'TEXT',
+    'drive_game_clock_end': 'TEXT',
+    'drive_start_yard_line': 'INTEGER',
+    'drive_end_yard_line': 'INTEGER',
+    'series_success': 'BOOLEAN',
+    'play_order': 'INTEGER',
+    'order_sequence': 'INTEGER',
+    'play_type_nfl': 'TEXT',
+    'fixed_drive': 'INTEGER',
+    'drive_real_start_time': 'REAL',
+    'series': 'INTEGER',
+    'yards_to_go': 'INTEGER',
+    'goal_to_go': 'BOOLEAN',
+    'first_down_rush': 'BOOLEAN',
+    'first_down_penalty': 'BOOLEAN',
+    'third_down_converted': 'BOOLEAN',
+    'third_down_failed': 'BOOLEAN',
+    'fourth_down_converted': 'BOOLEAN',
+    'fourth_down_failed': 'BOOLEAN',
+    'touchback': 'BOOLEAN',
+    'interception': 'BOOLEAN',
+    'punt_blocked': 'BOOLEAN',
+    'first_down': 'BOOLEAN',
+    'fumble': 'BOOLEAN',
+    'assist_tackle': 'BOOLEAN',
+    'lateral_reception': 'BOOLEAN',
+    'lateral_rush': 'BOOLEAN',
+    'lateral_return': 'BOOLEAN',
+    'lateral_recovery': 'BOOLEAN',
+    'replay_or_challenge': 'BOOLEAN',
+    'tackle_with_assist': 'BOOLEAN',
+    'fumble_out_of_bounds': 'BOOLEAN',
+    'posteam': 'TEXT',
+    'defteam': 'TEXT',
+    'side_of_field': 'TEXT',
+    'yardline_100': 'INTEGER',
+    'game_half': 'TEXT',
+    'quarter_end': 'BOOLEAN',
+    'game_time': 'TEXT',
+    'yrdln': 'TEXT',
+    'ydstogo': 'INTEGER',
+    'ydsnet': 'INTEGER',
+    'play_description': 'TEXT',
+    'shotgun': 'BOOLEAN',
+    'no_huddle': 'BOOLEAN',
+    'qb_dropback': 'BOOLEAN',
+    'qb_kneel': 'BOOLEAN',
+    'qb_spike': 'BOOLEAN',
+    'qb_scramble': 'BOOLEAN',
+    'pass_length': 'TEXT',
+    'run_gap': 'TEXT',
+    'kick_distance': 'INTEGER',
+    'timeout': 'BOOLEAN',
+    'score_differential': 'INTEGER',
+    'posteam_score_post': 'INTEGER',
+    'defteam_score_post': 'INTEGER',
+    'score_differential_post': 'INTEGER',
+    'ep': 'REAL',
+    'epa': 'REAL',
+    'wp': 'REAL',
+    'wpa': 'REAL',
+    'home_wp_post': 'REAL',
+    'away_wp_post': 'REAL',
+    'fantasy_position': 'TEXT',
+    'cpoe': 'REAL',
+    'position': 'TEXT',
+    'position_group': 'TEXT',
+    'jersey_number': 'INTEGER',
+    'height': 'TEXT',
+    'weight': 'INTEGER',
+    'college': 'TEXT',
+    'high_school': 'TEXT',
+    'entry_year': 'INTEGER',
+    'rookie_year': 'INTEGER',
+    'draft_club': 'TEXT',
+    'draft_number': 'INTEGER',
+    'draft_round': 'INTEGER',
+    'draft_position': 'INTEGER',
+    'status': 'TEXT',
+    'headshot_url': 'TEXT',
+    'ngs_position': 'TEXT',
+    'depth_chart_position': 'TEXT',
+    'years_exp': 'INTEGER',
+    'status_description_abbr': 'TEXT',
+    'status_short_description': 'TEXT',
+    'team_logo_espn': 'TEXT',
+    'team_logo_wikipedia': 'TEXT',
+    'team_wordmark': 'TEXT',
+    'team_color': 'TEXT',
+    'team_color2': 'TEXT',
+    'team_color3': 'TEXT',
+    'team_color4': 'TEXT',
+    'team_nick': 'TEXT',
+    'team_abbr': 'TEXT',
+    'team_id_pfr': 'TEXT',
+    'team_conf': 'TEXT',
+    'team_division': 'TEXT',
+    'team_name_raw': 'TEXT',
+    'weekday': 'TEXT',
+    'location': 'TEXT',
+    'result': 'INTEGER',
+    'total': 'INTEGER',
+    'overtime': 'BOOLEAN',
+    'away_rest': 'INTEGER',
+    'home_rest': 'INTEGER',
+    'away_moneyline': 'INTEGER',
+    'home_moneyline': 'INTEGER',
+    'spread_line': 'REAL',
+    'total_line': 'REAL',
+    'div_game': 'BOOLEAN',
+    'roof': 'TEXT',
+    'surface': 'TEXT',
+    'temp': 'INTEGER',
+    'wind': 'INTEGER',
+    'away_coach': 'TEXT',
+    'home_coach': 'TEXT',
+    'referee': 'TEXT',
+    'stadium': 'TEXT',
+    'away_qb_qbr': 'REAL',
+    'home_qb_qbr': 'REAL',
+    'practice_status': 'TEXT',
+    'date_modified': 'TIMESTAMP'
+}
+
+# Type rules by column name suffix, checked in order after COLUMN_TYPE_OVERRIDES
+COLUMN_SUFFIX_RULES = (
+    ('_id', 'TEXT'),
+    ('_name', 'TEXT'),
+    ('_team', 'TEXT'),
+    ('_location', 'TEXT'),
+    ('_result', 'TEXT'),
+    ('_type', 'TEXT'),
+    ('_epa', 'REAL'),
+    ('_wpa', 'REAL'),
+    ('_wp', 'REAL'),
+    ('_prob', 'REAL'),
+    ('_yards', 'REAL'),
+    ('_after_catch', 'REAL'),
+    ('_share', 'REAL'),
+    ('_remaining', 'INTEGER'),
+    ('_score', 'INTEGER'),
+    ('_odds', 'INTEGER'),
+    ('_2pt_conversions', 'INTEGER'),
+    ('_forced', 'BOOLEAN'),
+    ('_pass', 'BOOLEAN'),
+    ('_date', 'DATE')
+)
+
+# SQL helper functions returned by SchemaGenerator.create_data_conversion_functions()
+CONVERSION_FUNCTIONS = (
+    """
+    -- Function to safely convert to integer, returning NULL for invalid values
+    CREATE OR REPLACE FUNCTION safe_int(value TEXT) 
+    RETURNS INTEGER AS $$
+    BEGIN
+        RETURN CAST(value AS INTEGER);
+    EXCEPTION
+        WHEN OTHERS THEN
+            RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    -- Function to safely convert to real, returning NULL for invalid values
+    CREATE OR REPLACE FUNCTION safe_real(value TEXT) 
+    RETURNS REAL AS $$
+    BEGIN
+        RETURN CAST(value AS REAL);
+    EXCEPTION
+        WHEN OTHERS THEN
+            RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    -- Function to safely convert to date, returning NULL for invalid values
+    CREATE OR REPLACE FUNCTION safe_date(value TEXT) 
+    RETURNS DATE AS $$
+    BEGIN
+        RETURN CAST(value AS DATE);
+    EXCEPTION
+        WHEN OTHERS THEN
+            RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+)
+
+
+@functools.lru_cache(maxsize=2048)
+def _get_sql_type(pandas_type: str, column_name: str) -> str:
+    """Look up the SQL type for a dtype string and column name; the same pairs recur across tables"""
+    sql_type = COLUMN_TYPE_OVERRIDES.get(column_name)
+    if sql_type:
+        return sql_type
+    for suffix, suffix_type in COLUMN_SUFFIX_RULES:
+        if column_name.endswith(suffix):
+            return suffix_type
+    return TYPE_MAPPING.get(pandas_type, 'TEXT')
+
 
 class SchemaGenerator:
     """Generates database schemas with proper data types for NFL data"""
     
-    def __init__(self):
-        # Enhanced type mapping that prioritizes numeric types
-        self.type_mapping = {
-            'object': 'TEXT',
-            'int32': 'INTEGER',
-            'int64': 'INTEGER', 
-            'float32': 'REAL',
-            'float64': 'REAL',
-            'bool': 'BOOLEAN',
-            'boolean': 'BOOLEAN',
-            'datetime64[ns]': 'TIMESTAMP',
-            'Int64': 'INTEGER',
-            'Float64': 'REAL'
-        }
+    # The mappings are shared module-level constants; each instance only
+    # holds its own override layer on top of them
+    __slots__ = ('_extra_overrides', 'column_type_overrides')
+    type_mapping = TYPE_MAPPING
+    
+    def __init__(self, extra_overrides: Optional[Dict[str, str]] = None):
+        """
+        Initialize the generator
         
-        # Define specific column type overrides for known numeric/date columns
-        self.column_type_overrides = {
-            # Core identification columns
-            'season': 'INTEGER',
-            'week': 'INTEGER',
-            'game_id': 'TEXT',
-            'play_id': 'TEXT',
-            'player_id': 'TEXT',
-            'team': 'TEXT',
-            'opponent_team': 'TEXT',
-            
-            # Date/time columns
-            'game_date': 'DATE',
-            'gameday': 'DATE',
-            'gametime': 'TIME',
-            'datetime': 'TIMESTAMP',
-            'report_date': 'DATE',
-            'report_primary_injury': 'TEXT',
-            'report_secondary_injury': 'TEXT',
-            'report_status': 'TEXT',
-            
-            # Numeric statistics - passing
-            'completions': 'INTEGER',
-            'attempts': 'INTEGER',
-            'passing_yards': 'REAL',
-            'passing_tds': 'INTEGER',
-            'interceptions': 'REAL',
-            'sacks': 'REAL',
-            'sack_yards': 'REAL',
-            'sack_fumbles': 'INTEGER',
-            'sack_fumbles_lost': 'INTEGER',
-            'passing_air_yards': 'REAL',
-            'passing_yards_after_catch': 'REAL',
-            'passing_first_downs': 'REAL',
-            'passing_epa': 'REAL',
-            'passing_2pt_conversions': 'INTEGER',
-            'pacr': 'REAL',
-            'dakota': 'REAL',
-            
-            # Numeric statistics - rushing
-            'carries': 'INTEGER',
-            'rushing_yards': 'REAL',
-            'rushing_tds': 'INTEGER',
-            'rushing_fumbles': 'REAL',
-            'rushing_fumbles_lost': 'REAL',
-            'rushing_first_downs': 'REAL',
-            'rushing_epa': 'REAL',
-            'rushing_2pt_conversions': 'INTEGER',
-            
-            # Numeric statistics - receiving
-            'receptions': 'INTEGER',
-            'targets': 'INTEGER',
-            'receiving_yards': 'REAL',
-            'receiving_tds': 'INTEGER',
-            'receiving_fumbles': 'REAL',
-            'receiving_fumbles_lost': 'REAL',
-            'receiving_air_yards': 'REAL',
-            'receiving_yards_after_catch': 'REAL',
-            'receiving_first_downs': 'REAL',
-            'receiving_epa': 'REAL',
-            'receiving_2pt_conversions': 'INTEGER',
-            'racr': 'REAL',
-            'target_share': 'REAL',
-            'air_yards_share': 'REAL',
-            'wopr': 'REAL',
-            
-            # Other numeric columns
-            'special_teams_tds': 'REAL',
-            'fantasy_points': 'REAL',
-            'fantasy_points_ppr': 'REAL',
-            'down': 'INTEGER',
-            'yards_gained': 'REAL',
-            'quarter': 'INTEGER',
-            'play_clock': 'INTEGER',
-            'drive': 'INTEGER',
-            'sp': 'BOOLEAN',
-            'qtr': 'INTEGER',
-            'drive_play_count': 'INTEGER',
-            'drive_time_of_possession': 'REAL',
-            'drive_first_downs': 'INTEGER',
-            'drive_inside20': 'BOOLEAN',
-            'drive_ended_with_score': 'BOOLEAN',
-            'drive_quarter_start': 'INTEGER',
-            'drive_quarter_end': 'INTEGER',
-            'drive_yards_penalized': 'INTEGER',
-            'drive_start_transition': 'TEXT',
-            'drive_end_transition': 'TEXT',
-            'drive_game_clock_start': 'TEXT',
-            'drive_game_clock_end': 'TEXT',
-            'drive_start_yard_line': 'INTEGER',
-            'drive_end_yard_line': 'INTEGER',
-            'series_success': 'BOOLEAN',
-            'series_result': 'TEXT',
-            'play_order': 'INTEGER',
-            'order_sequence': 'INTEGER',
-            'play_type': 'TEXT',
-            'play_type_nfl': 'TEXT',
-            'fixed_drive': 'INTEGER',
-            'fixed_drive_result': 'TEXT',
-            'drive_real_start_time': 'REAL',
-            'series': 'INTEGER',
-            'series_success': 'BOOLEAN',
-            'yards_to_go': 'INTEGER',
-            'goal_to_go': 'BOOLEAN',
-            'first_down_rush': 'BOOLEAN',
-            'first_down_pass': 'BOOLEAN',
-            'first_down_penalty': 'BOOLEAN',
-            'third_down_converted': 'BOOLEAN',
-            'third_down_failed': 'BOOLEAN',
-            'fourth_down_converted': 'BOOLEAN',
-            'fourth_down_failed': 'BOOLEAN',
-            'incomplete_pass': 'BOOLEAN',
-            'touchback': 'BOOLEAN',
-            'interception': 'BOOLEAN',
-            'punt_blocked': 'BOOLEAN',
-            'first_down': 'BOOLEAN',
-            'fumble': 'BOOLEAN',
-            'complete_pass': 'BOOLEAN',
-            'assist_tackle': 'BOOLEAN',
-            'lateral_reception': 'BOOLEAN',
-            'lateral_rush': 'BOOLEAN',
-            'lateral_return': 'BOOLEAN',
-            'lateral_recovery': 'BOOLEAN',
-            'passer_player_id': 'TEXT',
-            'passer_player_name': 'TEXT',
-            'receiver_player_id': 'TEXT',
-            'receiver_player_name': 'TEXT',
-            'rusher_player_id': 'TEXT',
-            'rusher_player_name': 'TEXT',
-            'lateral_receiver_player_id': 'TEXT',
-            'lateral_receiver_player_name': 'TEXT',
-            'lateral_rusher_player_id': 'TEXT',
-            'lateral_rusher_player_name': 'TEXT',
-            'lateral_sack_player_id': 'TEXT',
-            'lateral_sack_player_name': 'TEXT',
-            'interception_player_id': 'TEXT',
-            'interception_player_name': 'TEXT',
-            'lateral_interception_player_id': 'TEXT',
-            'lateral_interception_player_name': 'TEXT',
-            'punt_returner_player_id': 'TEXT',
-            'punt_returner_player_name': 'TEXT',
-            'lateral_punt_returner_player_id': 'TEXT',
-            'lateral_punt_returner_player_name': 'TEXT',
-            'kickoff_returner_player_name': 'TEXT',
-            'kickoff_returner_player_id': 'TEXT',
-            'lateral_kickoff_returner_player_id': 'TEXT',
-            'lateral_kickoff_returner_player_name': 'TEXT',
-            'punter_player_id': 'TEXT',
-            'punter_player_name': 'TEXT',
-            'kicker_player_name': 'TEXT',
-            'kicker_player_id': 'TEXT',
-            'own_kickoff_recovery_player_id': 'TEXT',
-            'own_kickoff_recovery_player_name': 'TEXT',
-            'blocked_player_id': 'TEXT',
-            'blocked_player_name': 'TEXT',
-            'tackle_for_loss_1_player_id': 'TEXT',
-            'tackle_for_loss_1_player_name': 'TEXT',
-            'tackle_for_loss_2_player_id': 'TEXT',
-            'tackle_for_loss_2_player_name': 'TEXT',
-            'qb_hit_1_player_id': 'TEXT',
-            'qb_hit_1_player_name': 'TEXT',
-            'qb_hit_2_player_id': 'TEXT',
-            'qb_hit_2_player_name': 'TEXT',
-            'forced_fumble_player_1_team': 'TEXT',
-            'forced_fumble_player_1_player_id': 'TEXT',
-            'forced_fumble_player_1_player_name': 'TEXT',
-            'forced_fumble_player_2_team': 'TEXT',
-            'forced_fumble_player_2_player_id': 'TEXT',
-            'forced_fumble_player_2_player_name': 'TEXT',
-            'solo_tackle_1_team': 'TEXT',
-            'solo_tackle_1_player_id': 'TEXT',
-            'solo_tackle_1_player_name': 'TEXT',
-            'solo_tackle_2_team': 'TEXT',
-            'solo_tackle_2_player_id': 'TEXT',
-            'solo_tackle_2_player_name': 'TEXT',
-            'assist_tackle_1_player_id': 'TEXT',
-            'assist_tackle_1_player_name': 'TEXT',
-            'assist_tackle_1_team': 'TEXT',
-            'assist_tackle_2_player_id': 'TEXT',
-            'assist_tackle_2_player_name': 'TEXT',
-            'assist_tackle_2_team': 'TEXT',
-            'assist_tackle_3_player_id': 'TEXT',
-            'assist_tackle_3_player_name': 'TEXT',
-            'assist_tackle_3_team': 'TEXT',
-            'assist_tackle_4_player_id': 'TEXT',
-            'assist_tackle_4_player_name': 'TEXT',
-            'assist_tackle_4_team': 'TEXT',
-            'pass_defense_1_player_id': 'TEXT',
-            'pass_defense_1_player_name': 'TEXT',
-            'pass_defense_2_player_id': 'TEXT',
-            'pass_defense_2_player_name': 'TEXT',
-            'fumbled_1_team': 'TEXT',
-            'fumbled_1_player_id': 'TEXT',
-            'fumbled_1_player_name': 'TEXT',
-            'fumbled_2_team': 'TEXT',
-            'fumbled_2_player_id': 'TEXT',
-            'fumbled_2_player_name': 'TEXT',
-            'fumble_recovery_1_team': 'TEXT',
-            'fumble_recovery_1_player_id': 'TEXT',
-            'fumble_recovery_1_player_name': 'TEXT',
-            'fumble_recovery_2_team': 'TEXT',
-            'fumble_recovery_2_player_id': 'TEXT',
-            'fumble_recovery_2_player_name': 'TEXT',
-            'fumble_recovery_1_yards': 'REAL',
-            'fumble_recovery_2_yards': 'REAL',
-            'return_yards': 'REAL',
-            'penalty_yards': 'REAL',
-            'replay_or_challenge': 'BOOLEAN',
-            'replay_or_challenge_result': 'TEXT',
-            'penalty_type': 'TEXT',
-            'penalty_player_id': 'TEXT',
-            'penalty_player_name': 'TEXT',
-            'penalty_player_team': 'TEXT',
-            'tackle_with_assist': 'BOOLEAN',
-            'tackle_with_assist_1_player_id': 'TEXT',
-            'tackle_with_assist_1_player_name': 'TEXT',
-            'tackle_with_assist_1_team': 'TEXT',
-            'tackle_with_assist_2_player_id': 'TEXT',
-            'tackle_with_assist_2_player_name': 'TEXT',
-            'tackle_with_assist_2_team': 'TEXT',
-            'pass_defense_1_player_id': 'TEXT',
-            'pass_defense_1_player_name': 'TEXT',
-            'pass_defense_2_player_id': 'TEXT',
-            'pass_defense_2_player_name': 'TEXT',
-            'fumbled_1_forced': 'BOOLEAN',
-            'fumbled_2_forced': 'BOOLEAN',
-            'fumbled_1_not_forced': 'BOOLEAN',
-            'fumbled_2_not_forced': 'BOOLEAN',
-            'fumble_out_of_bounds': 'BOOLEAN',
-            'safety_player_name': 'TEXT',
-            'safety_player_id': 'TEXT',
-            'season_type': 'TEXT',
-            'week': 'INTEGER',
-            'posteam': 'TEXT',
-            'posteam_type': 'TEXT',
-            'defteam': 'TEXT',
-            'side_of_field': 'TEXT',
-            'yardline_100': 'INTEGER',
-            'game_date': 'DATE',
-            'quarter_seconds_remaining': 'INTEGER',
-            'half_seconds_remaining': 'INTEGER',
-            'game_seconds_remaining': 'INTEGER',
-            'game_half': 'TEXT',
-            'quarter_end': 'BOOLEAN',
-            'drive': 'INTEGER',
-            'sp': 'BOOLEAN',
-            'qtr': 'INTEGER',
-            'down': 'INTEGER',
-            'goal_to_go': 'BOOLEAN',
-            'game_time': 'TEXT',
-            'yrdln': 'TEXT',
-            'ydstogo': 'INTEGER',
-            'ydsnet': 'INTEGER',
-            'play_description': 'TEXT',
-            'play_type': 'TEXT',
-            'yards_gained': 'REAL',
-            'shotgun': 'BOOLEAN',
-            'no_huddle': 'BOOLEAN',
-            'qb_dropback': 'BOOLEAN',
-            'qb_kneel': 'BOOLEAN',
-            'qb_spike': 'BOOLEAN',
-            'qb_scramble': 'BOOLEAN',
-            'pass_length': 'TEXT',
-            'pass_location': 'TEXT',
-            'air_yards': 'REAL',
-            'yards_after_catch': 'REAL',
-            'run_location': 'TEXT',
-            'run_gap': 'TEXT',
-            'field_goal_result': 'TEXT',
-            'kick_distance': 'INTEGER',
-            'extra_point_result': 'TEXT',
-            'two_point_conv_result': 'TEXT',
-            'home_timeouts_remaining': 'INTEGER',
-            'away_timeouts_remaining': 'INTEGER',
-            'timeout': 'BOOLEAN',
-            'timeout_team': 'TEXT',
-            'td_team': 'TEXT',
-            'td_player_name': 'TEXT',
-            'td_player_id': 'TEXT',
-            'posteam_timeouts_remaining': 'INTEGER',
-            'defteam_timeouts_remaining': 'INTEGER',
-            'total_home_score': 'INTEGER',
-            'total_away_score': 'INTEGER',
-            'posteam_score': 'INTEGER',
-            'defteam_score': 'INTEGER',
-            'score_differential': 'INTEGER',
-            'posteam_score_post': 'INTEGER',
-            'defteam_score_post': 'INTEGER',
-            'score_differential_post': 'INTEGER',
-            'no_score_prob': 'REAL',
-            'opp_fg_prob': 'REAL',
-            'opp_safety_prob': 'REAL',
-            'opp_td_prob': 'REAL',
-            'fg_prob': 'REAL',
-            'safety_prob': 'REAL',
-            'td_prob': 'REAL',
-            'extra_point_prob': 'REAL',
-            'two_point_conversion_prob': 'REAL',
-            'ep': 'REAL',
-            'epa': 'REAL',
-            'total_home_epa': 'REAL',
-            'total_away_epa': 'REAL',
-            'total_home_rush_epa': 'REAL',
-            'total_away_rush_epa': 'REAL',
-            'total_home_pass_epa': 'REAL',
-            'total_away_pass_epa': 'REAL',
-            'air_epa': 'REAL',
-            'yac_epa': 'REAL',
-            'comp_air_epa': 'REAL',
-            'comp_yac_epa': 'REAL',
-            'total_home_comp_air_epa': 'REAL',
-            'total_away_comp_air_epa': 'REAL',
-            'total_home_comp_yac_epa': 'REAL',
-            'total_away_comp_yac_epa': 'REAL',
-            'total_home_raw_air_epa': 'REAL',
-            'total_away_raw_air_epa': 'REAL',
-            'total_home_raw_yac_epa': 'REAL',
-            'total_away_raw_yac_epa': 'REAL',
-            'wp': 'REAL',
-            'def_wp': 'REAL',
-            'home_wp': 'REAL',
-            'away_wp': 'REAL',
-            'wpa': 'REAL',
-            'vegas_wpa': 'REAL',
-            'vegas_home_wpa': 'REAL',
-            'home_wp_post': 'REAL',
-            'away_wp_post': 'REAL',
-            'vegas_wp': 'REAL',
-            'vegas_home_wp': 'REAL',
-            'total_home_rush_wpa': 'REAL',
-            'total_away_rush_wpa': 'REAL',
-            'total_home_pass_wpa': 'REAL',
-            'total_away_pass_wpa': 'REAL',
-            'air_wpa': 'REAL',
-            'yac_wpa': 'REAL',
-            'comp_air_wpa': 'REAL',
-            'comp_yac_wpa': 'REAL',
-            'total_home_comp_air_wpa': 'REAL',
-            'total_away_comp_air_wpa': 'REAL',
-            'total_home_comp_yac_wpa': 'REAL',
-            'total_away_comp_yac_wpa': 'REAL',
-            'total_home_raw_air_wpa': 'REAL',
-            'total_away_raw_air_wpa': 'REAL',
-            'total_home_raw_yac_wpa': 'REAL',
-            'total_away_raw_yac_wpa': 'REAL',
-            'punt_blocked': 'BOOLEAN',
-            'first_down_rush': 'BOOLEAN',
-            'first_down_pass': 'BOOLEAN',
-            'first_down_penalty': 'BOOLEAN',
-            'third_down_converted': 'BOOLEAN',
-            'third_down_failed': 'BOOLEAN',
-            'fourth_down_converted': 'BOOLEAN',
-            'fourth_down_failed': 'BOOLEAN',
-            'incomplete_pass': 'BOOLEAN',
-            'touchback': 'BOOLEAN',
-            'interception': 'BOOLEAN',
-            'punt_blocked': 'BOOLEAN',
-            'first_down': 'BOOLEAN',
-            'fumble': 'BOOLEAN',
-            'complete_pass': 'BOOLEAN',
-            'assist_tackle': 'BOOLEAN',
-            'lateral_reception': 'BOOLEAN',
-            'lateral_rush': 'BOOLEAN',
-            'lateral_return': 'BOOLEAN',
-            'lateral_recovery': 'BOOLEAN',
-            'fantasy_player_name': 'TEXT',
-            'fantasy_player_id': 'TEXT',
-            'fantasy_position': 'TEXT',
-            'racr': 'REAL',
-            'target_share': 'REAL',
-            'air_yards_share': 'REAL',
-            'wopr': 'REAL',
-            'pacr': 'REAL',
-            'dakota': 'REAL',
-            'cpoe': 'REAL',
-            'gsis_id': 'TEXT',
-            'pff_id': 'TEXT',
-            'pfr_id': 'TEXT',
-            'sleeper_id': 'TEXT',
-            'nfl_id': 'TEXT',
-            'espn_id': 'TEXT',
-            'yahoo_id': 'TEXT',
-            'rotowire_id': 'TEXT',
-            'sportradar_id': 'TEXT',
-            'stats_id': 'TEXT',
-            'stats_global_id': 'TEXT',
-            'fantasy_data_id': 'TEXT',
-            'first_name': 'TEXT',
-            'last_name': 'TEXT',
-            'position': 'TEXT',
-            'position_group': 'TEXT',
-            'jersey_number': 'INTEGER',
-            'height': 'TEXT',
-            'weight': 'INTEGER',
-            'college': 'TEXT',
-            'high_school': 'TEXT',
-            'birth_date': 'DATE',
-            'entry_year': 'INTEGER',
-            'rookie_year': 'INTEGER',
-            'draft_club': 'TEXT',
-            'draft_number': 'INTEGER',
-            'draft_round': 'INTEGER',
-            'draft_position': 'INTEGER',
-            'status': 'TEXT',
-            'headshot_url': 'TEXT',
-            'ngs_position': 'TEXT',
-            'depth_chart_position': 'TEXT',
-            'years_exp': 'INTEGER',
-            'status_description_abbr': 'TEXT',
-            'status_short_description': 'TEXT',
-            'gsis_it_id': 'TEXT',
-            'smart_id': 'TEXT',
-            'full_name': 'TEXT',
-            'team_name': 'TEXT',
-            'team_logo_espn': 'TEXT',
-            'team_logo_wikipedia': 'TEXT',
-            'team_wordmark': 'TEXT',
-            'team_color': 'TEXT',
-            'team_color2': 'TEXT',
-            'team_color3': 'TEXT',
-            'team_color4': 'TEXT',
-            'nfl_api_id': 'TEXT',
-            'team_nick': 'TEXT',
-            'team_abbr': 'TEXT',
-            'team_id': 'TEXT',
-            'team_id_pfr': 'TEXT',
-            'team_conf': 'TEXT',
-            'team_division': 'TEXT',
-            'team_location': 'TEXT',
-            'team_name_raw': 'TEXT',
-            'gameday': 'DATE',
-            'weekday': 'TEXT',
-            'gametime': 'TIME',
-            'away_team': 'TEXT',
-            'away_score': 'INTEGER',
-            'home_team': 'TEXT',
-            'home_score': 'INTEGER',
-            'location': 'TEXT',
-            'result': 'INTEGER',
-            'total': 'INTEGER',
-            'overtime': 'BOOLEAN',
-            'old_game_id': 'TEXT',
-            'gsis_id': 'TEXT',
-            'nfl_detail_id': 'TEXT',
-            'pfr_game_id': 'TEXT',
-            'pff_game_id': 'TEXT',
-            'espn_game_id': 'TEXT',
-            'ftn_game_id': 'TEXT',
-            'away_rest': 'INTEGER',
-            'home_rest': 'INTEGER',
-            'away_moneyline': 'INTEGER',
-            'home_moneyline': 'INTEGER',
-            'spread_line': 'REAL',
-            'away_spread_odds': 'INTEGER',
-            'home_spread_odds': 'INTEGER',
-            'total_line': 'REAL',
-            'under_odds': 'INTEGER',
-            'over_odds': 'INTEGER',
-            'div_game': 'BOOLEAN',
-            'roof': 'TEXT',
-            'surface': 'TEXT',
-            'temp': 'INTEGER',
-            'wind': 'INTEGER',
-            'away_qb_id': 'TEXT',
-            'home_qb_id': 'TEXT',
-            'away_qb_name': 'TEXT',
-            'home_qb_name': 'TEXT',
-            'away_coach': 'TEXT',
-            'home_coach': 'TEXT',
-            'referee': 'TEXT',
-            'stadium_id': 'TEXT',
-            'stadium': 'TEXT',
-            'away_qb_epa': 'REAL',
-            'home_qb_epa': 'REAL',
-            'away_qb_qbr': 'REAL',
-            'home_qb_qbr': 'REAL',
-            'pfr_game_id': 'TEXT',
-            'pff_game_id': 'TEXT',
-            'espn_game_id': 'TEXT',
-            'ftn_game_id': 'TEXT',
-            'away_rest': 'INTEGER',
-            'home_rest': 'INTEGER',
-            'away_moneyline': 'INTEGER',
-            'home_moneyline': 'INTEGER',
-            'spread_line': 'REAL',
-            'away_spread_odds': 'INTEGER',
-            'home_spread_odds': 'INTEGER',
-            'total_line': 'REAL',
-            'under_odds': 'INTEGER',
-            'over_odds': 'INTEGER',
-            'div_game': 'BOOLEAN',
-            'roof': 'TEXT',
-            'surface': 'TEXT',
-            'temp': 'INTEGER',
-            'wind': 'INTEGER',
-            'away_qb_id': 'TEXT',
-            'home_qb_id': 'TEXT',
-            'away_qb_name': 'TEXT',
-            'home_qb_name': 'TEXT',
-            'away_coach': 'TEXT',
-            'home_coach': 'TEXT',
-            'referee': 'TEXT',
-            'stadium_id': 'TEXT',
-            'stadium': 'TEXT',
-            'away_qb_epa': 'REAL',
-            'home_qb_epa': 'REAL',
-            'away_qb_qbr': 'REAL',
-            'home_qb_qbr': 'REAL',
-            'nfl_api_id': 'TEXT',
-            'team_nick': 'TEXT',
-            'team_abbr': 'TEXT',
-            'team_id': 'TEXT',
-            'team_id_pfr': 'TEXT',
-            'team_conf': 'TEXT',
-            'team_division': 'TEXT',
-            'team_location': 'TEXT',
-            'team_name_raw': 'TEXT',
-            'game_type': 'TEXT',
-            'week': 'INTEGER',
-            'season': 'INTEGER',
-            'season_type': 'TEXT',
-            'depth_chart_position': 'TEXT',
-            'jersey_number': 'INTEGER',
-            'status': 'TEXT',
-            'full_name': 'TEXT',
-            'first_name': 'TEXT',
-            'last_name': 'TEXT',
-            'team': 'TEXT',
-            'position': 'TEXT',
-            'height': 'TEXT',
-            'weight': 'INTEGER',
-            'birth_date': 'DATE',
-            'college': 'TEXT',
-            'gsis_id': 'TEXT',
-            'espn_id': 'TEXT',
-            'pfr_id': 'TEXT',
-            'pff_id': 'TEXT',
-            'sleeper_id': 'TEXT',
-            'nfl_id': 'TEXT',
-            'yahoo_id': 'TEXT',
-            'rotowire_id': 'TEXT',
-            'sportradar_id': 'TEXT',
-            'stats_id': 'TEXT',
-            'fantasy_data_id': 'TEXT',
-            'player_id': 'TEXT',
-            'player_name': 'TEXT',
-            'player_display_name': 'TEXT',
-            'position_group': 'TEXT',
-            'headshot_url': 'TEXT',
-            'recent_team': 'TEXT',
-            'report_primary_injury': 'TEXT',
-            'report_secondary_injury': 'TEXT',
-            'report_status': 'TEXT',
-            'report_date': 'DATE',
-            'practice_status': 'TEXT',
-            'date_modified': 'TIMESTAMP',
-            'gsis_id': 'TEXT',
-            'pfr_id': 'TEXT',
-            'pff_id': 'TEXT',
-            'sleeper_id': 'TEXT'
-        }
+        Args:
+            extra_overrides: Optional column-to-SQL-type overrides for this
+                instance, checked before COLUMN_TYPE_OVERRIDES
+        """
+        self._extra_overrides = dict(extra_overrides or {})
+        self.column_type_overrides = collections.ChainMap(self._extra_overrides, COLUMN_TYPE_OVERRIDES)
+    
+    def extend_type_overrides(self, overrides: Dict[str, str]) -> None:
+        """
+        Add column type overrides for this instance only
+        
+        The shared COLUMN_TYPE_OVERRIDES dict is left untouched, so other
+        generators and the cached lookups are unaffected.
+        
+        Args:
+            overrides: Mapping of column name to SQL type
+        """
+        self._extra_overrides.update(overrides)
     
     def get_sql_type(self, pandas_type: str, column_name: str) -> str:
         """
         Map pandas dtype to SQL type with column-specific overrides
         
         Args:
-            pandas_type: The pandas dtype as string
+            pandas_type: The pandas dtype, preferably already as a string
             column_name: The column name for type override lookup
             
         Returns:
             SQL type string
         """
-        # Check for specific column override first
-        if column_name in self.column_type_overrides:
-            return self.column_type_overrides[column_name]
-        
-        # Fall back to general type mapping
-        return self.type_mapping.get(str(pandas_type), 'TEXT')
+        # Check this instance's overrides first, then the shared overrides,
+        # suffix rules and general type mapping
+        sql_type = self._extra_overrides.get(column_name)
+        if sql_type:
+            return sql_type
+        if not isinstance(pandas_type, str):
+            pandas_type = str(pandas_type)
+        return _get_sql_type(pandas_type, column_name)
     
     def generate_table_schema(self, df: pd.DataFrame, table_name: str, 
                              primary_key: List[str] = None) -> str:
@@ -622,37 +382,28 @@ class SchemaGenerator:
         Returns:
             CREATE TABLE SQL statement
         """
-        columns = []
+        # Read the dtypes once; wide tables like pbp_data have ~400 columns
+        col_names = df.columns.tolist()
+        dtypes = df.dtypes.astype(str).tolist()
         
-        for col_name, dtype in df.dtypes.items():
-            # Handle special cases for date columns
-            if col_name in ['game_date', 'gameday', 'birth_date', 'report_date']:
-                sql_type = 'DATE'
-            elif col_name in ['gametime']:
-                sql_type = 'TIME'
-            elif col_name in ['datetime', 'date_modified']:
-                sql_type = 'TIMESTAMP'
-            else:
-                sql_type = self.get_sql_type(dtype, col_name)
-            
-            columns.append(f"    {col_name} {sql_type}")
+        # Skip the per-instance override check when there are none
+        lookup = self.get_sql_type if self._extra_overrides else _get_sql_type
+        columns = [
+            f"    {col_name} {lookup(dtype, col_name)}"
+            for col_name, dtype in zip(col_names, dtypes)
+        ]
         
         # Add metadata columns
         columns.append("    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
         columns.append("    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
         
-        schema = f"CREATE TABLE IF NOT EXISTS {table_name} (\n"
-        schema += ",\n".join(columns)
-        
-        if primary_key:
-            # Filter primary key columns to only include those that exist
-            existing_pk = [pk for pk in primary_key if pk in df.columns]
-            if existing_pk:
-                schema += f",\n    PRIMARY KEY ({', '.join(existing_pk)})"
+        # Filter primary key columns to only include those that exist
+        existing_pk = [pk for pk in primary_key or [] if pk in df.columns]
+        if existing_pk:
+            columns.append(f"    PRIMARY KEY ({', '.join(existing_pk)})")
         
-        schema += "\n);"
-        
-        return schema
+        body = ",\n".join(columns)
+        return f"CREATE TABLE IF NOT EXISTS {table_name} (\n{body}\n);"
     
     def create_data_conversion_functions(self) -> List[str]:
         """
@@ -661,115 +412,172 @@ class SchemaGenerator:
         Returns:
             List of SQL function definitions
         """
-        functions = [
-            """
-            -- Function to safely convert to integer, returning NULL for invalid values
-            CREATE OR REPLACE FUNCTION safe_int(value TEXT) 
-            RETURNS INTEGER AS $$
-            BEGIN
-                RETURN CAST(value AS INTEGER);
-            EXCEPTION
-                WHEN OTHERS THEN
-                    RETURN NULL;
-            END;
-            $$ LANGUAGE plpgsql;
-            """,
-            """
-            -- Function to safely convert to real, returning NULL for invalid values
-            CREATE OR REPLACE FUNCTION safe_real(value TEXT) 
-            RETURNS REAL AS $$
-            BEGIN
-                RETURN CAST(value AS REAL);
-            EXCEPTION
-                WHEN OTHERS THEN
-                    RETURN NULL;
-            END;
-            $$ LANGUAGE plpgsql;
-            """,
-            """
-            -- Function to safely convert to date, returning NULL for invalid values
-            CREATE OR REPLACE FUNCTION safe_date(value TEXT) 
-            RETURNS DATE AS $$
-            BEGIN
-                RETURN CAST(value AS DATE);
-            EXCEPTION
-                WHEN OTHERS THEN
-                    RETURN NULL;
-            END;
-            $$ LANGUAGE plpgsql;
-            """
-        ]
-        return functions
+        return list(CONVERSION_FUNCTIONS)
     
-    def generate_all_schemas(self) -> Dict[str, str]:
+    def generate_all_schemas(self, use_cache: bool = True,
+                             invalidate: bool = False) -> Dict[str, str]:
         """
         Generate schemas for all NFL data tables with improved type handling
         
+        Generating them downloads a season of every dataset just to read its
+        dtypes, so the result is cached on disk, keyed by the sample seasons,
+        the nfl_data_py version and the type mappings.
+        
+        Args:
+            use_cache: Read and write the on-disk schema cache
+            invalidate: Regenerate the schemas even if they are cached
+            
         Returns:
             Dictionary mapping table names to CREATE TABLE statements
         """
-        schemas = {}
+        use_cache = use_cache and os.getenv("NFL_SCHEMA_CACHE", "1") != "0"
+        cache_file = self._schema_cache_file()
+        
+        if use_cache and not invalidate and cache_file.exists():
+            try:
+                with open(cache_file) as f:
+                    schemas = json.load(f)
+                logger.info(f"Loaded cached schemas from {cache_file}")
+                return schemas
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable schema cache {cache_file}: {e}")
+        
+        schemas = self._download_and_generate_schemas()
+        
+        if use_cache:
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(cache_file, 'w') as f:
+                    json.dump(schemas, f)
+            except OSError as e:
+                logger.warning(f"Failed to cache schemas in {cache_file}: {e}")
         
+        return schemas
+    
+    def _schema_cache_file(self) -> Path:
+        """Return the cache file for the current sample seasons, library version and mappings"""
         try:
-            logger.info("Generating improved schemas from sample data...")
-            
-            # Teams
-            teams_df = nfl.import_team_desc()
-            schemas['teams'] = self.generate_table_schema(
-                teams_df, 'teams', ['team_abbr']
-            )
-            
-            # Players  
-            players_df = nfl.import_players()
-            schemas['players'] = self.generate_table_schema(
-                players_df, 'players', None  # No primary key since gsis_id can be NULL
-            )
-            
-            # Schedules
-            schedules_df = nfl.import_schedules([2023])
-            schemas['schedules'] = self.generate_table_schema(
-                schedules_df, 'schedules', ['game_id']
-            )
+            from importlib.metadata import version
+            nfl_version = version('nfl_data_py')
+        except Exception:
+            nfl_version = 'unknown'
+        
+        key = repr((
+            SAMPLE_SEASONS, nfl_version,
+            sorted(TYPE_MAPPING.items()), sorted(COLUMN_TYPE_OVERRIDES.items()), COLUMN_SUFFIX_RULES,
+            sorted(self._extra_overrides.items())
+        ))
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return SCHEMA_CACHE_DIR / f"schemas_{digest}.json"
+    
+    @staticmethod
+    def _read_parquet_dtypes(url: str) -> pd.DataFrame:
+        """
+        Read a Parquet file's column types without downloading its rows
+        
+        DuckDB reads only the footer metadata for a LIMIT 0 query over HTTP.
+        
+        Args:
+            url: URL or path of the Parquet file
             
-            # Weekly stats
-            weekly_df = nfl.import_weekly_data([2023])
-            schemas['weekly_stats'] = self.generate_table_schema(
-                weekly_df, 'weekly_stats', ['player_id', 'season', 'week', 'season_type']
-            )
+        Returns:
+            Empty DataFrame with the file's columns and dtypes
+        """
+        import duckdb
+        
+        with duckdb.connect() as conn:
+            return conn.execute(f"SELECT * FROM read_parquet('{url}') LIMIT 0").df()
+    
+    def _read_pbp_dtypes(self, seasons: List[int]) -> pd.DataFrame:
+        """
+        Get the columns import_pbp_data() would return, from Parquet metadata
+        
+        The play-by-play file is ~50k rows by ~400 columns per season, but
+        only its dtypes are needed. Falls back to downloading the data if
+        the metadata can't be read.
+        
+        Args:
+            seasons: Seasons to describe; only the first one is read
             
-            # Seasonal stats
-            seasonal_df = nfl.import_seasonal_data([2023])
-            schemas['seasonal_stats'] = self.generate_table_schema(
-                seasonal_df, 'seasonal_stats', ['player_id', 'season', 'season_type']
-            )
+        Returns:
+            Empty DataFrame with the play-by-play columns and dtypes
+        """
+        season = seasons[0]
+        try:
+            pbp_df = self._read_parquet_dtypes(PBP_PARQUET_URL.format(season=season))
+            pbp_df['season'] = pd.Series(dtype='int64')
             
-            # Rosters
-            rosters_df = nfl.import_weekly_rosters([2023])
-            schemas['rosters'] = self.generate_table_schema(
-                rosters_df, 'rosters', ['player_id', 'season', 'week', 'team']
+            # import_pbp_data() merges participation columns in on play_id
+            participation_df = self._read_parquet_dtypes(
+                PARTICIPATION_PARQUET_URL.format(season=season)
             )
+            new_columns = [col for col in participation_df.columns if col not in pbp_df.columns]
+            return pd.concat([pbp_df, participation_df[new_columns]], axis=1)
+        except Exception as e:
+            logger.warning(f"Failed to read play-by-play metadata, downloading data instead: {e}")
+            import nfl_data_py as nfl
+            return nfl.import_pbp_data(seasons)
+    
+    def _download_and_generate_schemas(self) -> Dict[str, str]:
+        """
+        Download sample data for every table and generate its schema
+        
+        Returns:
+            Dictionary mapping table names to CREATE TABLE statements
+        """
+        # Only needed to download sample data, so not imported with the module
+        import nfl_data_py as nfl
+        
+        # Sample data source, its arguments and the primary key for each table
+        tasks = {
+            'teams': (nfl.import_team_desc, (), ['team_abbr']),
+            # No primary key since gsis_id can be NULL
+            'players': (nfl.import_players, (), None),
+            'schedules': (nfl.import_schedules, (SAMPLE_SEASONS,), ['game_id']),
+            'weekly_stats': (nfl.import_weekly_data, (SAMPLE_SEASONS,),
+                             ['player_id', 'season', 'week', 'season_type']),
+            'seasonal_stats': (nfl.import_seasonal_data, (SAMPLE_SEASONS,),
+                               ['player_id', 'season', 'season_type']),
+            'rosters': (nfl.import_weekly_rosters, (SAMPLE_SEASONS,),
+                        ['player_id', 'season', 'week', 'team']),
+            'pbp_data': (self._read_pbp_dtypes, (SAMPLE_SEASONS,), ['game_id', 'play_id']),
+            'injuries': (nfl.import_injuries, (SAMPLE_SEASONS,),
+                         ['player_id', 'season', 'week', 'report_date'])
+        }
+        
+        def fetch(table_name: str, import_func, args) -> pd.DataFrame:
+            logger.info(f"Downloading sample data for {table_name}...")
+            # Only the dtypes are needed, so keep an empty frame and let the
+            # rows be freed while the other downloads are still running
+            return import_func(*args).iloc[:0]
+        
+        generated = {}
+        
+        try:
+            logger.info("Generating improved schemas from sample data...")
             
-            # PBP data (get full schema but limit rows for performance)
-            pbp_df = nfl.import_pbp_data([2023])
-            # Rename columns to avoid SQL reserved keyword conflicts
-            reserved_keyword_renames = {
-                'desc': 'play_description',
-                'order': 'play_order',
-                'time': 'game_time',
-                'date': 'game_date_field'
-            }
-            for old_col, new_col in reserved_keyword_renames.items():
-                if old_col in pbp_df.columns:
-                    pbp_df = pbp_df.rename(columns={old_col: new_col})
-            schemas['pbp_data'] = self.generate_table_schema(
-                pbp_df, 'pbp_data', ['game_id', 'play_id']
-            )
+            # The downloads are independent and network-bound, so they run
+            # concurrently
+            with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+                futures = {
+                    executor.submit(fetch, table_name, import_func, args): table_name
+                    for table_name, (import_func, args, _) in tasks.items()
+                }
+                for future in as_completed(futures):
+                    table_name = futures[future]
+                    df = future.result()
+                    
+                    if table_name == 'pbp_data':
+                        # Rename columns to avoid SQL reserved keyword conflicts;
+                        # rename() ignores the ones that aren't present
+                        df = df.rename(columns=RESERVED_KEYWORD_RENAMES)
+                    
+                    generated[table_name] = self.generate_table_schema(
+                        df, table_name, tasks[table_name][2]
+                    )
             
-            # Injuries
-            injuries_df = nfl.import_injuries([2023])
-            schemas['injuries'] = self.generate_table_schema(
-                injuries_df, 'injuries', ['player_id', 'season', 'week', 'report_date']
-            )
+            # Keep the tables in their usual order
+            schemas = {table_name: generated[table_name] for table_name in tasks}
             
             # Add system tables
             schemas['data_refresh_log'] = """
@@ -799,91 +607,86 @@ class SchemaGenerator:
         Returns:
             List of CREATE INDEX statements
         """
+        # DuckDB only builds ART indexes, so there is no HASH/ART choice to
+        # make; what matters is leaving out indexes that can't narrow a scan.
+        # Columns with a handful of distinct values only appear after a
+        # selective leading column, and DuckDB's per-row-group zonemaps
+        # already cover range filters on them
         indexes = [
-            # PBP data indexes
+            # PBP data indexes: plays are looked up by game, or filtered to a
+            # season and week and then by team or play type. Low-selectivity
+            # columns such as down and qtr are left to DuckDB's zonemaps
             "CREATE INDEX IF NOT EXISTS idx_pbp_game_id ON pbp_data(game_id);",
-            "CREATE INDEX IF NOT EXISTS idx_pbp_season_week ON pbp_data(season, week);",
-            "CREATE INDEX IF NOT EXISTS idx_pbp_season_type ON pbp_data(season_type);",
-            "CREATE INDEX IF NOT EXISTS idx_pbp_posteam ON pbp_data(posteam);",
-            "CREATE INDEX IF NOT EXISTS idx_pbp_defteam ON pbp_data(defteam);",
-            "CREATE INDEX IF NOT EXISTS idx_pbp_play_type ON pbp_data(play_type);",
-            "CREATE INDEX IF NOT EXISTS idx_pbp_down ON pbp_data(down);",
-            "CREATE INDEX IF NOT EXISTS idx_pbp_quarter ON pbp_data(qtr);",
-            "CREATE INDEX IF NOT EXISTS idx_pbp_game_date ON pbp_data(game_date);",
+            "CREATE INDEX IF NOT EXISTS idx_pbp_season_week_posteam ON pbp_data(season, week, posteam);",
+            "CREATE INDEX IF NOT EXISTS idx_pbp_season_week_defteam ON pbp_data(season, week, defteam);",
+            "CREATE INDEX IF NOT EXISTS idx_pbp_season_week_play_type ON pbp_data(season, week, play_type, down);",
             
-            # Weekly stats indexes
+            # Weekly stats indexes: per-player history, and season leaderboards
+            # by position or team
             "CREATE INDEX IF NOT EXISTS idx_weekly_player_season ON weekly_stats(player_id, season, week);",
-            "CREATE INDEX IF NOT EXISTS idx_weekly_season_type ON weekly_stats(season_type);",
-            "CREATE INDEX IF NOT EXISTS idx_weekly_position ON weekly_stats(position);",
-            "CREATE INDEX IF NOT EXISTS idx_weekly_team ON weekly_stats(recent_team);",
-            "CREATE INDEX IF NOT EXISTS idx_weekly_opponent ON weekly_stats(opponent_team);",
-            "CREATE INDEX IF NOT EXISTS idx_weekly_fantasy_points ON weekly_stats(fantasy_points);",
+            "CREATE INDEX IF NOT EXISTS idx_weekly_season_position ON weekly_stats(season, position);",
+            "CREATE INDEX IF NOT EXISTS idx_weekly_season_team ON weekly_stats(season, recent_team);",
             
-            # Seasonal stats indexes
+            # Seasonal stats indexes: per-player history and season leaderboards
             "CREATE INDEX IF NOT EXISTS idx_seasonal_player_season ON seasonal_stats(player_id, season);",
-            "CREATE INDEX IF NOT EXISTS idx_seasonal_season_type ON seasonal_stats(season_type);",
-            "CREATE INDEX IF NOT EXISTS idx_seasonal_position ON seasonal_stats(position);",
-            "CREATE INDEX IF NOT EXISTS idx_seasonal_team ON seasonal_stats(recent_team);",
-            "CREATE INDEX IF NOT EXISTS idx_seasonal_fantasy_points ON seasonal_stats(fantasy_points);",
+            "CREATE INDEX IF NOT EXISTS idx_seasonal_season_position ON seasonal_stats(season, position);",
             
-            # Schedules indexes
+            # Schedules indexes: a season's games by week or season type, and
+            # joins on either team
             "CREATE INDEX IF NOT EXISTS idx_schedules_season_week ON schedules(season, week);",
-            "CREATE INDEX IF NOT EXISTS idx_schedules_game_date ON schedules(gameday);",
+            "CREATE INDEX IF NOT EXISTS idx_schedules_season_type ON schedules(season, season_type);",
             "CREATE INDEX IF NOT EXISTS idx_schedules_teams ON schedules(home_team, away_team);",
-            "CREATE INDEX IF NOT EXISTS idx_schedules_season_type ON schedules(season_type);",
-            
-            # Rosters indexes
-            "CREATE INDEX IF NOT EXISTS idx_rosters_player_season ON rosters(player_id, season, week);",
-            "CREATE INDEX IF NOT EXISTS idx_rosters_team ON rosters(team);",
-            "CREATE INDEX IF NOT EXISTS idx_rosters_position ON rosters(position);",
-            "CREATE INDEX IF NOT EXISTS idx_rosters_status ON rosters(status);",
             
-            # Players indexes
-            "CREATE INDEX IF NOT EXISTS idx_players_position ON players(position);",
-            "CREATE INDEX IF NOT EXISTS idx_players_team ON players(team);",
-            "CREATE INDEX IF NOT EXISTS idx_players_status ON players(status);",
-            "CREATE INDEX IF NOT EXISTS idx_players_college ON players(college);",
-            "CREATE INDEX IF NOT EXISTS idx_players_draft_year ON players(entry_year);",
+            # Players and teams are small enough that filtering them by
+            # position, status or team is a cheap full scan, so they have none
             
-            # Teams indexes
-            "CREATE INDEX IF NOT EXISTS idx_teams_conf_div ON teams(team_conf, team_division);",
+            # Rosters indexes: joins on player and season, and team rosters
+            "CREATE INDEX IF NOT EXISTS idx_rosters_player_season ON rosters(player_id, season, week);",
+            "CREATE INDEX IF NOT EXISTS idx_rosters_season_team ON rosters(season, team);",
             
-            # Injuries indexes
+            # Injuries indexes: joins on player and season
             "CREATE INDEX IF NOT EXISTS idx_injuries_player_season ON injuries(player_id, season, week);",
-            "CREATE INDEX IF NOT EXISTS idx_injuries_report_date ON injuries(report_date);",
-            "CREATE INDEX IF NOT EXISTS idx_injuries_status ON injuries(report_status);",
             
-            # Data refresh log indexes
-            "CREATE INDEX IF NOT EXISTS idx_refresh_log_table ON data_refresh_log(table_name, season, week);",
-            "CREATE INDEX IF NOT EXISTS idx_refresh_log_status ON data_refresh_log(status);",
-            "CREATE INDEX IF NOT EXISTS idx_refresh_log_date ON data_refresh_log(refresh_date);"
+            # Data refresh log indexes: last refresh lookups by table and season
+            "CREATE INDEX IF NOT EXISTS idx_refresh_log_table ON data_refresh_log(table_name, season, week);"
         ]
         
         return indexes
 
 
 def generate_improved_schema_file():
-    """Generate an improved schema file with all table definitions"""
+    """
+    Generate improved schema files with all table and index definitions
+    
+    Tables go to nfl_schema_improved.sql and indexes to nfl_indexes.sql, so
+    the indexes can be created after the initial bulk load instead of being
+    maintained row by row during it.
+    """
     
-    generator = ImprovedSchemaGenerator()
+    generator = SchemaGenerator()
     schemas = generator.generate_all_schemas()
     indexes = generator.create_indexes()
     
-    schema_content = "-- Auto-generated NFL Analytics Database Schema (Improved)\n"
-    schema_content += "-- Generated with proper data types for numeric and date columns\n\n"
-    
-    for table_name, schema in schemas.items():
-        schema_content += f"-- {table_name.upper()} TABLE\n"
-        schema_content += schema + "\n\n"
+    schema_parts = [
+        "-- Auto-generated NFL Analytics Database Schema (Improved)\n",
+        "-- Generated with proper data types for numeric and date columns\n",
+        "-- Indexes are in nfl_indexes.sql; run it after loading data\n\n",
+    ]
+    schema_parts.extend(
+        f"-- {table_name.upper()} TABLE\n{schema}\n\n"
+        for table_name, schema in schemas.items()
+    )
     
-    schema_content += "-- INDEXES\n"
-    for index in indexes:
-        schema_content += index + "\n"
+    index_parts = [
+        "-- Auto-generated NFL Analytics Database Indexes\n",
+        "-- Run after the initial bulk load so inserts skip index maintenance\n\n",
+    ]
+    index_parts.extend(index + "\n" for index in indexes)
     
-    with open('nfl_schema_improved.sql', 'w') as f:
-        f.write(schema_content)
+    Path('nfl_schema_improved.sql').write_text(''.join(schema_parts))
+    Path('nfl_indexes.sql').write_text(''.join(index_parts))
     
-    logger.info("Improved schema file generated: nfl_schema_improved.sql")
+    logger.info("Improved schema files generated: nfl_schema_improved.sql, nfl_indexes.sql")
     return schemas
 
 
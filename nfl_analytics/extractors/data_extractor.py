@@ -4,30 +4,141 @@ Handles extraction of data from nfl_data_py package
 """
 
 import nfl_data_py as nfl
+import duckdb
 import pandas as pd
-from typing import List, Optional, Dict, Any, Tuple
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import List, Optional, Dict, Any, Tuple, Callable, Union
 import logging
+import queue
 from tqdm import tqdm
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 
 from ..database.manager import DatabaseManager
+from ..database.schema_generator import PBP_PARQUET_URL
 from ..models.fantasy_points import FantasyPointsCalculator
+from ..utils.parquet_cache import cached_parquet
 
 logger = logging.getLogger(__name__)
 
+# Descriptions of each extracted table used in failure messages
+DATA_LABELS = {
+    'teams': 'team',
+    'players': 'player',
+    'schedules': 'schedule',
+    'pbp_data': 'PBP',
+    'weekly_stats': 'weekly',
+    'seasonal_stats': 'seasonal',
+    'rosters': 'roster',
+    'injuries': 'injury'
+}
+
+# Tables whose jobs are inserted by the fetch workers instead of the writer
+# thread. Each job covers one season on its own cursor, and DuckDB appends
+# and season-scoped deletes in separate transactions don't conflict, so the
+# largest table is loaded in parallel
+WORKER_WRITE_TABLES = {'pbp_data'}
+
+# Failed inserts that may succeed on a second try, such as a write-write
+# conflict, are retried this many times with exponential backoff from
+# WRITE_RETRY_DELAY seconds, reusing the fetched data
+WRITE_RETRIES = 3
+WRITE_RETRY_DELAY = 1.0
+RETRYABLE_WRITE_ERRORS = (duckdb.TransactionException, duckdb.IOException)
+
+# Season-independent tables are downloaded again at most this often
+REFERENCE_REFRESH_INTERVAL = timedelta(hours=24)
+
+# Value replacements applied by nfl.clean_nfl_data(), by column; _clean_data()
+# applies the same ones with Arrow compute kernels
+CLEAN_REPLACEMENTS = {
+    'name': {
+        'Gary Jennings Jr': 'Gary Jennings',
+        'DJ Chark': 'D.J. Chark',
+        'Cedrick Wilson Jr.': 'Cedrick Wilson',
+        'Deangelo Yancey': 'DeAngelo Yancey',
+        'Ardarius Stewart': 'ArDarius Stewart',
+        'Calvin Johnson  HOF': 'Calvin Johnson',
+        'Mike Sims-Walker': 'Mike Walker',
+        'Kenneth Moore': 'Kenny Moore',
+        'Devante Parker': 'DeVante Parker',
+        'Brandon Lafell': 'Brandon LaFell',
+        'Desean Jackson': 'DeSean Jackson',
+        'Deandre Hopkins': 'DeAndre Hopkins',
+        'Deandre Smelter': 'DeAndre Smelter',
+        'William Fuller': 'Will Fuller',
+        'Lavon Brazill': 'LaVon Brazill',
+        'Devier Posey': 'DeVier Posey',
+        'Demarco Sampson': 'DeMarco Sampson',
+        'Deandrew Rubin': 'DeAndrew Rubin',
+        'Latarence Dunbar': 'LaTarence Dunbar',
+        'Jajuan Dawson': 'JaJuan Dawson',
+        "Andre' Davis": 'Andre Davis',
+        'Johnathan Holland': 'Jonathan Holland',
+        'Johnnie Lee Higgins Jr.': 'Johnnie Lee Higgins',
+        'Marquis Walker': 'Marquise Walker',
+        'William Franklin': 'Will Franklin',
+        'Ted Ginn Jr.': 'Ted Ginn',
+        'Jonathan Baldwin': 'Jon Baldwin',
+        'T.J. Graham': 'Trevor Graham',
+        'Odell Beckham Jr.': 'Odell Beckham',
+        'Michael Pittman Jr.': 'Michael Pittman',
+        'DK Metcalf': 'D.K. Metcalf',
+        'JJ Arcega-Whiteside': 'J.J. Arcega-Whiteside',
+        'Lynn Bowden Jr.': 'Lynn Bowden',
+        'Laviska Shenault Jr.': 'Laviska Shenault',
+        'Henry Ruggs III': 'Henry Ruggs',
+        'KJ Hamler': 'K.J. Hamler',
+        'KJ Osborn': 'K.J. Osborn',
+        'Devonta Smith': 'DeVonta Smith',
+        'Terrace Marshall Jr.': 'Terrace Marshall',
+        "Ja'Marr Chase": 'JaMarr Chase'
+    },
+    'col_team': {
+        'Ole Miss': 'Mississippi',
+        'Texas Christian': 'TCU',
+        'Central Florida': 'UCF',
+        'Bowling Green State': 'Bowling Green',
+        'West. Michigan': 'Western Michigan',
+        'Pitt': 'Pittsburgh',
+        'Brigham Young': 'BYU',
+        'Texas-El Paso': 'UTEP',
+        'East. Michigan': 'Eastern Michigan',
+        'Middle Tenn. State': 'Middle Tennessee State',
+        'Southern Miss': 'Southern Mississippi',
+        'Louisiana State': 'LSU'
+    }
+}
+
+# Text value nfl.clean_nfl_data() turns into a missing value
+NA_TEXT = 'NA'
+
 
 class NFLDataExtractor:
     """Extracts NFL data from nfl_data_py and stores in DuckDB"""
     
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, stream_pbp: bool = False,
+                 cache_dir: Optional[str] = None):
         """
         Initialize data extractor
         
         Args:
             db_manager: Database manager instance
+            stream_pbp: Load play-by-play Parquet files straight into DuckDB
+                instead of through nfl_data_py and pandas. The raw files
+                skip nfl.clean_nfl_data() and have no participation columns;
+                those are added to pbp_data when a season is later loaded
+                through nfl_data_py
+            cache_dir: Directory to keep the play-by-play Parquet files in.
+                When set, seasons are loaded from local copies that are only
+                downloaded again when they change, like stream_pbp but
+                without needing httpfs
         """
         self.db_manager = db_manager
+        self.stream_pbp = stream_pbp
+        self.cache_dir = cache_dir
         self.fantasy_calc = FantasyPointsCalculator()
     
     def extract_all_data(self, seasons: List[int], 
@@ -36,6 +147,12 @@ class NFLDataExtractor:
         """
         Extract all available NFL data for specified seasons
         
+        Downloads and cleaning run on a thread pool; the fetched frames are
+        handed through a bounded queue to this thread, which does the
+        inserts. Tables in WORKER_WRITE_TABLES are instead inserted season by
+        season on the workers. Indexes on the loaded tables are dropped first
+        and rebuilt afterwards, and the loaded tables are then analyzed.
+        
         Args:
             seasons: List of seasons to extract
             season_types: List of season types to extract
@@ -48,280 +165,407 @@ class NFLDataExtractor:
         
         results = {}
         
-        # Extract data in parallel where possible
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = []
-            
-            # Submit extraction tasks
-            futures.append(executor.submit(self._extract_teams))
-            futures.append(executor.submit(self._extract_players))
-            futures.append(executor.submit(self._extract_schedules, seasons))
-            
-            for season in seasons:
-                futures.append(executor.submit(self._extract_pbp_data, [season]))
-                futures.append(executor.submit(self._extract_weekly_data, [season]))
-                futures.append(executor.submit(self._extract_seasonal_data, [season]))
-                futures.append(executor.submit(self._extract_rosters, [season]))
-                futures.append(executor.submit(self._extract_injuries, [season]))
-            
-            # Collect results
-            for future in tqdm(as_completed(futures), total=len(futures), 
-                             desc="Extracting NFL data"):
+        jobs = [
+            (table_name, fetch_data, None)
+            for table_name, fetch_data in (('teams', self._fetch_teams), ('players', self._fetch_players))
+            if not self._recently_refreshed(table_name)
+        ]
+        jobs.append(('schedules', self._fetch_schedules, seasons))
+        for season in seasons:
+            jobs.append(('pbp_data', self._fetch_pbp_data, [season]))
+            jobs.append(('weekly_stats', self._fetch_weekly_data, [season]))
+            jobs.append(('seasonal_stats', self._fetch_seasonal_data, [season]))
+            jobs.append(('rosters', self._fetch_rosters, [season]))
+            jobs.append(('injuries', self._fetch_injuries, [season]))
+        
+        # Fetched data waiting for the writer; the bound caps how many
+        # downloaded frames are held in memory at once
+        fetched = queue.Queue(maxsize=max_workers * 2)
+        
+        def fetch(table_name, fetch_data, job_seasons):
+            records = None
+            try:
+                data = fetch_data() if job_seasons is None else fetch_data(job_seasons)
+                # Convert here, in parallel, rather than on the writer thread
+                data = self._to_arrow(data)
+            except Exception as e:
+                self._log_failure(table_name, job_seasons, e, 'fetch')
+                data = None
+            if data is not None and table_name in WORKER_WRITE_TABLES:
                 try:
-                    table_name, records = future.result()
-                    results[table_name] = records
+                    _, records = self._store(table_name, data, job_seasons)
                 except Exception as e:
-                    logger.error(f"Extraction task failed: {e}")
+                    self._log_failure(table_name, job_seasons, e, 'write')
+                data = None
+            fetched.put((table_name, data, job_seasons, records))
         
+        # Bulk load without per-row index maintenance
+        dropped_indexes = self.db_manager.drop_indexes({table_name for table_name, _, _ in jobs})
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for job in jobs:
+                    executor.submit(fetch, *job)
+                
+                # Single writer: every job puts exactly one item on the queue
+                for _ in tqdm(range(len(jobs)), desc="Extracting NFL data"):
+                    table_name, data, job_seasons, records = fetched.get()
+                    if records is not None:
+                        # Already inserted by the worker
+                        results[table_name] = results.get(table_name, 0) + records
+                        continue
+                    if data is None:
+                        continue
+                    try:
+                        _, records = self._store(table_name, data, job_seasons)
+                        results[table_name] = results.get(table_name, 0) + records
+                    except Exception as e:
+                        self._log_failure(table_name, job_seasons, e, 'write')
+                    finally:
+                        # Release the frame now rather than while waiting
+                        # for the next one
+                        data = None
+        finally:
+            self.db_manager.build_indexes(dropped_indexes)
+        
+        # Refresh planner statistics for the tables that changed
+        self.db_manager.analyze(results)
+        
+        self.db_manager.flush_refresh_log()
         logger.info(f"Extraction complete. Results: {results}")
         return results
     
-    def _extract_teams(self) -> Tuple[str, int]:
-        """Extract team information"""
-        try:
-            logger.info("Extracting team data...")
-            teams_df = nfl.import_team_desc()
-            
-            # Clean and standardize team data
-            teams_df = nfl.clean_nfl_data(teams_df)
-            
-            records = self.db_manager.insert_dataframe(teams_df, 'teams')
-            
-            self.db_manager.log_refresh(
-                'teams', 0, None, 'ALL', 'SUCCESS', 
-                records_processed=records
-            )
+    def _recently_refreshed(self, table_name: str) -> bool:
+        """
+        Check whether a season-independent table was loaded within
+        REFERENCE_REFRESH_INTERVAL, so it needn't be downloaded again
+        
+        Args:
+            table_name: Table name to check
             
-            return 'teams', records
+        Returns:
+            True if the last successful refresh is recent enough
+        """
+        last_refresh = self.db_manager.get_last_refresh(table_name, 0)
+        if last_refresh is None or datetime.now() - last_refresh >= REFERENCE_REFRESH_INTERVAL:
+            return False
+        logger.info(f"Skipping {table_name}, last refreshed at {last_refresh}")
+        return True
+    
+    def _extract(self, table_name: str, fetch_data: Callable[..., Any],
+                 seasons: Optional[List[int]] = None) -> Tuple[str, int]:
+        """
+        Fetch one table's data and insert it, logging the refresh
+        
+        Fetch and write failures are logged separately, and _store() retries
+        a failed write without downloading the data again.
+        
+        Args:
+            table_name: Target table name
+            fetch_data: One of the _fetch_* methods
+            seasons: Seasons to fetch, or None for tables without seasons
             
+        Returns:
+            Tuple of table name and number of rows inserted
+        """
+        try:
+            data = fetch_data() if seasons is None else fetch_data(seasons)
+            data = self._to_arrow(data)
         except Exception as e:
-            error_msg = f"Failed to extract team data: {type(e).__name__}: {str(e)}"
-            logger.error(error_msg)
-            self.db_manager.log_refresh(
-                'teams', 0, None, 'ALL', 'FAILED', error_msg
-            )
+            self._log_failure(table_name, seasons, e, 'fetch')
             raise
-    
-    def _extract_players(self) -> Tuple[str, int]:
-        """Extract player information"""
+        
         try:
-            logger.info("Extracting player data...")
-            players_df = nfl.import_players()
-            
-            # Clean and standardize player data
-            players_df = nfl.clean_nfl_data(players_df)
-            
-            records = self.db_manager.insert_dataframe(players_df, 'players')
-            
-            self.db_manager.log_refresh(
-                'players', 0, None, 'ALL', 'SUCCESS',
-                records_processed=records
-            )
-            
-            return 'players', records
-            
+            return self._store(table_name, data, seasons)
         except Exception as e:
-            error_msg = f"Failed to extract player data: {type(e).__name__}: {str(e)}"
-            logger.error(error_msg)
-            self.db_manager.log_refresh(
-                'players', 0, None, 'ALL', 'FAILED', error_msg
-            )
+            self._log_failure(table_name, seasons, e, 'write')
             raise
     
-    def _extract_schedules(self, seasons: List[int]) -> Tuple[str, int]:
-        """Extract schedule data"""
-        try:
-            logger.info(f"Extracting schedule data for seasons: {seasons}")
-            schedules_df = nfl.import_schedules(seasons)
-            
-            # Clean and standardize schedule data
-            schedules_df = nfl.clean_nfl_data(schedules_df)
+    @staticmethod
+    def _to_arrow(data: Any) -> Any:
+        """
+        Convert a fetched DataFrame to an Arrow table for insert_dataframe()
+        
+        DuckDB scans Arrow tables zero-copy, while pandas object columns, such
+        as the many text columns of play-by-play data, are boxed Python strings
+        it has to convert value by value.
+        
+        Args:
+            data: Fetched data; anything other than a DataFrame is returned as is
             
-            records = self.db_manager.insert_dataframe(schedules_df, 'schedules')
+        Returns:
+            Arrow table, or the DataFrame if a column has mixed types that
+            insert_dataframe() has to handle
+        """
+        if not isinstance(data, pd.DataFrame):
+            return data
+        try:
+            return pa.Table.from_pandas(data, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+            logger.debug(f"Keeping DataFrame for insert, Arrow conversion failed: {e}")
+            return data
+    
+    @classmethod
+    def _clean_data(cls, df: pd.DataFrame) -> Union[pa.Table, pd.DataFrame]:
+        """
+        Clean a downloaded DataFrame like nfl.clean_nfl_data(), in Arrow
+        
+        nfl.clean_nfl_data() runs a pandas replace over every object column;
+        here each text column is cleaned with vectorized Arrow kernels after a
+        single conversion. DataFrames that can't be converted to Arrow fall
+        back to nfl.clean_nfl_data().
+        
+        Args:
+            df: DataFrame as returned by nfl_data_py
             
-            for season in seasons:
-                self.db_manager.log_refresh(
-                    'schedules', season, None, 'ALL', 'SUCCESS',
-                    records_processed=records
-                )
+        Returns:
+            Cleaned Arrow table, or cleaned DataFrame on fallback
+        """
+        table = cls._to_arrow(df)
+        if not isinstance(table, pa.Table):
+            return nfl.clean_nfl_data(df)
+        
+        columns = []
+        for name, column in zip(table.column_names, table.columns):
+            if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+                # 'NA' becomes NULL; existing NULLs stay NULL
+                column = pc.if_else(pc.equal(column, NA_TEXT), pa.scalar(None, column.type), column)
+                replacements = CLEAN_REPLACEMENTS.get(name)
+                if replacements:
+                    # Look each value up in the replacement keys and keep
+                    # the original value where there is no match
+                    index = pc.index_in(column, value_set=pa.array(list(replacements)))
+                    replaced = pc.take(pa.array(list(replacements.values()), column.type), index)
+                    column = pc.coalesce(replaced, column)
+            columns.append(column)
+        
+        return pa.table(columns, names=table.column_names)
+    
+    def _store(self, table_name: str, data: Union[pd.DataFrame, pa.Table, List[str]],
+               seasons: Optional[List[int]] = None) -> Tuple[str, int]:
+        """
+        Insert fetched data and log a successful refresh
+        
+        Args:
+            table_name: Target table name
+            data: Cleaned DataFrame or Arrow table, or Parquet sources to load directly
+            seasons: Seasons the data covers, or None for tables without seasons
             
-            return 'schedules', records
+        Returns:
+            Tuple of table name and number of rows inserted
+        """
+        if isinstance(data, list):
+            try:
+                records = self.db_manager.insert_parquet(data, table_name)
+            except Exception as e:
+                # Only play-by-play data is streamed from Parquet
+                logger.warning(f"Streaming PBP Parquet failed, falling back to nfl_data_py: {e}")
+                data = self._import_pbp_data(seasons)
+        if not isinstance(data, list):
+            records = self._insert_with_retry(table_name, data)
+        
+        self.db_manager.log_refresh_many([
+            {'table_name': table_name, 'season': season, 'week': None, 'season_type': 'ALL',
+             'status': 'SUCCESS', 'records_processed': records}
+            for season in seasons or [0]
+        ])
+        
+        return table_name, records
+    
+    def _insert_with_retry(self, table_name: str, data: Union[pd.DataFrame, pa.Table]) -> int:
+        """
+        Insert data, retrying failures in RETRYABLE_WRITE_ERRORS
+        
+        The same data is inserted again up to WRITE_RETRIES times, so a
+        transient failure doesn't cost another download.
+        
+        Args:
+            table_name: Target table name
+            data: Cleaned DataFrame or Arrow table
             
-        except Exception as e:
-            error_msg = f"Failed to extract schedule data: {type(e).__name__}: {str(e)}"
-            logger.error(error_msg)
-            for season in seasons:
-                self.db_manager.log_refresh(
-                    'schedules', season, None, 'ALL', 'FAILED', error_msg
+        Returns:
+            Number of rows inserted
+        """
+        for attempt in range(WRITE_RETRIES + 1):
+            try:
+                return self.db_manager.insert_dataframe(data, table_name)
+            except RETRYABLE_WRITE_ERRORS as e:
+                if attempt == WRITE_RETRIES:
+                    raise
+                delay = WRITE_RETRY_DELAY * 2 ** attempt
+                logger.warning(
+                    f"Insert into {table_name} failed (stage=write, attempt {attempt + 1}), "
+                    f"retrying in {delay:.0f}s: {e}"
                 )
-            raise
+                time.sleep(delay)
+    
+    def _log_failure(self, table_name: str, seasons: Optional[List[int]], error: Exception,
+                     stage: str = 'fetch'):
+        """Log a failed extraction stage ('fetch' or 'write') and record it in the refresh log"""
+        error_msg = (
+            f"Failed to extract {DATA_LABELS[table_name]} data (stage={stage}): "
+            f"{type(error).__name__}: {str(error)}"
+        )
+        logger.error(error_msg)
+        self.db_manager.log_refresh_many([
+            {'table_name': table_name, 'season': season, 'week': None, 'season_type': 'ALL',
+             'status': 'FAILED', 'error_message': error_msg}
+            for season in seasons or [0]
+        ])
+    
+    def _extract_teams(self) -> Tuple[str, int]:
+        """Extract team information"""
+        return self._extract('teams', self._fetch_teams)
+    
+    def _extract_players(self) -> Tuple[str, int]:
+        """Extract player information"""
+        return self._extract('players', self._fetch_players)
+    
+    def _extract_schedules(self, seasons: List[int]) -> Tuple[str, int]:
+        """Extract schedule data"""
+        return self._extract('schedules', self._fetch_schedules, seasons)
     
     def _extract_pbp_data(self, seasons: List[int]) -> Tuple[str, int]:
-        """Extract play-by-play data"""
-        try:
-            logger.info(f"Extracting PBP data for seasons: {seasons}")
-            
-            # Handle the nfl_data_py library bug where 'Error' is not defined
-            # We need to monkey-patch the Error class before importing PBP data
-            import builtins
-            if not hasattr(builtins, 'Error'):
-                builtins.Error = Exception
-            
-            pbp_df = nfl.import_pbp_data(seasons)
-            logger.info(f"Successfully extracted PBP data with {len(pbp_df)} records")
-            
-            # Clean and standardize PBP data
-            pbp_df = nfl.clean_nfl_data(pbp_df)
-            
-            # Rename 'desc' column to avoid SQL reserved keyword conflict
-            if 'desc' in pbp_df.columns:
-                pbp_df = pbp_df.rename(columns={'desc': 'play_description'})
-            
-            records = self.db_manager.insert_dataframe(pbp_df, 'pbp_data')
-            
-            for season in seasons:
-                self.db_manager.log_refresh(
-                    'pbp_data', season, None, 'ALL', 'SUCCESS',
-                    records_processed=records
-                )
-            
-            return 'pbp_data', records
-            
-        except Exception as e:
-            # Provide more detailed error information
-            error_msg = f"Failed to extract PBP data: {type(e).__name__}: {str(e)}"
-            logger.error(error_msg)
-            for season in seasons:
-                self.db_manager.log_refresh(
-                    'pbp_data', season, None, 'ALL', 'FAILED', error_msg
-                )
-            raise
+        """
+        Extract play-by-play data
+        
+        Seasons are downloaded and inserted one at a time, so only one
+        season's plays are held in memory however many are requested.
+        """
+        records = 0
+        for season in seasons:
+            _, season_records = self._extract('pbp_data', self._fetch_pbp_data, [season])
+            records += season_records
+        return 'pbp_data', records
     
     def _extract_weekly_data(self, seasons: List[int]) -> Tuple[str, int]:
         """Extract weekly player stats"""
-        try:
-            logger.info(f"Extracting weekly data for seasons: {seasons}")
-            
-            weekly_df = nfl.import_weekly_data(seasons)
-            
-            # Clean and standardize weekly data
-            weekly_df = nfl.clean_nfl_data(weekly_df)
-            
-            # Add our custom fantasy points calculations
-            # NFL data already has fantasy_points and fantasy_points_ppr
-            # We'll add our custom calculations as additional columns
-            weekly_df = self.fantasy_calc.calculate_fantasy_points(weekly_df)
-            
-            records = self.db_manager.insert_dataframe(weekly_df, 'weekly_stats')
-            
-            for season in seasons:
-                self.db_manager.log_refresh(
-                    'weekly_stats', season, None, 'ALL', 'SUCCESS',
-                    records_processed=records
-                )
-            
-            return 'weekly_stats', records
-            
-        except Exception as e:
-            error_msg = f"Failed to extract weekly data: {type(e).__name__}: {str(e)}"
-            logger.error(error_msg)
-            for season in seasons:
-                self.db_manager.log_refresh(
-                    'weekly_stats', season, None, 'ALL', 'FAILED', error_msg
-                )
-            raise
+        return self._extract('weekly_stats', self._fetch_weekly_data, seasons)
     
     def _extract_seasonal_data(self, seasons: List[int]) -> Tuple[str, int]:
         """Extract seasonal player stats"""
-        try:
-            logger.info(f"Extracting seasonal data for seasons: {seasons}")
-            
-            seasonal_df = nfl.import_seasonal_data(seasons)
-            
-            # Clean and standardize seasonal data
-            seasonal_df = nfl.clean_nfl_data(seasonal_df)
-            
-            # Add our custom fantasy points calculations
-            # NFL data already has fantasy_points and fantasy_points_ppr
-            # We'll add our custom calculations as additional columns
-            seasonal_df = self.fantasy_calc.calculate_fantasy_points(seasonal_df)
-            
-            records = self.db_manager.insert_dataframe(seasonal_df, 'seasonal_stats')
-            
-            for season in seasons:
-                self.db_manager.log_refresh(
-                    'seasonal_stats', season, None, 'ALL', 'SUCCESS',
-                    records_processed=records
-                )
-            
-            return 'seasonal_stats', records
-            
-        except Exception as e:
-            error_msg = f"Failed to extract seasonal data: {type(e).__name__}: {str(e)}"
-            logger.error(error_msg)
-            for season in seasons:
-                self.db_manager.log_refresh(
-                    'seasonal_stats', season, None, 'ALL', 'FAILED', error_msg
-                )
-            raise
+        return self._extract('seasonal_stats', self._fetch_seasonal_data, seasons)
     
     def _extract_rosters(self, seasons: List[int]) -> Tuple[str, int]:
         """Extract roster data"""
-        try:
-            logger.info(f"Extracting roster data for seasons: {seasons}")
-            
-            rosters_df = nfl.import_weekly_rosters(seasons)
-            
-            # Clean and standardize roster data
-            rosters_df = nfl.clean_nfl_data(rosters_df)
-            
-            records = self.db_manager.insert_dataframe(rosters_df, 'rosters')
-            
-            for season in seasons:
-                self.db_manager.log_refresh(
-                    'rosters', season, None, 'ALL', 'SUCCESS',
-                    records_processed=records
-                )
-            
-            return 'rosters', records
-            
-        except Exception as e:
-            error_msg = f"Failed to extract roster data: {type(e).__name__}: {str(e)}"
-            logger.error(error_msg)
-            for season in seasons:
-                self.db_manager.log_refresh(
-                    'rosters', season, None, 'ALL', 'FAILED', error_msg
-                )
-            raise
+        return self._extract('rosters', self._fetch_rosters, seasons)
     
     def _extract_injuries(self, seasons: List[int]) -> Tuple[str, int]:
         """Extract injury data"""
-        try:
-            logger.info(f"Extracting injury data for seasons: {seasons}")
-            
-            injuries_df = nfl.import_injuries(seasons)
-            
-            # Clean and standardize injury data
-            injuries_df = nfl.clean_nfl_data(injuries_df)
-            
-            records = self.db_manager.insert_dataframe(injuries_df, 'injuries')
-            
-            for season in seasons:
-                self.db_manager.log_refresh(
-                    'injuries', season, None, 'ALL', 'SUCCESS',
-                    records_processed=records
-                )
-            
-            return 'injuries', records
+        return self._extract('injuries', self._fetch_injuries, seasons)
+    
+    def _fetch_teams(self) -> pd.DataFrame:
+        """Download and clean team information"""
+        logger.info("Extracting team data...")
+        teams_df = nfl.import_team_desc()
+        
+        # Clean and standardize team data
+        return self._clean_data(teams_df)
+    
+    def _fetch_players(self) -> pd.DataFrame:
+        """Download and clean player information"""
+        logger.info("Extracting player data...")
+        players_df = nfl.import_players()
+        
+        # Clean and standardize player data
+        return self._clean_data(players_df)
+    
+    def _fetch_schedules(self, seasons: List[int]) -> pd.DataFrame:
+        """Download and clean schedule data"""
+        logger.info(f"Extracting schedule data for seasons: {seasons}")
+        schedules_df = nfl.import_schedules(seasons)
+        
+        # Clean and standardize schedule data
+        return self._clean_data(schedules_df)
+    
+    def _fetch_pbp_data(self, seasons: List[int]) -> Union[pd.DataFrame, List[str]]:
+        """
+        Download and clean play-by-play data
+        
+        With a cache directory, the nflverse Parquet files are brought up to
+        date there and their paths returned for insert_parquet() to load.
+        Otherwise, when streaming is enabled and DuckDB can read URLs,
+        nothing is downloaded here and the URLs are returned instead.
+        
+        Args:
+            seasons: List of seasons to fetch
             
-        except Exception as e:
-            error_msg = f"Failed to extract injury data: {type(e).__name__}: {str(e)}"
-            logger.error(error_msg)
-            for season in seasons:
-                self.db_manager.log_refresh(
-                    'injuries', season, None, 'ALL', 'FAILED', error_msg
-                )
-            raise
+        Returns:
+            Cleaned DataFrame, or the Parquet files or URLs to load
+        """
+        logger.info(f"Extracting PBP data for seasons: {seasons}")
+        
+        if self.cache_dir:
+            return [
+                cached_parquet(PBP_PARQUET_URL.format(season=season), self.cache_dir)
+                for season in seasons
+            ]
+        
+        if self.stream_pbp and self.db_manager.enable_httpfs():
+            return [PBP_PARQUET_URL.format(season=season) for season in seasons]
+        
+        return self._import_pbp_data(seasons)
+    
+    def _import_pbp_data(self, seasons: List[int]) -> pd.DataFrame:
+        """Download and clean play-by-play data with nfl_data_py"""
+        # Handle the nfl_data_py library bug where 'Error' is not defined
+        # We need to monkey-patch the Error class before importing PBP data
+        import builtins
+        if not hasattr(builtins, 'Error'):
+            builtins.Error = Exception
+        
+        pbp_df = nfl.import_pbp_data(seasons)
+        logger.info(f"Successfully extracted PBP data with {len(pbp_df)} records")
+        
+        # Clean and standardize PBP data; reserved keyword columns such as
+        # 'desc' are renamed by insert_dataframe() using RESERVED_KEYWORD_RENAMES
+        return self._clean_data(pbp_df)
+    
+    def _fetch_weekly_data(self, seasons: List[int]) -> pd.DataFrame:
+        """Download weekly player stats and add fantasy points"""
+        logger.info(f"Extracting weekly data for seasons: {seasons}")
+        
+        weekly_df = nfl.import_weekly_data(seasons)
+        
+        # Add our custom fantasy points calculations
+        # NFL data already has fantasy_points and fantasy_points_ppr
+        # We'll add our custom calculations as additional columns
+        weekly_df = self.fantasy_calc.calculate_fantasy_points(weekly_df)
+        
+        # Clean and standardize weekly data; the calculation already treats
+        # 'NA' stats as zero, so cleaning afterwards gives the same points
+        return self._clean_data(weekly_df)
+    
+    def _fetch_seasonal_data(self, seasons: List[int]) -> pd.DataFrame:
+        """Download seasonal player stats and add fantasy points"""
+        logger.info(f"Extracting seasonal data for seasons: {seasons}")
+        
+        seasonal_df = nfl.import_seasonal_data(seasons)
+        
+        # Add our custom fantasy points calculations
+        # NFL data already has fantasy_points and fantasy_points_ppr
+        # We'll add our custom calculations as additional columns
+        seasonal_df = self.fantasy_calc.calculate_fantasy_points(seasonal_df)
+        
+        # Clean and standardize seasonal data
+        return self._clean_data(seasonal_df)
+    
+    def _fetch_rosters(self, seasons: List[int]) -> pd.DataFrame:
+        """Download and clean roster data"""
+        logger.info(f"Extracting roster data for seasons: {seasons}")
+        
+        rosters_df = nfl.import_weekly_rosters(seasons)
+        
+        # Clean and standardize roster data
+        return self._clean_data(rosters_df)
+    
+    def _fetch_injuries(self, seasons: List[int]) -> pd.DataFrame:
+        """Download and clean injury data"""
+        logger.info(f"Extracting injury data for seasons: {seasons}")
+        
+        injuries_df = nfl.import_injuries(seasons)
+        
+        # Clean and standardize injury data
+        return self._clean_data(injuries_df)
     
     def refresh_season_data(self, season: int, 
                            data_types: Optional[List[str]] = None) -> Dict[str, int]:
@@ -361,6 +605,7 @@ class NFLDataExtractor:
                 logger.error(error_msg)
                 results[data_type] = 0
         
+        self.db_manager.flush_refresh_log()
         return results
     
     def refresh_week_data(self, season: int, week: int) -> Dict[str, int]:
@@ -382,17 +627,13 @@ class NFLDataExtractor:
             week_data = weekly_df[weekly_df['week'] == week].copy()
             
             if not week_data.empty:
-                # Clean and calculate fantasy points
-                week_data = nfl.clean_nfl_data(week_data)
+                # Calculate fantasy points and clean
                 week_data = self.fantasy_calc.calculate_fantasy_points(week_data)
+                week_data = self._clean_data(week_data)
                 
-                # Remove existing week data
-                self.db_manager.query(
-                    "DELETE FROM weekly_stats WHERE season = ? AND week = ?",
-                    {"season": season, "week": week}
-                )
-                
-                # Insert new week data
+                # Replace the week's rows; insert_dataframe() deletes the
+                # season and week present in the data and inserts the new
+                # rows in one transaction
                 records = self.db_manager.insert_dataframe(week_data, 'weekly_stats')
                 results['weekly_stats'] = records
                 
@@ -409,4 +650,5 @@ class NFLDataExtractor:
             )
             results['weekly_stats'] = 0
         
+        self.db_manager.flush_refresh_log()
         return results
@@ -3,15 +3,86 @@ Expert Consensus Rankings (ECR) Data Extractor
 Processes FantasyPros ECR spreadsheets with varying formats across years
 """
 
+import functools
+import io
 import logging
+import logging.handlers
+import multiprocessing
+import os
 import pandas as pd
+import pyarrow as pa
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
+from pandas.io.parsers import TextParser
 
 logger = logging.getLogger(__name__)
 
+# Common ECR column name variations, lowercased, and their standard names
+COLUMN_MAPPING = {
+    # Player name variations
+    'player name': 'player_name',
+    'overall (team)': 'player_name',
+    'player': 'player_name',
+    'player (team)': 'player_name',
+    
+    # Position variations
+    'pos': 'position',
+    'position': 'position',
+    
+    # Ranking variations
+    'rk': 'rank',
+    'rank': 'rank',
+    
+    # Best rank variations
+    'best': 'best_rank',
+    'best rank': 'best_rank',
+    
+    # Worst rank variations
+    'worst': 'worst_rank',
+    'worst rank': 'worst_rank',
+    
+    # Average rank variations
+    'avg.': 'avg_rank',
+    'avg': 'avg_rank',
+    'average': 'avg_rank',
+    'ave rank': 'avg_rank',
+    
+    # Standard deviation variations
+    'std.dev': 'stddev_rank',
+    'std dev': 'stddev_rank',
+    'stddev': 'stddev_rank',
+    'standard deviation': 'stddev_rank',
+    
+    # ADP variations
+    'adp': 'adp',
+    
+    # vs ADP variations
+    'ecr vs. adp': 'vs_adp',
+    'vs. adp': 'vs_adp',
+    'vs adp': 'vs_adp',
+    'versus adp': 'vs_adp'
+}
+
+# Lowercased column names process_ecr_file() uses, raw or standard; other
+# columns (tiers, bye weeks, ids) are dropped as files are read
+KNOWN_COLUMNS = frozenset(COLUMN_MAPPING) | frozenset(COLUMN_MAPPING.values())
+
+# Season year in an ECR file name
+YEAR_PATTERN = re.compile(r'(\d{4})')
+
+# Player name followed by a team code, either in parentheses or after a
+# space, e.g. "Christian McCaffrey (SF)" or "Christian McCaffrey CAR";
+# PLAYER_TEAM_PATTERN matches either form for a whole column
+PAREN_TEAM_PATTERN = re.compile(r'^(.+?)\s*\(([A-Z]{2,4})\)$')
+SPACE_TEAM_PATTERN = re.compile(r'^(.+?)\s+([A-Z]{2,4})$')
+PLAYER_TEAM_PATTERN = r'^(.+?)(?:\s*\(([A-Z]{2,4})\)|\s+([A-Z]{2,4}))$'
+
+# Position code at the start of a position field such as "QB1"
+POSITION_PATTERN = re.compile(r'^(QB|RB|WR|TE|K|DST)', re.IGNORECASE)
+
 
 class ECRExtractor:
     """Extracts and processes Expert Consensus Rankings data from FantasyPros files"""
@@ -26,10 +97,14 @@ class ECRExtractor:
         self.db = db_manager
         self.data_path = Path("data/raw_ecr")
     
-    def extract_file_metadata(self, filename: str) -> Tuple[int, bool]:
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def extract_file_metadata(filename: str) -> Tuple[int, bool]:
         """
         Extract year and before_preseason flag from filename
         
+        Results are cached by filename; names without a year raise every time.
+        
         Args:
             filename: Name of the ECR file
             
@@ -37,7 +112,7 @@ class ECRExtractor:
             Tuple of (year, before_preseason)
         """
         # Extract year from filename
-        year_match = re.search(r'(\d{4})', filename)
+        year_match = YEAR_PATTERN.search(filename)
         if not year_match:
             raise ValueError(f"Could not extract year from filename: {filename}")
         
@@ -59,59 +134,15 @@ class ECRExtractor:
         Returns:
             DataFrame with normalized column names
         """
-        df_norm = df.copy()
-        
-        # Create mapping of common column variations to standard names
-        column_mapping = {
-            # Player name variations
-            'player name': 'player_name',
-            'overall (team)': 'player_name',
-            'player': 'player_name',
-            'player (team)': 'player_name',
-            
-            # Position variations
-            'pos': 'position',
-            'position': 'position',
-            
-            # Ranking variations
-            'rk': 'rank',
-            'rank': 'rank',
-            
-            # Best rank variations
-            'best': 'best_rank',
-            'best rank': 'best_rank',
-            
-            # Worst rank variations
-            'worst': 'worst_rank',
-            'worst rank': 'worst_rank',
-            
-            # Average rank variations
-            'avg.': 'avg_rank',
-            'avg': 'avg_rank',
-            'average': 'avg_rank',
-            'ave rank': 'avg_rank',
-            
-            # Standard deviation variations
-            'std.dev': 'stddev_rank',
-            'std dev': 'stddev_rank',
-            'stddev': 'stddev_rank',
-            'standard deviation': 'stddev_rank',
-            
-            # ADP variations
-            'adp': 'adp',
-            
-            # vs ADP variations
-            'ecr vs. adp': 'vs_adp',
-            'vs. adp': 'vs_adp',
-            'vs adp': 'vs_adp',
-            'versus adp': 'vs_adp'
-        }
+        # Shallow copy: only the column labels change, so the data isn't
+        # copied and the caller's DataFrame keeps its labels
+        df_norm = df.copy(deep=False)
         
         # Normalize column names to lowercase and map
         new_columns = []
         for col in df_norm.columns:
             col_lower = str(col).lower().strip()
-            new_col = column_mapping.get(col_lower, col_lower)
+            new_col = COLUMN_MAPPING.get(col_lower, col_lower)
             new_columns.append(new_col)
         
         df_norm.columns = new_columns
@@ -122,6 +153,9 @@ class ECRExtractor:
         """
         Extract clean player name and position from combined string
         
+        For a whole column, extract_player_names() does the same in one
+        vectorized pass.
+        
         Args:
             player_name_col: Raw player name column value
             
@@ -135,18 +169,40 @@ class ECRExtractor:
         # e.g., "Christian McCaffrey (SF)" or "Christian McCaffrey CAR"
         
         # First try parentheses format
-        paren_match = re.match(r'^(.+?)\s*\(([A-Z]{2,4})\)$', player_name_col.strip())
+        paren_match = PAREN_TEAM_PATTERN.match(player_name_col.strip())
         if paren_match:
             return paren_match.group(1).strip(), ""
         
         # Try space-separated format (name + team)
-        space_match = re.match(r'^(.+?)\s+([A-Z]{2,4})$', player_name_col.strip())
+        space_match = SPACE_TEAM_PATTERN.match(player_name_col.strip())
         if space_match:
             return space_match.group(1).strip(), ""
         
         # If no pattern matches, return as-is
         return player_name_col.strip(), ""
     
+    @staticmethod
+    def extract_player_names(player_names: pd.Series) -> np.ndarray:
+        """
+        Extract clean player names from a column of combined strings
+        
+        Gives the same names as extract_player_info() for each value, with
+        one regex pass over the column instead of a Python call per row.
+        
+        Args:
+            player_names: Raw player name column
+            
+        Returns:
+            Player names in column order; non-string values give ""
+        """
+        if not (player_names.dtype == object or pd.api.types.is_string_dtype(player_names.dtype)):
+            return np.full(len(player_names), "", dtype=object)
+        
+        # The .str methods give NaN for values that aren't strings
+        stripped = player_names.str.strip()
+        names = stripped.str.extract(PLAYER_TEAM_PATTERN)[0].str.strip()
+        return names.fillna(stripped).fillna("").to_numpy(dtype=object)
+    
     def clean_position_field(self, position_value: str) -> str:
         """
         Extract clean position code from mixed position field
@@ -163,7 +219,7 @@ class ECRExtractor:
         position_str = str(position_value).strip()
         
         # Extract base position using regex - match position code at the beginning
-        position_match = re.match(r'^(QB|RB|WR|TE|K|DST)', position_str, re.IGNORECASE)
+        position_match = POSITION_PATTERN.match(position_str)
         if position_match:
             return position_match.group(1).upper()
         
@@ -193,6 +249,50 @@ class ECRExtractor:
         except (ValueError, TypeError):
             return None
     
+    @staticmethod
+    def _read_xlsx(file_path: Path) -> pd.DataFrame:
+        """
+        Read the first sheet of an .xlsx file as plain cell values
+        
+        openpyxl's read-only mode streams the rows as value tuples, without
+        the cell objects pd.read_excel() converts one by one. The rows then
+        go through the same TextParser pd.read_excel() uses, so header,
+        missing value and type handling match it. Only KNOWN_COLUMNS are
+        parsed, unless the first row names none of them, as when the real
+        header is further down.
+        
+        Args:
+            file_path: Path to the .xlsx file
+            
+        Returns:
+            DataFrame of the sheet
+        """
+        import openpyxl
+        
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = list(workbook.active.iter_rows(values_only=True))
+        finally:
+            workbook.close()
+        
+        # Drop trailing empty rows and pad short ones, and give empty cells
+        # as "", as pandas does
+        while rows and all(value is None for value in rows[-1]):
+            rows.pop()
+        if not rows:
+            return pd.DataFrame()
+        width = max(len(row) for row in rows)
+        keep = [
+            i for i, value in enumerate(rows[0])
+            if value is not None and str(value).lower().strip() in KNOWN_COLUMNS
+        ] or range(width)
+        rows = [
+            ["" if i >= len(row) or row[i] is None else row[i] for i in keep]
+            for row in rows
+        ]
+        
+        return TextParser(rows, header=0).read()
+    
     def process_ecr_file(self, file_path: Path) -> pd.DataFrame:
         """
         Process a single ECR file into normalized format
@@ -213,19 +313,27 @@ class ECRExtractor:
             if file_path.suffix.lower() == '.xls':
                 # Handle older .xls files - 2014-2016 are actually TSV files
                 try:
+                    # Read the file once and parse it from memory; the sniff
+                    # only looks at the first 500 bytes
+                    content = file_path.read_bytes()
+                    head = content[:500]
                     # Check if it's a TSV file (tab-separated text)
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read(500)
-                        if content.count('\t') > content.count(',') and '\t' in content:
-                            logger.info(f"Detected TSV format in {file_path}, reading as TSV")
-                            # Skip header rows and read as TSV
-                            df = pd.read_csv(file_path, sep='\t', skiprows=4)
-                        else:
-                            # Try reading as actual Excel file
-                            df = pd.read_excel(file_path, engine='xlrd')
+                    if head.count(b'\t') > head.count(b',') and b'\t' in head:
+                        logger.info(f"Detected TSV format in {file_path}, reading as TSV")
+                        # Skip header rows and read as TSV
+                        df = pd.read_csv(io.BytesIO(content), sep='\t', skiprows=4)
+                    else:
+                        # Try reading as actual Excel file
+                        df = pd.read_excel(io.BytesIO(content), engine='xlrd')
                 except Exception as e:
                     logger.warning(f"Could not read {file_path}: {e}")
                     return pd.DataFrame()
+            elif file_path.suffix.lower() in ('.xlsx', '.xlsm'):
+                try:
+                    df = self._read_xlsx(file_path)
+                except Exception as e:
+                    logger.warning(f"Read-only read of {file_path} failed, using pandas: {e}")
+                    df = pd.read_excel(file_path, engine='openpyxl')
             else:
                 df = pd.read_excel(file_path)
             
@@ -251,69 +359,82 @@ class ECRExtractor:
             # Normalize column names
             df = self.normalize_column_names(df, year)
             
-            # Initialize result DataFrame with the correct length
-            num_rows = len(df)
-            result_df = pd.DataFrame(index=range(num_rows))
-            
-            # Add metadata columns
-            result_df['year'] = year
-            result_df['before_preseason'] = before_preseason
+            # Compute each column first and build the result in one step
+            def numeric(column: str) -> Optional[np.ndarray]:
+                if column not in df.columns:
+                    return None
+                return pd.to_numeric(df[column], errors='coerce').to_numpy()
             
             # Extract player names and positions
             if 'player_name' in df.columns:
-                player_info = df['player_name'].apply(self.extract_player_info)
-                result_df['player_name'] = [info[0] for info in player_info]
+                player_names = self.extract_player_names(df['player_name'])
                 
                 # Try to get position from dedicated position column first
                 if 'position' in df.columns:
                     # Clean position field to extract only the position code
-                    result_df['position'] = df['position'].apply(self.clean_position_field)
+                    positions = df['position'].apply(self.clean_position_field).to_numpy()
                 else:
-                    # Extract from player name if no dedicated position column
-                    result_df['position'] = [info[1] for info in player_info]
+                    # Player names carry a team code, not a position
+                    positions = ""
             else:
-                result_df['player_name'] = ""
-                result_df['position'] = ""
+                player_names = ""
+                positions = ""
             
             # Map ranking columns
             # For rank, use the rank column or create sequence
             if 'rank' in df.columns:
-                rank_series = pd.to_numeric(df['rank'], errors='coerce')
-                # Fill NaN values with sequential numbers
-                result_df['rank'] = [rank_series.iloc[i] if not pd.isna(rank_series.iloc[i]) else i+1 
-                                   for i in range(len(rank_series))]
+                rank_values = pd.to_numeric(df['rank'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+                # Fill NaN values with each row's sequential number
+                sequence = np.arange(1, len(rank_values) + 1, dtype=np.float64)
+                ranks = np.where(np.isnan(rank_values), sequence, rank_values)
+                # np.where gives float64; whole-number ranks are stored as
+                # integers, as they were before NaNs were filled this way
+                if np.array_equal(ranks, np.trunc(ranks)):
+                    ranks = ranks.astype(np.int64)
             else:
-                result_df['rank'] = list(range(1, len(df) + 1))
-                
-            result_df['best_rank'] = pd.to_numeric(df.get('best_rank'), errors='coerce') if 'best_rank' in df.columns else None
-            result_df['worst_rank'] = pd.to_numeric(df.get('worst_rank'), errors='coerce') if 'worst_rank' in df.columns else None
-            result_df['avg_rank'] = pd.to_numeric(df.get('avg_rank'), errors='coerce') if 'avg_rank' in df.columns else None
-            result_df['stddev_rank'] = pd.to_numeric(df.get('stddev_rank'), errors='coerce') if 'stddev_rank' in df.columns else None
+                ranks = np.arange(1, len(df) + 1)
             
             # Handle ADP and vs_ADP
             if 'adp' in df.columns:
-                result_df['adp'] = df['adp']
-                result_df['vs_adp'] = df.get('vs_adp', None)
+                adp = df['adp'].to_numpy()
+                vs_adp = df['vs_adp'].to_numpy() if 'vs_adp' in df.columns else None
             elif 'vs_adp' in df.columns:
-                # Calculate ADP from rank and vs_adp
-                result_df['vs_adp'] = df['vs_adp']
-                result_df['adp'] = [
-                    self.calculate_adp_from_vs_adp(rank, vs_adp)
-                    for rank, vs_adp in zip(result_df['rank'], result_df['vs_adp'])
-                ]
+                # Calculate ADP from rank and vs_adp as in
+                # calculate_adp_from_vs_adp(), over whole columns; text such
+                # as "N/A" becomes NaN and so does the ADP
+                vs_adp = numeric('vs_adp')
+                adp = ranks - vs_adp
             else:
-                result_df['adp'] = None
-                result_df['vs_adp'] = None
+                adp = None
+                vs_adp = None
+            
+            # The file's year and preseason flag are broadcast from scalars;
+            # years fit in int16, a quarter of the default int64
+            result_df = pd.DataFrame({
+                'year': np.int16(year),
+                'before_preseason': before_preseason,
+                'player_name': player_names,
+                'position': positions,
+                'rank': ranks,
+                'best_rank': numeric('best_rank'),
+                'worst_rank': numeric('worst_rank'),
+                'avg_rank': numeric('avg_rank'),
+                'stddev_rank': numeric('stddev_rank'),
+                'adp': adp,
+                'vs_adp': vs_adp
+            }, index=range(len(df)))
             
             # Calculate position_rank based on overall rank within each position
             result_df['position_rank'] = result_df.groupby('position')['rank'].rank(method='dense').astype('Int64')
             
             # Filter out rows with empty player names (but be more lenient)
             if len(result_df) > 0:
+                # Strip once and compare the result twice
+                names = result_df['player_name'].astype(str).str.strip()
                 result_df = result_df[
                     (result_df['player_name'].notna()) & 
-                    (result_df['player_name'].astype(str).str.strip() != "") &
-                    (result_df['player_name'].astype(str).str.strip() != "nan")
+                    (names != "") &
+                    (names != "nan")
                 ]
             
             logger.info(f"Processed {len(result_df)} records from {file_path}")
@@ -352,7 +473,7 @@ class ECRExtractor:
             logger.info(f"Table exists after drop: {table_check > 0}")
             
             # Find all ECR files
-            ecr_files = list(self.data_path.glob("FantasyPros_*.xl*"))
+            ecr_files = sorted(self.data_path.glob("FantasyPros_*.xl*"))
             
             if not ecr_files:
                 logger.warning(f"No ECR files found in {self.data_path}")
@@ -365,9 +486,28 @@ class ECRExtractor:
             processed_files = 0
             failed_files = 0
             
-            for file_path in sorted(ecr_files):
+            # Parsing a workbook holds the GIL, so files are processed in
+            # separate processes; spawned rather than forked, since this
+            # process has DuckDB and logging threads running. Results are
+            # collected in file order. Spawned workers start without logging
+            # handlers, so their records are sent back over a queue and
+            # handled by this process's loggers
+            max_workers = min(len(ecr_files), os.cpu_count() or 1)
+            mp_context = multiprocessing.get_context('spawn')
+            log_queue = mp_context.Queue()
+            log_listener = logging.handlers.QueueListener(log_queue, WorkerLogHandler())
+            log_listener.start()
+            try:
+                with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context,
+                                         initializer=init_worker_logging,
+                                         initargs=(log_queue, logging.getLogger().getEffectiveLevel())) as executor:
+                    futures = [executor.submit(process_ecr_file, file_path) for file_path in ecr_files]
+            finally:
+                log_listener.stop()
+            
+            for file_path, future in zip(ecr_files, futures):
                 try:
-                    df = self.process_ecr_file(file_path)
+                    df = future.result()
                     if not df.empty:
                         all_data.append(df)
                         processed_files += 1
@@ -382,8 +522,18 @@ class ECRExtractor:
                 logger.error("No data was successfully processed from any files")
                 return {"error": "No data processed"}
             
-            # Combine all DataFrames
-            combined_df = pd.concat(all_data, ignore_index=True)
+            # Combine all files as one Arrow table, which insert_dataframe()
+            # scans without converting; columns that are all missing in one
+            # file and typed in another are promoted to the common type
+            try:
+                combined_df = pa.concat_tables(
+                    [pa.Table.from_pandas(df, preserve_index=False) for df in all_data],
+                    promote_options='permissive'
+                )
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+                logger.warning(f"Combining ECR files as Arrow failed, using pandas: {e}")
+                combined_df = pd.concat(all_data, ignore_index=True)
+            all_data = None
             
             # Create table with proper schema
             logger.info(f"Creating raw_ecr_rankings table with {len(combined_df)} total records")
@@ -416,9 +566,6 @@ class ECRExtractor:
             Dictionary with verification results
         """
         try:
-            # Check total record count
-            total_count = self.db.query("SELECT COUNT(*) as count FROM raw_ecr_rankings").iloc[0]['count']
-            
             # Check year coverage
             year_coverage = self.db.query("""
                 SELECT year, 
@@ -430,29 +577,33 @@ class ECRExtractor:
                 ORDER BY year
             """)
             
-            # Check for missing data
-            missing_data = self.db.query("""
+            # Check the record count, missing data and data quality in one
+            # scan of the table
+            summary = self.db.query("""
                 SELECT 
+                    COUNT(*) as total_records,
                     SUM(CASE WHEN player_name IS NULL OR player_name = '' THEN 1 ELSE 0 END) as missing_player_names,
                     SUM(CASE WHEN position IS NULL OR position = '' THEN 1 ELSE 0 END) as missing_positions,
                     SUM(CASE WHEN rank IS NULL THEN 1 ELSE 0 END) as missing_ranks,
-                    SUM(CASE WHEN avg_rank IS NULL THEN 1 ELSE 0 END) as missing_avg_ranks
-                FROM raw_ecr_rankings
-            """).iloc[0]
-            
-            # Check data quality
-            data_quality = self.db.query("""
-                SELECT 
+                    SUM(CASE WHEN avg_rank IS NULL THEN 1 ELSE 0 END) as missing_avg_ranks,
                     MIN(year) as min_year,
                     MAX(year) as max_year,
                     COUNT(DISTINCT year) as unique_years,
                     COUNT(DISTINCT CASE WHEN before_preseason THEN year END) as years_with_prepreseason,
                     COUNT(DISTINCT CASE WHEN NOT before_preseason THEN year END) as years_with_preseason
                 FROM raw_ecr_rankings
-            """).iloc[0]
+            """)
+            
+            # Split the row by group, so each keeps its own column types
+            missing_data = summary[[
+                'missing_player_names', 'missing_positions', 'missing_ranks', 'missing_avg_ranks'
+            ]].iloc[0]
+            data_quality = summary[[
+                'min_year', 'max_year', 'unique_years', 'years_with_prepreseason', 'years_with_preseason'
+            ]].iloc[0]
             
             return {
-                'total_records': int(total_count),
+                'total_records': int(summary['total_records'].iloc[0]),
                 'year_coverage': year_coverage.to_dict('records'),
                 'missing_data': missing_data.to_dict(),
                 'data_quality': data_quality.to_dict()
@@ -559,8 +710,8 @@ class ECRExtractor:
             self.db.conn.execute(create_query)
             
             # Verify the results
-            total_raw = self.db.query("SELECT COUNT(*) as count FROM raw_ecr_rankings").iloc[0]['count']
-            total_matched = self.db.query("SELECT COUNT(*) as count FROM ecr_rankings").iloc[0]['count']
+            total_raw = self.db.scalar("SELECT COUNT(*) FROM raw_ecr_rankings")
+            total_matched = self.db.scalar("SELECT COUNT(*) FROM ecr_rankings")
             
             # Check for unmatched records
             unmatched_query = """
@@ -620,3 +771,39 @@ class ECRExtractor:
         except Exception as e:
             logger.error(f"Failed to create ecr_rankings with player IDs: {e}")
             raise
+
+
+class WorkerLogHandler(logging.Handler):
+    """Pass log records received from worker processes to this process's loggers"""
+    
+    def emit(self, record: logging.LogRecord):
+        logging.getLogger(record.name).handle(record)
+
+
+def init_worker_logging(log_queue: Any, level: int):
+    """
+    Send a worker process's log records to the parent over a queue
+    
+    Args:
+        log_queue: multiprocessing queue read by the parent's QueueListener
+        level: Logging level of the parent's root logger
+    """
+    root = logging.getLogger()
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(level)
+
+
+def process_ecr_file(file_path: Path) -> pd.DataFrame:
+    """
+    Process a single ECR file in a worker process
+    
+    Processing a file doesn't use the database, so no DatabaseManager is
+    sent to the worker.
+    
+    Args:
+        file_path: Path to the ECR file
+        
+    Returns:
+        Normalized DataFrame
+    """
+    return ECRExtractor(None).process_ecr_file(file_path)
@@ -3,56 +3,84 @@ Fantasy Points Calculator
 Calculates fantasy points for different scoring systems (STD, HALF PPR, FULL PPR)
 """
 
+import numpy as np
 import pandas as pd
 from typing import Dict, Any
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Default scoring rules, the rows of every calculator's weight matrix; also
+# read by config.FANTASY_SCORING_SYSTEMS
+SCORING_SYSTEMS = {
+    'std': {
+        'passing_yards': 0.04,  # 1 point per 25 yards
+        'passing_tds': 4.0,
+        'interceptions': -2.0,
+        'rushing_yards': 0.1,   # 1 point per 10 yards
+        'rushing_tds': 6.0,
+        'receptions': 0.0,      # No PPR
+        'receiving_yards': 0.1, # 1 point per 10 yards
+        'receiving_tds': 6.0,
+        'fumbles_lost': -2.0,
+        'two_point_conversions': 2.0
+    },
+    'half_ppr': {
+        'passing_yards': 0.04,
+        'passing_tds': 4.0,
+        'interceptions': -2.0,
+        'rushing_yards': 0.1,
+        'rushing_tds': 6.0,
+        'receptions': 0.5,      # Half PPR
+        'receiving_yards': 0.1,
+        'receiving_tds': 6.0,
+        'fumbles_lost': -2.0,
+        'two_point_conversions': 2.0
+    },
+    'full_ppr': {
+        'passing_yards': 0.04,
+        'passing_tds': 4.0,
+        'interceptions': -2.0,
+        'rushing_yards': 0.1,
+        'rushing_tds': 6.0,
+        'receptions': 1.0,      # Full PPR
+        'receiving_yards': 0.1,
+        'receiving_tds': 6.0,
+        'fumbles_lost': -2.0,
+        'two_point_conversions': 2.0
+    }
+}
+
 
 class FantasyPointsCalculator:
     """Calculate fantasy points for different scoring systems"""
     
     def __init__(self):
         """Initialize fantasy points calculator with scoring systems"""
-        self.scoring_systems = {
-            'std': {
-                'passing_yards': 0.04,  # 1 point per 25 yards
-                'passing_tds': 4.0,
-                'interceptions': -2.0,
-                'rushing_yards': 0.1,   # 1 point per 10 yards
-                'rushing_tds': 6.0,
-                'receptions': 0.0,      # No PPR
-                'receiving_yards': 0.1, # 1 point per 10 yards
-                'receiving_tds': 6.0,
-                'fumbles_lost': -2.0,
-                'two_point_conversions': 2.0
-            },
-            'half_ppr': {
-                'passing_yards': 0.04,
-                'passing_tds': 4.0,
-                'interceptions': -2.0,
-                'rushing_yards': 0.1,
-                'rushing_tds': 6.0,
-                'receptions': 0.5,      # Half PPR
-                'receiving_yards': 0.1,
-                'receiving_tds': 6.0,
-                'fumbles_lost': -2.0,
-                'two_point_conversions': 2.0
-            },
-            'full_ppr': {
-                'passing_yards': 0.04,
-                'passing_tds': 4.0,
-                'interceptions': -2.0,
-                'rushing_yards': 0.1,
-                'rushing_tds': 6.0,
-                'receptions': 1.0,      # Full PPR
-                'receiving_yards': 0.1,
-                'receiving_tds': 6.0,
-                'fumbles_lost': -2.0,
-                'two_point_conversions': 2.0
-            }
-        }
+        # Copied, so update_scoring_system() doesn't change the defaults
+        self.scoring_systems = {name: dict(rules) for name, rules in SCORING_SYSTEMS.items()}
+        self._build_weights()
+    
+    def _build_weights(self):
+        """
+        Precompute the weight matrices used to calculate fantasy points
+        
+        Rebuilt whenever a scoring system changes; stats a system doesn't
+        score get a weight of 0. calculate_fantasy_points() uses the
+        [stat, system] matrix and calculate_player_fantasy_points() one
+        contiguous row per system.
+        """
+        self._system_names = list(self.scoring_systems)
+        self._system_index = {name: i for i, name in enumerate(self._system_names)}
+        self._stat_order = list(dict.fromkeys(
+            stat for scoring in self.scoring_systems.values() for stat in scoring
+        ))
+        self._weights = np.array(
+            [[scoring.get(stat, 0.0) for scoring in self.scoring_systems.values()]
+             for stat in self._stat_order],
+            dtype=np.float64
+        ).reshape(len(self._stat_order), len(self._system_names))
+        self._system_weights = np.ascontiguousarray(self._weights.T)
     
     def calculate_fantasy_points(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -65,8 +93,9 @@ class FantasyPointsCalculator:
             DataFrame with fantasy points columns added
         """
         try:
-            # Make a copy to avoid modifying original
-            result_df = df.copy()
+            # Shallow copy: columns are replaced below, never modified in
+            # place, so the caller's DataFrame is left untouched
+            result_df = df.copy(deep=False)
             
             # Ensure numeric columns exist and are filled
             stat_columns = [
@@ -75,24 +104,39 @@ class FantasyPointsCalculator:
                 'receiving_yards', 'receiving_tds', 'fumbles_lost'
             ]
             
-            # Fill missing stat columns with 0
+            # Fill missing stat columns with 0; columns that are already
+            # numeric and complete, as nfl_data_py's usually are, are kept
+            # without a coercion or copy
             for col in stat_columns:
                 if col not in result_df.columns:
                     result_df[col] = 0.0  # Use float to avoid int64 creation
-                else:
-                    result_df[col] = pd.to_numeric(result_df[col], errors='coerce').fillna(0.0)
+                    continue
+                column = result_df[col]
+                if not pd.api.types.is_numeric_dtype(column.dtype):
+                    column = pd.to_numeric(column, errors='coerce')
+                if column.hasnans:
+                    column = column.fillna(0.0)
+                if column is not result_df[col]:
+                    result_df[col] = column
             
-            # Calculate fantasy points for each scoring system
-            for system_name, scoring in self.scoring_systems.items():
-                points = pd.Series(0.0, index=result_df.index)
-                
-                for stat, multiplier in scoring.items():
-                    if stat in result_df.columns:
-                        stat_values = pd.to_numeric(result_df[stat], errors='coerce').fillna(0.0)
-                        points += stat_values * multiplier
-                
-                # Round to 2 decimal places
-                result_df[f'fantasy_points_{system_name}'] = points.round(2)
+            # Calculate every scoring system at once as a [row, stat] by
+            # [stat, system] matrix product. The stat columns filled above
+            # are already numeric; other scored stats are coerced once and
+            # missing ones count as 0. The matrix is column-major, so each
+            # stat is copied into contiguous memory, and BLAS reads it as is
+            values = np.zeros((len(result_df), len(self._stat_order)), order='F')
+            for j, stat in enumerate(self._stat_order):
+                if stat not in result_df.columns:
+                    continue
+                column = result_df[stat]
+                if stat not in stat_columns:
+                    column = pd.to_numeric(column, errors='coerce')
+                values[:, j] = column.to_numpy(dtype=np.float64, na_value=0.0)
+            
+            # Round to 2 decimal places
+            points = values @ self._weights
+            np.round(points, 2, out=points)
+            result_df[[f'fantasy_points_{name}' for name in self._system_names]] = points
             
             logger.info(f"Calculated fantasy points for {len(result_df)} records")
             return result_df
@@ -129,15 +173,18 @@ class FantasyPointsCalculator:
             Fantasy points for the player
         """
         try:
-            scoring = self.scoring_systems.get(system, self.scoring_systems['std'])
+            weights = self._system_weights[
+                self._system_index.get(system, self._system_index['std'])
+            ]
             
-            points = 0.0
-            for stat, multiplier in scoring.items():
-                stat_value = player_stats.get(stat, 0)
-                if stat_value is not None:
-                    points += float(stat_value) * multiplier
+            # Missing and None stats count as 0
+            stat_values = np.fromiter(
+                (float(player_stats.get(stat) or 0.0) for stat in self._stat_order),
+                dtype=np.float64,
+                count=len(self._stat_order)
+            )
             
-            return round(points, 2)
+            return round(float(weights @ stat_values), 2)
             
         except Exception as e:
             logger.error(f"Failed to calculate fantasy points for player: {e}")
@@ -153,6 +200,7 @@ class FantasyPointsCalculator:
             scoring_rules: Dictionary with stat names and multipliers
         """
         self.scoring_systems[system_name] = scoring_rules
+        self._build_weights()
         logger.info(f"Updated scoring system: {system_name}")
     
     def get_top_performers(self, df: pd.DataFrame, 
@@ -172,19 +220,16 @@ class FantasyPointsCalculator:
             DataFrame with top performers
         """
         try:
-            result_df = df.copy()
-            
-            # Filter by position if specified
-            if position:
-                result_df = result_df[result_df['position'] == position]
+            # Filter by position if specified; the mask selects into a new frame
+            result_df = df[df['position'] == position] if position else df
             
-            # Sort by fantasy points for the system
+            # Select the top rows by fantasy points for the system; nlargest
+            # keeps only top_n rows rather than sorting the whole frame
             fantasy_col = f'fantasy_points_{system}'
             if fantasy_col in result_df.columns:
-                result_df = result_df.sort_values(fantasy_col, ascending=False)
-                result_df = result_df.head(top_n)
+                return result_df.nlargest(top_n, fantasy_col)
             
-            return result_df
+            return result_df.copy() if result_df is df else result_df
             
         except Exception as e:
             logger.error(f"Failed to get top performers: {e}")
@@ -203,13 +248,10 @@ class FantasyPointsCalculator:
             DataFrame with fantasy points comparison
         """
         try:
-            result_df = df.copy()
-            
-            # Filter by player if specified
-            if player_id:
-                result_df = result_df[result_df['player_id'] == player_id]
+            # Filter by player if specified, before any columns are copied
+            result_df = df[df['player_id'] == player_id] if player_id else df
             
-            # Select relevant columns
+            # Select relevant columns; selecting builds a new frame
             compare_cols = ['player_id', 'player_name', 'position', 'team']
             fantasy_cols = [col for col in result_df.columns if col.startswith('fantasy_points_')]
             
@@ -225,7 +267,7 @@ class FantasyPointsCalculator:
                         result_df['fantasy_points_full_ppr'] - result_df['fantasy_points_std']
                     ).round(2)
             
-            return result_df
+            return result_df.copy() if result_df is df else result_df
             
         except Exception as e:
             logger.error(f"Failed to compare scoring systems: {e}")
@@ -0,0 +1,82 @@
+"""
+Parquet Cache
+Keeps local copies of nflverse release files so repeated loads read from disk
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, Union
+
+logger = logging.getLogger(__name__)
+
+# Bytes copied per read when saving a download
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+
+def cached_parquet(url: str, cache_dir: Union[str, Path], timeout: int = 30) -> str:
+    """
+    Get a local copy of a Parquet file, downloading it if it changed
+    
+    The file is saved under cache_dir by its URL's file name, with the
+    response's ETag and Last-Modified headers in a .json file beside it.
+    Later calls send those headers back, so an unchanged file costs one
+    304 response rather than a download. If the server can't be reached,
+    an existing copy is used as is.
+    
+    Args:
+        url: URL of the Parquet file
+        cache_dir: Directory to keep cached files in
+        timeout: Request timeout in seconds
+            
+    Returns:
+        Path of the cached file
+    """
+    cache_dir = Path(cache_dir).expanduser()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / url.rsplit('/', 1)[-1]
+    meta_path = path.with_name(path.name + '.json')
+    
+    headers: Dict[str, str] = {}
+    if path.exists() and meta_path.exists():
+        try:
+            meta = json.loads(meta_path.read_text())
+        except ValueError:
+            meta = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+    
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=timeout) as response:
+            # Write to a temporary file first, so a failed download never
+            # replaces a good copy and readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.part')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    shutil.copyfileobj(response, f, DOWNLOAD_CHUNK_SIZE)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            meta_path.write_text(json.dumps({
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
+            }))
+        logger.info(f"Cached {url} at {path}")
+    except OSError as e:
+        if isinstance(e, urllib.error.HTTPError) and e.code == 304:
+            logger.debug(f"Using cached {path}, {url} is unchanged")
+        elif path.exists():
+            logger.warning(f"Could not check {url}, using cached {path}: {e}")
+        else:
+            raise
+    
+    return str(path)
@@ -0,0 +1,19 @@
+-- Auto-generated NFL Analytics Database Indexes
+-- Run after the initial bulk load so inserts skip index maintenance
+
+CREATE INDEX IF NOT EXISTS idx_pbp_game_id ON pbp_data(game_id);
+CREATE INDEX IF NOT EXISTS idx_pbp_season_week_posteam ON pbp_data(season, week, posteam);
+CREATE INDEX IF NOT EXISTS idx_pbp_season_week_defteam ON pbp_data(season, week, defteam);
+CREATE INDEX IF NOT EXISTS idx_pbp_season_week_play_type ON pbp_data(season, week, play_type, down);
+CREATE INDEX IF NOT EXISTS idx_weekly_player_season ON weekly_stats(player_id, season, week);
+CREATE INDEX IF NOT EXISTS idx_weekly_season_position ON weekly_stats(season, position);
+CREATE INDEX IF NOT EXISTS idx_weekly_season_team ON weekly_stats(season, recent_team);
+CREATE INDEX IF NOT EXISTS idx_seasonal_player_season ON seasonal_stats(player_id, season);
+CREATE INDEX IF NOT EXISTS idx_seasonal_season_position ON seasonal_stats(season, position);
+CREATE INDEX IF NOT EXISTS idx_schedules_season_week ON schedules(season, week);
+CREATE INDEX IF NOT EXISTS idx_schedules_season_type ON schedules(season, season_type);
+CREATE INDEX IF NOT EXISTS idx_schedules_teams ON schedules(home_team, away_team);
+CREATE INDEX IF NOT EXISTS idx_rosters_player_season ON rosters(player_id, season, week);
+CREATE INDEX IF NOT EXISTS idx_rosters_season_team ON rosters(season, team);
+CREATE INDEX IF NOT EXISTS idx_injuries_player_season ON injuries(player_id, season, week);
+CREATE INDEX IF NOT EXISTS idx_refresh_log_table ON data_refresh_log(table_name, season, week);
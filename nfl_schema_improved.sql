@@ -1,5 +1,6 @@
 -- Auto-generated NFL Analytics Database Schema (Improved)
 -- Generated with proper data types for numeric and date columns
+-- Indexes are in nfl_indexes.sql; run it after loading data
 
 -- TEAMS TABLE
 CREATE TABLE IF NOT EXISTS teams (
@@ -720,44 +721,3 @@ CREATE TABLE IF NOT EXISTS injuries (
             );
             
 
--- INDEXES
-CREATE INDEX IF NOT EXISTS idx_pbp_game_id ON pbp_data(game_id);
-CREATE INDEX IF NOT EXISTS idx_pbp_season_week ON pbp_data(season, week);
-CREATE INDEX IF NOT EXISTS idx_pbp_season_type ON pbp_data(season_type);
-CREATE INDEX IF NOT EXISTS idx_pbp_posteam ON pbp_data(posteam);
-CREATE INDEX IF NOT EXISTS idx_pbp_defteam ON pbp_data(defteam);
-CREATE INDEX IF NOT EXISTS idx_pbp_play_type ON pbp_data(play_type);
-CREATE INDEX IF NOT EXISTS idx_pbp_down ON pbp_data(down);
-CREATE INDEX IF NOT EXISTS idx_pbp_quarter ON pbp_data(qtr);
-CREATE INDEX IF NOT EXISTS idx_pbp_game_date ON pbp_data(game_date);
-CREATE INDEX IF NOT EXISTS idx_weekly_player_season ON weekly_stats(player_id, season, week);
-CREATE INDEX IF NOT EXISTS idx_weekly_season_type ON weekly_stats(season_type);
-CREATE INDEX IF NOT EXISTS idx_weekly_position ON weekly_stats(position);
-CREATE INDEX IF NOT EXISTS idx_weekly_team ON weekly_stats(recent_team);
-CREATE INDEX IF NOT EXISTS idx_weekly_opponent ON weekly_stats(opponent_team);
-CREATE INDEX IF NOT EXISTS idx_weekly_fantasy_points ON weekly_stats(fantasy_points);
-CREATE INDEX IF NOT EXISTS idx_seasonal_player_season ON seasonal_stats(player_id, season);
-CREATE INDEX IF NOT EXISTS idx_seasonal_season_type ON seasonal_stats(season_type);
-CREATE INDEX IF NOT EXISTS idx_seasonal_position ON seasonal_stats(position);
-CREATE INDEX IF NOT EXISTS idx_seasonal_team ON seasonal_stats(recent_team);
-CREATE INDEX IF NOT EXISTS idx_seasonal_fantasy_points ON seasonal_stats(fantasy_points);
-CREATE INDEX IF NOT EXISTS idx_schedules_season_week ON schedules(season, week);
-CREATE INDEX IF NOT EXISTS idx_schedules_game_date ON schedules(gameday);
-CREATE INDEX IF NOT EXISTS idx_schedules_teams ON schedules(home_team, away_team);
-CREATE INDEX IF NOT EXISTS idx_schedules_season_type ON schedules(season_type);
-CREATE INDEX IF NOT EXISTS idx_rosters_player_season ON rosters(player_id, season, week);
-CREATE INDEX IF NOT EXISTS idx_rosters_team ON rosters(team);
-CREATE INDEX IF NOT EXISTS idx_rosters_position ON rosters(position);
-CREATE INDEX IF NOT EXISTS idx_rosters_status ON rosters(status);
-CREATE INDEX IF NOT EXISTS idx_players_position ON players(position);
-CREATE INDEX IF NOT EXISTS idx_players_team ON players(team);
-CREATE INDEX IF NOT EXISTS idx_players_status ON players(status);
-CREATE INDEX IF NOT EXISTS idx_players_college ON players(college);
-CREATE INDEX IF NOT EXISTS idx_players_draft_year ON players(entry_year);
-CREATE INDEX IF NOT EXISTS idx_teams_conf_div ON teams(team_conf, team_division);
-CREATE INDEX IF NOT EXISTS idx_injuries_player_season ON injuries(player_id, season, week);
-CREATE INDEX IF NOT EXISTS idx_injuries_report_date ON injuries(report_date);
-CREATE INDEX IF NOT EXISTS idx_injuries_status ON injuries(report_status);
-CREATE INDEX IF NOT EXISTS idx_refresh_log_table ON data_refresh_log(table_name, season, week);
-CREATE INDEX IF NOT EXISTS idx_refresh_log_status ON data_refresh_log(status);
-CREATE INDEX IF NOT EXISTS idx_refresh_log_date ON data_refresh_log(refresh_date);
@@ -10,7 +10,7 @@ import sys
 import duckdb
 from pathlib import Path
 
-from summarizers import create_smry_season_table, run_all_tests
+from summarizers import SUMMARY_TABLES, run_all_tests
 
 # Configure logging
 logging.basicConfig(
@@ -27,12 +27,16 @@ logger = logging.getLogger(__name__)
 
 def refresh_summary_tables(db_path: str, run_tests: bool = False):
     """Refresh all summary (smry_) tables"""
+    conn = None
     try:
         logger.info("Starting summary tables refresh")
         
+        # Every summary table and test shares one connection
+        conn = duckdb.connect(db_path)
+        
         # Dictionary to track summary table functions
         summary_functions = {
-            'smry_season': create_smry_season_table
+            table_name: create_func for table_name, (create_func, *_) in SUMMARY_TABLES.items()
         }
         
         # Dictionary to track results
@@ -46,14 +50,11 @@ def refresh_summary_tables(db_path: str, run_tests: bool = False):
             print(f"Creating {table_name}...")
             
             try:
-                create_func(db_path)
-                
-                # Get record count
-                with duckdb.connect(db_path) as conn:
-                    count_result = conn.execute(f"SELECT COUNT(*) as count FROM {table_name}").fetchone()
-                    record_count = count_result[0]
-                    results[table_name] = record_count
-                    print(f"  ✅ {table_name}: {record_count:,} records")
+                # Each builder returns the row count its CREATE TABLE AS
+                # reported, so the table isn't counted again
+                record_count = create_func(db_path, conn=conn)
+                results[table_name] = record_count
+                print(f"  ✅ {table_name}: {record_count:,} records")
                     
             except Exception as e:
                 logger.error(f"Failed to create {table_name}: {e}")
@@ -63,7 +64,7 @@ def refresh_summary_tables(db_path: str, run_tests: bool = False):
         # Run tests if requested
         if run_tests:
             print("\n=== Running Tests ===")
-            test_results = run_all_tests(db_path)
+            test_results = run_all_tests(db_path, conn=conn)
             
             passed = sum(test_results.values())
             total = len(test_results)
@@ -99,6 +100,9 @@ def refresh_summary_tables(db_path: str, run_tests: bool = False):
     except Exception as e:
         logger.error(f"Failed to refresh summary tables: {e}")
         return False
+    finally:
+        if conn is not None:
+            conn.close()
 
 
 def main():
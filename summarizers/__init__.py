@@ -3,6 +3,15 @@ Summarizers module for NFL analytics summary tables.
 """
 
 from .smry_season import create_smry_season_table
+from .smry_team_week import create_smry_team_week_table
 from .test_smry_season import run_all_tests
 
-__all__ = ['create_smry_season_table', 'run_all_tests']
+# Summary table builders, the source tables each one is derived from, so a
+# summary can be rebuilt whenever one of its sources is refreshed, and
+# whether the builder can replace just some seasons through seasons=
+SUMMARY_TABLES = {
+    'smry_season': (create_smry_season_table, ('seasonal_stats', 'rosters', 'ecr_rankings'), True),
+    'smry_team_week': (create_smry_team_week_table, ('pbp_data',), False)
+}
+
+__all__ = ['SUMMARY_TABLES', 'create_smry_season_table', 'create_smry_team_week_table', 'run_all_tests']
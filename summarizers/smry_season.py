@@ -10,198 +10,212 @@ Creates the smry_season table with comprehensive player statistics including:
 """
 
 import duckdb
+import functools
 import logging
-from typing import List
+from contextlib import nullcontext
+from typing import List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Positions that get fantasy rankings; other players' ranks are NULL
+RANKED_POSITIONS = ('QB', 'RB', 'WR', 'TE', 'K')
+
+# Numeric columns that get per-game versions
+NUMERIC_COLUMNS = (
+    'completions', 'attempts', 'passing_yards', 'passing_tds', 'interceptions',
+    'sacks', 'sack_yards', 'sack_fumbles', 'sack_fumbles_lost', 
+    'passing_air_yards', 'passing_yards_after_catch', 'passing_first_downs',
+    'passing_epa', 'passing_2pt_conversions', 'carries', 'rushing_yards',
+    'rushing_tds', 'rushing_first_downs', 'rushing_epa', 'rushing_2pt_conversions',
+    'receptions', 'targets', 'receiving_yards', 'receiving_tds', 
+    'receiving_air_yards', 'receiving_yards_after_catch', 'receiving_first_downs',
+    'receiving_epa', 'receiving_2pt_conversions', 'racr', 'target_share',
+    'air_yards_share', 'wopr_x', 'special_teams_tds', 'fantasy_points_std',
+    'fantasy_points_half_ppr', 'fantasy_points_full_ppr', 'fantasy_points_ppr',
+    'fumbles_lost'
+)
+
+# Fantasy point columns that are ranked, and the suffix of their rank columns
+FANTASY_COLUMNS = (
+    ('fantasy_points_std', 'std'),
+    ('fantasy_points_half_ppr', 'halfppr'),
+    ('fantasy_points_full_ppr', 'fullppr')
+)
+
 def get_numeric_columns() -> List[str]:
     """Return list of numeric columns that should have per-game versions."""
-    return [
-        'completions', 'attempts', 'passing_yards', 'passing_tds', 'interceptions',
-        'sacks', 'sack_yards', 'sack_fumbles', 'sack_fumbles_lost', 
-        'passing_air_yards', 'passing_yards_after_catch', 'passing_first_downs',
-        'passing_epa', 'passing_2pt_conversions', 'carries', 'rushing_yards',
-        'rushing_tds', 'rushing_first_downs', 'rushing_epa', 'rushing_2pt_conversions',
-        'receptions', 'targets', 'receiving_yards', 'receiving_tds', 
-        'receiving_air_yards', 'receiving_yards_after_catch', 'receiving_first_downs',
-        'receiving_epa', 'receiving_2pt_conversions', 'racr', 'target_share',
-        'air_yards_share', 'wopr_x', 'special_teams_tds', 'fantasy_points_std',
-        'fantasy_points_half_ppr', 'fantasy_points_full_ppr', 'fantasy_points_ppr',
-        'fumbles_lost'
-    ]
+    return list(NUMERIC_COLUMNS)
 
 def create_per_game_columns() -> str:
-    """Generate SQL for per-game columns."""
-    numeric_cols = get_numeric_columns()
-    per_game_sql = []
+    """Generate SQL for per-game columns.
     
-    for col in numeric_cols:
-        per_game_sql.append(f"""
+    Each column multiplies by inv_games, the reciprocal of games computed
+    once per row, instead of dividing by games.
+    """
+    return ',\n    '.join(f"""
             CASE 
-                WHEN games > 0 THEN CAST({col} AS FLOAT) / games 
+                WHEN games > 0 THEN CAST(CAST({col} AS FLOAT) * inv_games AS FLOAT) 
                 ELSE 0.0 
-            END AS {col}_per_game""")
+            END AS {col}_per_game""" for col in NUMERIC_COLUMNS)
+
+def create_ranking_windows() -> str:
+    """Generate SQL for the named windows the ranking columns use.
     
-    return ',\n    '.join(per_game_sql)
+    All six share PARTITION BY season, position, so DuckDB partitions the
+    rows once and only sorts each partition by the six orders.
+    """
+    # Total rankings, then per-game rankings
+    orders = [
+        (f"w_{suffix}_tot", f"bd.{col}") for col, suffix in FANTASY_COLUMNS
+    ] + [
+        (f"w_{suffix}_ppg", f"(CASE WHEN bd.games > 0 THEN bd.{col} / bd.games ELSE 0 END)")
+        for col, suffix in FANTASY_COLUMNS
+    ]
+    
+    return ',\n    '.join(f"""
+        {window} AS (
+            PARTITION BY bd.season, bd.position 
+            ORDER BY {order} DESC NULLS LAST
+        )""" for window, order in orders)
 
 def create_ranking_columns() -> str:
     """Generate SQL for ranking columns."""
-    fantasy_cols = ['fantasy_points_std', 'fantasy_points_half_ppr', 'fantasy_points_full_ppr']
-    ranking_sql = []
+    # Total rankings, then per-game rankings, over create_ranking_windows()
+    return ',\n    '.join(f"""
+            RANK() OVER w_{suffix}_{kind} AS {suffix}_{kind}_rnk"""
+        for kind in ('tot', 'ppg') for _, suffix in FANTASY_COLUMNS)
+
+def rosters_are_unique(conn: duckdb.DuckDBPyConnection) -> bool:
+    """Check whether rosters has at most one row per player and season."""
+    result = conn.execute("""
+        SELECT COUNT(*) = COUNT(DISTINCT (player_id, season)) FROM rosters
+    """).fetchone()
+    return bool(result[0])
+
+def create_roster_summary(roster_unique: bool, season_filter: str = '') -> str:
+    """Generate SQL for one roster row per player and season.
     
-    # Total rankings
-    for col in fantasy_cols:
-        suffix = col.replace('fantasy_points_', '').replace('_', '')
-        ranking_sql.append(f"""
-            RANK() OVER (
-                PARTITION BY bd.season, bd.position 
-                ORDER BY bd.{col} DESC NULLS LAST
-            ) AS {suffix}_tot_rnk""")
+    When rosters is already unique on (player_id, season) its rows are
+    selected as they are, without a GROUP BY; otherwise each column takes
+    the value from the player's latest week. season_filter is an optional
+    WHERE clause on season.
+    """
+    roster_cols = ['player_name', 'position', 'years_exp', 'draft_number', 'weight', 'height', 'rookie_year']
     
-    # Per-game rankings
-    for col in fantasy_cols:
-        suffix = col.replace('fantasy_points_', '').replace('_', '')
-        ranking_sql.append(f"""
-            RANK() OVER (
-                PARTITION BY bd.season, bd.position 
-                ORDER BY (CASE WHEN bd.games > 0 THEN bd.{col} / bd.games ELSE 0 END) DESC NULLS LAST
-            ) AS {suffix}_ppg_rnk""")
+    if roster_unique:
+        select_sql = ',\n            '.join(roster_cols)
+        group_sql = ''
+    else:
+        # The latest non-NULL value, so the summary is the same on every
+        # rebuild
+        select_sql = ',\n            '.join(f"arg_max({col}, week) as {col}" for col in roster_cols)
+        group_sql = '\n        GROUP BY player_id, season'
     
-    return ',\n    '.join(ranking_sql)
+    return f"""SELECT 
+            player_id, 
+            season,
+            {select_sql}
+        FROM rosters{season_filter}{group_sql}"""
 
-def create_smry_season_table(db_path: str):
-    """Create the smry_season table."""
-    
-    logger.info("Creating smry_season table...")
+@functools.lru_cache(maxsize=8)
+def create_smry_season_sql(roster_unique: bool, seasons: Optional[Tuple[int, ...]] = None) -> str:
+    """Generate the query whose rows make up smry_season.
     
+    The SQL only depends on its arguments, so it's built once per value.
+    With seasons, every source table is filtered to those seasons before
+    it's joined or aggregated.
+    """
     per_game_cols = create_per_game_columns()
     ranking_cols = create_ranking_columns()
+    ranking_windows = create_ranking_windows()
+    ranked_positions = ', '.join(f"'{position}'" for position in RANKED_POSITIONS)
     
-    drop_table_sql = "DROP TABLE IF EXISTS smry_season;"
+    season_list = ', '.join(str(int(season)) for season in seasons) if seasons else ''
+    season_filter = f"\n        WHERE season IN ({season_list})" if seasons else ''
+    stats_filter = f"\n            WHERE s.season IN ({season_list})" if seasons else ''
+    ecr_filter = f"\n        WHERE year IN ({season_list})" if seasons else ''
+    
+    roster_summary = create_roster_summary(roster_unique, season_filter)
     
-    create_table_sql = f"""
-    CREATE TABLE smry_season AS
+    return f"""
     WITH roster_summary AS (
-        SELECT 
-            player_id, 
-            season,
-            ANY_VALUE(player_name) as player_name,
-            ANY_VALUE(position) as position,
-            ANY_VALUE(years_exp) as years_exp,
-            ANY_VALUE(draft_number) as draft_number,
-            ANY_VALUE(weight) as weight,
-            ANY_VALUE(height) as height,
-            ANY_VALUE(rookie_year) as rookie_year
-        FROM rosters 
-        GROUP BY player_id, season
+        {roster_summary}
     ),
-    base_data AS (
+    base_data AS MATERIALIZED (
         SELECT 
-            s.*,
-            -- Player info from rosters
-            r.player_name,
-            r.position,
-            r.years_exp,
-            r.draft_number AS draft_position,
-            r.weight,
-            r.height,
-            -- Rookie indicator
-            CASE 
-                WHEN r.rookie_year IS NOT NULL AND s.season = CAST(r.rookie_year AS INTEGER) THEN 1
-                ELSE 0
-            END AS is_rookie,
+            sr.* EXCLUDE (inv_games),
             
             -- Per-game columns
             {per_game_cols}
             
-        FROM seasonal_stats s
-        LEFT JOIN roster_summary r ON s.player_id = r.player_id AND s.season = r.season
+        FROM (
+            SELECT 
+                s.*,
+                -- Player info from rosters
+                r.player_name,
+                r.position,
+                r.years_exp,
+                r.draft_number AS draft_position,
+                r.weight,
+                r.height,
+                -- Rookie indicator
+                CASE 
+                    WHEN r.rookie_year IS NOT NULL AND s.season = CAST(r.rookie_year AS INTEGER) THEN 1
+                    ELSE 0
+                END AS is_rookie,
+                -- Key the rankings are joined back on
+                s.rowid AS row_key,
+                -- Reciprocal of games, computed once for the per-game columns
+                CASE WHEN s.games > 0 THEN 1.0 / s.games END AS inv_games
+                
+            FROM seasonal_stats s
+            LEFT JOIN roster_summary r ON s.player_id = r.player_id AND s.season = r.season{stats_filter}
+        ) sr
     ),
     
-    ranked_data AS (
+    -- Only ranked positions go through the window sort, carrying just the
+    -- columns the windows need rather than every stat
+    rankings AS (
         SELECT 
-            bd.*,
+            bd.row_key,
             
-            -- Ranking columns (only for relevant positions)
-            CASE 
-                WHEN bd.position IN ('QB', 'RB', 'WR', 'TE', 'K') THEN
-                    RANK() OVER (
-                        PARTITION BY bd.season, bd.position 
-                        ORDER BY bd.fantasy_points_std DESC NULLS LAST
-                    )
-                ELSE NULL
-            END AS std_tot_rnk,
-            CASE 
-                WHEN bd.position IN ('QB', 'RB', 'WR', 'TE', 'K') THEN
-                    RANK() OVER (
-                        PARTITION BY bd.season, bd.position 
-                        ORDER BY bd.fantasy_points_half_ppr DESC NULLS LAST
-                    )
-                ELSE NULL
-            END AS halfppr_tot_rnk,
-            CASE 
-                WHEN bd.position IN ('QB', 'RB', 'WR', 'TE', 'K') THEN
-                    RANK() OVER (
-                        PARTITION BY bd.season, bd.position 
-                        ORDER BY bd.fantasy_points_full_ppr DESC NULLS LAST
-                    )
-                ELSE NULL
-            END AS fullppr_tot_rnk,
-            CASE 
-                WHEN bd.position IN ('QB', 'RB', 'WR', 'TE', 'K') THEN
-                    RANK() OVER (
-                        PARTITION BY bd.season, bd.position 
-                        ORDER BY (CASE WHEN bd.games > 0 THEN bd.fantasy_points_std / bd.games ELSE 0 END) DESC NULLS LAST
-                    )
-                ELSE NULL
-            END AS std_ppg_rnk,
-            CASE 
-                WHEN bd.position IN ('QB', 'RB', 'WR', 'TE', 'K') THEN
-                    RANK() OVER (
-                        PARTITION BY bd.season, bd.position 
-                        ORDER BY (CASE WHEN bd.games > 0 THEN bd.fantasy_points_half_ppr / bd.games ELSE 0 END) DESC NULLS LAST
-                    )
-                ELSE NULL
-            END AS halfppr_ppg_rnk,
-            CASE 
-                WHEN bd.position IN ('QB', 'RB', 'WR', 'TE', 'K') THEN
-                    RANK() OVER (
-                        PARTITION BY bd.season, bd.position 
-                        ORDER BY (CASE WHEN bd.games > 0 THEN bd.fantasy_points_full_ppr / bd.games ELSE 0 END) DESC NULLS LAST
-                    )
-                ELSE NULL
-            END AS fullppr_ppg_rnk
+            -- Ranking columns
+            {ranking_cols}
             
         FROM base_data bd
+        WHERE bd.position IN ({ranked_positions})
+        WINDOW {ranking_windows}
     ),
     
     ecr_summary AS (
         SELECT 
             player_id,
             year as season,
-            ANY_VALUE(CASE WHEN before_preseason = FALSE THEN rank END) AS ecr_preszn_rank,
-            ANY_VALUE(CASE WHEN before_preseason = FALSE THEN best_rank END) AS ecr_preszn_best_rank,
-            ANY_VALUE(CASE WHEN before_preseason = FALSE THEN worst_rank END) AS ecr_preszn_worst_rank,
-            ANY_VALUE(CASE WHEN before_preseason = FALSE THEN avg_rank END) AS ecr_preszn_avg_rank,
-            ANY_VALUE(CASE WHEN before_preseason = FALSE THEN stddev_rank END) AS ecr_preszn_stddev_rank,
-            ANY_VALUE(CASE WHEN before_preseason = FALSE THEN adp END) AS ecr_preszn_adp,
-            ANY_VALUE(CASE WHEN before_preseason = FALSE THEN vs_adp END) AS ecr_preszn_vs_adp,
-            ANY_VALUE(CASE WHEN before_preseason = FALSE THEN position_rank END) AS ecr_preszn_position_rank,
-            ANY_VALUE(CASE WHEN before_preseason = TRUE THEN rank END) AS ecr_rank,
-            ANY_VALUE(CASE WHEN before_preseason = TRUE THEN best_rank END) AS ecr_best_rank,
-            ANY_VALUE(CASE WHEN before_preseason = TRUE THEN worst_rank END) AS ecr_worst_rank,
-            ANY_VALUE(CASE WHEN before_preseason = TRUE THEN avg_rank END) AS ecr_avg_rank,
-            ANY_VALUE(CASE WHEN before_preseason = TRUE THEN stddev_rank END) AS ecr_stddev_rank,
-            ANY_VALUE(CASE WHEN before_preseason = TRUE THEN adp END) AS ecr_adp,
-            ANY_VALUE(CASE WHEN before_preseason = TRUE THEN vs_adp END) AS ecr_vs_adp,
-            ANY_VALUE(CASE WHEN before_preseason = TRUE THEN position_rank END) AS ecr_position_rank
-        FROM ecr_rankings
+            ANY_VALUE(rank) FILTER (WHERE before_preseason = FALSE) AS ecr_preszn_rank,
+            ANY_VALUE(best_rank) FILTER (WHERE before_preseason = FALSE) AS ecr_preszn_best_rank,
+            ANY_VALUE(worst_rank) FILTER (WHERE before_preseason = FALSE) AS ecr_preszn_worst_rank,
+            ANY_VALUE(avg_rank) FILTER (WHERE before_preseason = FALSE) AS ecr_preszn_avg_rank,
+            ANY_VALUE(stddev_rank) FILTER (WHERE before_preseason = FALSE) AS ecr_preszn_stddev_rank,
+            ANY_VALUE(adp) FILTER (WHERE before_preseason = FALSE) AS ecr_preszn_adp,
+            ANY_VALUE(vs_adp) FILTER (WHERE before_preseason = FALSE) AS ecr_preszn_vs_adp,
+            ANY_VALUE(position_rank) FILTER (WHERE before_preseason = FALSE) AS ecr_preszn_position_rank,
+            ANY_VALUE(rank) FILTER (WHERE before_preseason = TRUE) AS ecr_rank,
+            ANY_VALUE(best_rank) FILTER (WHERE before_preseason = TRUE) AS ecr_best_rank,
+            ANY_VALUE(worst_rank) FILTER (WHERE before_preseason = TRUE) AS ecr_worst_rank,
+            ANY_VALUE(avg_rank) FILTER (WHERE before_preseason = TRUE) AS ecr_avg_rank,
+            ANY_VALUE(stddev_rank) FILTER (WHERE before_preseason = TRUE) AS ecr_stddev_rank,
+            ANY_VALUE(adp) FILTER (WHERE before_preseason = TRUE) AS ecr_adp,
+            ANY_VALUE(vs_adp) FILTER (WHERE before_preseason = TRUE) AS ecr_vs_adp,
+            ANY_VALUE(position_rank) FILTER (WHERE before_preseason = TRUE) AS ecr_position_rank
+        FROM ecr_rankings{ecr_filter}
         GROUP BY player_id, year
     )
     
     SELECT 
-        rd.*,
+        bd.* EXCLUDE (row_key),
+        
+        -- Rankings; other positions get NULL ranks from the join
+        rk.* EXCLUDE (row_key),
         
         -- ECR pre-season data (before_preseason = FALSE)
         ecr.ecr_preszn_rank,
@@ -223,23 +237,78 @@ def create_smry_season_table(db_path: str):
         ecr.ecr_vs_adp,
         ecr.ecr_position_rank
         
-    FROM ranked_data rd
+    FROM base_data bd
+    LEFT JOIN rankings rk ON bd.row_key = rk.row_key
     
     -- Join ECR data
     LEFT JOIN ecr_summary ecr 
-        ON rd.player_id = ecr.player_id 
-        AND rd.season = ecr.season;
+        ON bd.player_id = ecr.player_id 
+        AND bd.season = ecr.season
+    
+    -- Seasons and positions are stored together, so their zonemaps let
+    -- filters on them skip the other row groups
+    ORDER BY bd.season, bd.position;
     """
+
+def create_smry_season_table(db_path: str, conn: Optional[duckdb.DuckDBPyConnection] = None,
+                             roster_unique: Optional[bool] = None,
+                             seasons: Optional[List[int]] = None) -> int:
+    """Create the smry_season table and return the number of rows written.
     
-    with duckdb.connect(db_path) as conn:
-        conn.execute(drop_table_sql)
-        conn.execute(create_table_sql)
+    Uses conn if given, leaving it open; otherwise opens db_path for the call.
+    roster_unique says whether rosters has one row per player and season;
+    if None it is checked on the table. With seasons, only those seasons'
+    rows are replaced and the rest of an existing table is kept; rankings
+    are per season, so other seasons' rows don't change.
+    """
+    
+    logger.info("Creating smry_season table...")
+    
+    drop_table_sql = "DROP TABLE IF EXISTS smry_season;"
+    
+    with nullcontext(conn) if conn is not None else duckdb.connect(db_path) as conn:
+        if roster_unique is None:
+            roster_unique = rosters_are_unique(conn)
         
-        # Get count for verification
-        result = conn.execute("SELECT COUNT(*) FROM smry_season").fetchone()
-        logger.info(f"Created smry_season table with {result[0]} rows")
+        if seasons:
+            table_exists = conn.execute(
+                "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = 'smry_season'"
+            ).fetchone()[0]
+            if not table_exists:
+                logger.info("smry_season doesn't exist yet, building every season")
+                seasons = None
+        
+        if seasons:
+            seasons = tuple(sorted(set(seasons)))
+            season_list = ', '.join(str(int(season)) for season in seasons)
+            
+            # Replace the seasons' rows in one transaction, so readers never
+            # see them missing; INSERT returns the number of rows it inserted
+            conn.begin()
+            try:
+                conn.execute(f"DELETE FROM smry_season WHERE season IN ({season_list})")
+                record_count = conn.execute(
+                    f"INSERT INTO smry_season BY NAME {create_smry_season_sql(roster_unique, seasons)}"
+                ).fetchone()[0]
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            logger.info(f"Refreshed {record_count} smry_season rows for seasons {season_list}")
+        else:
+            conn.execute(drop_table_sql)
+            
+            # CREATE TABLE AS returns the number of rows it inserted
+            record_count = conn.execute(
+                f"CREATE TABLE smry_season AS {create_smry_season_sql(roster_unique)}"
+            ).fetchone()[0]
+            logger.info(f"Created smry_season table with {record_count} rows")
+        
+        # Show sample data; the query sorts the whole table, so it's skipped
+        # when INFO messages aren't logged
+        if not logger.isEnabledFor(logging.INFO):
+            return record_count
         
-        # Show sample data
         sample = conn.execute("""
             SELECT player_id, season, position, games, 
                    fantasy_points_std, std_tot_rnk, std_ppg_rnk,
@@ -250,9 +319,9 @@ def create_smry_season_table(db_path: str):
             LIMIT 5
         """).fetchall()
         
-        logger.info("Sample data from smry_season:")
-        for row in sample:
-            logger.info(f"  {row}")
+        logger.info("Sample data from smry_season:\n" + "\n".join(f"  {row}" for row in sample))
+    
+    return record_count
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
@@ -0,0 +1,88 @@
+"""
+Team weekly summary table creation script.
+
+Creates the smry_team_week table with one row per team, season and week,
+aggregated from pbp_data so team efficiency queries don't rescan every play:
+- Offensive play counts, yards, EPA and success rate
+- Defensive yards, EPA and success rate allowed
+"""
+
+import duckdb
+import logging
+from contextlib import nullcontext
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+def create_smry_team_week_table(db_path: str, conn: Optional[duckdb.DuckDBPyConnection] = None) -> int:
+    """Create the smry_team_week table and return its row count.
+    
+    Uses conn if given, leaving it open; otherwise opens db_path for the call.
+    """
+    
+    logger.info("Creating smry_team_week table...")
+    
+    drop_table_sql = "DROP TABLE IF EXISTS smry_team_week;"
+    
+    create_table_sql = """
+    CREATE TABLE smry_team_week AS
+    WITH offense AS (
+        SELECT
+            season,
+            week,
+            posteam AS team,
+            ANY_VALUE(season_type) AS season_type,
+            COUNT(*) AS off_plays,
+            SUM(CASE WHEN play_type = 'pass' THEN 1 ELSE 0 END) AS off_pass_plays,
+            SUM(CASE WHEN play_type = 'run' THEN 1 ELSE 0 END) AS off_rush_plays,
+            SUM(yards_gained) AS off_yards,
+            SUM(epa) AS off_epa,
+            AVG(epa) AS off_epa_per_play,
+            AVG(success) AS off_success_rate,
+            SUM(touchdown) AS off_touchdowns
+        FROM pbp_data
+        WHERE posteam IS NOT NULL AND play_type IN ('pass', 'run')
+        GROUP BY season, week, posteam
+    ),
+    
+    defense AS (
+        SELECT
+            season,
+            week,
+            defteam AS team,
+            COUNT(*) AS def_plays,
+            SUM(yards_gained) AS def_yards_allowed,
+            SUM(epa) AS def_epa_allowed,
+            AVG(epa) AS def_epa_per_play,
+            AVG(success) AS def_success_rate
+        FROM pbp_data
+        WHERE defteam IS NOT NULL AND play_type IN ('pass', 'run')
+        GROUP BY season, week, defteam
+    )
+    
+    SELECT
+        o.*,
+        d.def_plays,
+        d.def_yards_allowed,
+        d.def_epa_allowed,
+        d.def_epa_per_play,
+        d.def_success_rate
+    FROM offense o
+    LEFT JOIN defense d
+        ON o.season = d.season
+        AND o.week = d.week
+        AND o.team = d.team;
+    """
+    
+    with nullcontext(conn) if conn is not None else duckdb.connect(db_path) as conn:
+        conn.execute(drop_table_sql)
+        
+        # CREATE TABLE AS returns the number of rows it inserted
+        record_count = conn.execute(create_table_sql).fetchone()[0]
+        logger.info(f"Created smry_team_week table with {record_count} rows")
+    
+    return record_count
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    create_smry_team_week_table("../prod_nfl.duckdb")
@@ -11,7 +11,10 @@ Tests:
 
 import duckdb
 import logging
-from typing import Dict, Any
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -28,8 +31,10 @@ def run_test_query(conn: duckdb.DuckDBPyConnection, query: str, test_name: str)
 def test_record_counts(conn: duckdb.DuckDBPyConnection) -> bool:
     """Test 1: Compare record counts between seasonal_stats and smry_season."""
     
-    seasonal_count = conn.execute("SELECT COUNT(*) FROM seasonal_stats").fetchone()[0]
-    smry_count = conn.execute("SELECT COUNT(*) FROM smry_season").fetchone()[0]
+    # Both counts in one query
+    seasonal_count, smry_count = conn.execute("""
+    SELECT (SELECT COUNT(*) FROM seasonal_stats), (SELECT COUNT(*) FROM smry_season)
+    """).fetchone()
     
     logger.info(f"seasonal_stats count: {seasonal_count}")
     logger.info(f"smry_season count: {smry_count}")
@@ -46,7 +51,7 @@ def test_no_duplicates(conn: duckdb.DuckDBPyConnection) -> bool:
     
     query = """
     SELECT COUNT(*) as total_records,
-           COUNT(DISTINCT player_id || '_' || season) as unique_combinations
+           COUNT(DISTINCT (player_id, season)) as unique_combinations
     FROM smry_season
     """
     
@@ -204,20 +209,35 @@ def debug_rankings_2017_qb(conn: duckdb.DuckDBPyConnection):
     for row in result:
         logger.info(f"  {row[0]} - Rank {row[1]} - {row[2]} points")
 
-def run_all_tests(db_path: str) -> Dict[str, bool]:
-    """Run all tests and return results."""
+def run_all_tests(db_path: str, conn: Optional[duckdb.DuckDBPyConnection] = None) -> Dict[str, bool]:
+    """Run all tests and return results.
+    
+    Uses conn if given, leaving it open; otherwise opens db_path for the call.
+    """
     
     logger.info("Starting smry_season table tests...")
     
-    results = {}
+    tests = {
+        "record_counts": test_record_counts,
+        "no_duplicates": test_no_duplicates,
+        "cooper_kupp_2021": test_cooper_kupp_2021,
+        "davante_adams_2021": test_davante_adams_2021,
+        "qb_rankings_2017": test_qb_rankings_2017
+    }
     
-    with duckdb.connect(db_path) as conn:
-        # Run all tests
-        results["record_counts"] = test_record_counts(conn)
-        results["no_duplicates"] = test_no_duplicates(conn)
-        results["cooper_kupp_2021"] = test_cooper_kupp_2021(conn)
-        results["davante_adams_2021"] = test_davante_adams_2021(conn)
-        results["qb_rankings_2017"] = test_qb_rankings_2017(conn)
+    with nullcontext(conn) if conn is not None else duckdb.connect(db_path) as conn:
+        # The tests only read, so they run concurrently, each on its own
+        # cursor of the connection
+        def run_test(test_func):
+            cursor = conn.cursor()
+            try:
+                return test_func(cursor)
+            finally:
+                cursor.close()
+        
+        with ThreadPoolExecutor(max_workers=min(len(tests), os.cpu_count() or 1)) as executor:
+            futures = {test_name: executor.submit(run_test, test_func) for test_name, test_func in tests.items()}
+            results = {test_name: future.result() for test_name, future in futures.items()}
         
         # Run debug functions for failed tests
         if not results["cooper_kupp_2021"] or not results["davante_adams_2021"]:
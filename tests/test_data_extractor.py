@@ -0,0 +1,75 @@
+"""
+Tests for NFLDataExtractor play-by-play loading
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from nfl_analytics.database.manager import DatabaseManager
+from nfl_analytics.extractors import data_extractor
+from nfl_analytics.extractors.data_extractor import NFLDataExtractor
+
+
+class PbpCacheThenNflDataPyTest(unittest.TestCase):
+    """A season loaded from the Parquet cache, then one through nfl_data_py"""
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.db = DatabaseManager(str(self.tmp_dir / 'test.duckdb'))
+
+        # Raw nflverse files have no participation columns
+        self.cache_dir = self.tmp_dir / 'cache'
+        self.cache_dir.mkdir()
+        self.parquet_path = self.cache_dir / 'play_by_play_2022.parquet'
+        pq.write_table(pa.table({
+            'play_id': [1, 2],
+            'game_id': ['2022_01_BUF_LA', '2022_01_BUF_LA'],
+            'season': [2022, 2022],
+            'week': [1, 1],
+            'desc': ['Kickoff', 'Pass short right'],
+        }), self.parquet_path)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_both_paths_load_into_one_table(self):
+        cached = NFLDataExtractor(self.db, cache_dir=str(self.cache_dir))
+        with mock.patch.object(data_extractor, 'cached_parquet', return_value=str(self.parquet_path)):
+            _, cached_records = cached._extract_pbp_data([2022])
+        self.assertEqual(cached_records, 2)
+
+        pbp_df = pd.DataFrame({
+            'play_id': [1],
+            'game_id': ['2023_01_DET_KC'],
+            'season': [2023],
+            'week': [1],
+            'desc': ['Run up the middle'],
+            'offense_formation': ['SHOTGUN'],
+            'offense_personnel': ['1 RB, 1 TE, 3 WR'],
+        })
+        imported = NFLDataExtractor(self.db)
+        with mock.patch.object(data_extractor.nfl, 'import_pbp_data', return_value=pbp_df):
+            _, imported_records = imported._extract_pbp_data([2023])
+        self.assertEqual(imported_records, 1)
+
+        rows = self.db.conn.execute("""
+            SELECT season, play_description, offense_formation
+            FROM pbp_data ORDER BY season, play_id
+        """).fetchall()
+        self.assertEqual(rows, [
+            (2022, 'Kickoff', None),
+            (2022, 'Pass short right', None),
+            (2023, 'Run up the middle', 'SHOTGUN'),
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()